@@ -0,0 +1,50 @@
+"""
+Angle Index
+Sorted circular set of angles (degrees, 0-360). Nearest-neighbour queries
+only look at the two entries either side of a bisect position, so testing a
+new kunai against every stuck one costs O(log n) however long the game runs.
+"""
+
+from bisect import bisect_left
+
+
+class AngleIndex:
+    """Angles kept in ascending order, with wrap-around aware lookups"""
+    def __init__(self):
+        self.angles = []
+
+    def __len__(self):
+        return len(self.angles)
+
+    def __iter__(self):
+        """Angles in ascending order"""
+        return iter(self.angles)
+
+    def clear(self):
+        self.angles.clear()
+
+    def add(self, angle):
+        """Insert an angle (normalized to 0-360)"""
+        angle %= 360
+        self.angles.insert(bisect_left(self.angles, angle), angle)
+
+    def nearest_distance(self, angle):
+        """Smallest circular distance from `angle` to any stored angle (inf when empty)"""
+        angles = self.angles
+        if not angles:
+            return float('inf')
+        angle %= 360
+        index = bisect_left(angles, angle)
+        # Neighbours either side; index - 1 and index % len wrap around 0/360
+        before = angles[index - 1]
+        after = angles[index % len(angles)]
+        return min(_circular_distance(angle, before), _circular_distance(angle, after))
+
+    def within(self, angle, threshold):
+        """True if a stored angle is closer than `threshold` degrees to `angle`"""
+        return self.nearest_distance(angle) < threshold
+
+
+def _circular_distance(a, b):
+    diff = abs(a - b) % 360
+    return 360 - diff if diff > 180 else diff
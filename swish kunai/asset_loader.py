@@ -0,0 +1,71 @@
+"""
+Asset Loader
+Decodes the game-mode images (blue background, star and kunai) on a worker
+thread after the window is up, so startup only pays for what music mode
+draws. Workers produce QImages; the window turns them into QPixmaps on the
+GUI thread. If game mode is entered before they arrive it loads them inline.
+The same worker then imports NumPy for the game's batch updates.
+"""
+
+from pathlib import Path
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage, QTransform
+from entity_store import load_numpy
+
+# Asset name -> file in the assets folder
+GAME_ASSETS = {
+    'game_background': "blue background.png",
+    'star': "star.png",
+    'kunai': "kunai_knife.png",
+}
+
+
+def load_game_images(asset_dir=Path("assets")):
+    """Decode the game-mode images; missing or unreadable files map to None"""
+    images = {}
+    for name, file_name in GAME_ASSETS.items():
+        image = QImage(str(Path(asset_dir) / file_name))
+        images[name] = None if image.isNull() else image
+
+    kunai = images['kunai']
+    if kunai is not None:
+        # Scale to double size (120 pixels tall)
+        kunai = kunai.scaled(60, 120,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation)
+        # Rotate 1 degree to the right to fix bent appearance
+        images['kunai'] = kunai.transformed(QTransform().rotate(1),
+            Qt.TransformationMode.SmoothTransformation)
+    return images
+
+
+class _LoadGameImagesTask(QRunnable):
+    """Decode the game-mode images off the GUI thread"""
+    def __init__(self, loader, asset_dir):
+        super().__init__()
+        self.loader = loader
+        self.asset_dir = asset_dir
+
+    def run(self):
+        self.loader.game_images_loaded.emit(load_game_images(self.asset_dir))
+        # Otherwise the first game frame would pay for the import
+        load_numpy()
+
+
+class AssetLoader(QObject):
+    """Single worker thread; results arrive as a queued signal on the GUI thread"""
+    # asset name -> QImage (or None)
+    game_images_loaded = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+    def load_game_images(self, asset_dir=Path("assets")):
+        self.pool.start(_LoadGameImagesTask(self, asset_dir))
+
+    def shutdown(self):
+        """Drop queued work and wait for running tasks"""
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,394 @@
+"""
+Benchmark
+Offscreen benchmark suite for startup, rendering, game physics, library
+scanning and type-ahead search. Runs under Qt's offscreen platform with SDL's dummy audio driver, so
+it works on CI machines without a display or sound card. Results are written
+as JSON; pass a previous results file as the baseline to flag regressions.
+Startup (fresh process to first painted frame, with a large library saved in
+the settings) also has a fixed budget.
+
+    python benchmark.py [--output results.json] [--baseline baseline.json]
+                        [--threshold 0.15] [--startup-budget 400] [--quick]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Must be set before Qt or pygame are imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Time from process start to the first painted frame must stay under this (ms)
+STARTUP_BUDGET_MS = 400
+
+# Fresh processes launched to measure startup
+STARTUP_RUNS = 5
+
+# Songs in the (already indexed) synthetic music folder the startup probe opens
+STARTUP_LIBRARY_SIZE = 50000
+
+# The app's own files: modules and the assets folder
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Stuck kunai counts rendered and simulated in game mode
+STUCK_KUNAI_COUNTS = (0, 10, 100, 1000)
+
+# Synthetic music folder sizes (--quick stops at 10k)
+FOLDER_SIZES = (1000, 10000, 100000)
+
+# Title vocabulary for the search benchmark, most frequent word first
+TITLE_WORDS = (
+    "love", "you", "me", "night", "summer", "heart", "time", "baby", "dance", "life",
+    "girl", "light", "dream", "world", "home", "fire", "rain", "blue", "day", "away",
+    "song", "wild", "soul", "place", "party", "river", "road", "gold", "star", "moon",
+    "sun", "city", "heaven", "boy", "kiss", "back", "forever", "tonight", "young", "free",
+    "sweet", "lonely", "crazy", "angel", "memory", "shadow", "paradise", "remember", "ocean", "midnight",
+)
+
+# Typed one character at a time in the search benchmark (label -> query)
+SEARCH_QUERIES = {
+    'keystroke_common_word': "love",
+    'keystroke_two_words': "summer pl",
+    'keystroke_typo': "sumer",
+}
+
+# A result slower than the baseline by this fraction is a regression...
+DEFAULT_THRESHOLD = 0.15
+
+# ...unless the difference is below timer noise (ms)
+NOISE_FLOOR_MS = 0.05
+
+
+def summarize(samples):
+    """Timing statistics for a list of samples in milliseconds"""
+    samples = sorted(samples)
+    count = len(samples)
+    return {
+        'runs': count,
+        'mean_ms': statistics.fmean(samples),
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(count - 1, int(count * 0.95))],
+        'min_ms': samples[0],
+    }
+
+
+def measure(function, repeat, warmup=3):
+    """Call `function` repeatedly and return timing statistics in milliseconds"""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return summarize(samples)
+
+
+def stuck_angles(count):
+    """Evenly spread surface angles for `count` stuck kunai"""
+    return [i * 360.0 / count for i in range(count)] if count else []
+
+
+def startup_probe():
+    """Run in a child process: start the app and report ms until the first paint
+    and until the saved folder's songs are listed"""
+    start = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+    from music_player_window import MusicPlayerWindow
+
+    class ProbeWindow(MusicPlayerWindow):
+        first_paint = None
+
+        def paintEvent(self, event):
+            super().paintEvent(event)
+            if self.first_paint is None:
+                self.first_paint = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    window = ProbeWindow()
+    window.show()
+    while window.first_paint is None:
+        app.processEvents()
+    # The folder is loaded after the first frame; give it a few seconds
+    deadline = time.perf_counter() + 10.0
+    while not window.song_list and time.perf_counter() < deadline:
+        app.processEvents()
+    print(json.dumps({
+        'first_frame_ms': (window.first_paint - start) * 1000.0,
+        'songs_listed_ms': (time.perf_counter() - start) * 1000.0,
+        'songs': len(window.song_list),
+    }))
+    window.close()
+    return 0
+
+
+def run_startup_probe(sandbox):
+    """Start the app in a fresh process inside `sandbox` and return the probe's report"""
+    child = subprocess.run([sys.executable, str(SCRIPT_DIR / "benchmark.py"), "--startup-probe"],
+                           cwd=sandbox, capture_output=True, text=True, check=True)
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def make_library_sandbox(root, song_count):
+    """Prepare `root` as the working directory of a startup probe, with the
+    settings pointing at a synthetic, already indexed folder of `song_count`
+    songs (set to resume no track, so nothing plays)"""
+    from music_library import MusicLibrary
+    from replay import make_sandbox
+    folder = make_folder(root, song_count)
+    library = MusicLibrary(Path(root) / "swish_kunai_library.db")
+    library.scan(folder, probe=False)
+    library.close()
+    return make_sandbox(root, {'music_folder': str(folder), 'last_song_index': -1})
+
+
+def bench_startup(results):
+    """Time to first frame of fresh processes (interpreter startup excluded), with a
+    large indexed library that must not delay it"""
+    root = tempfile.mkdtemp(prefix="swish_kunai_startup_")
+    try:
+        make_library_sandbox(root, STARTUP_LIBRARY_SIZE)
+        reports = [run_startup_probe(root) for _ in range(STARTUP_RUNS)]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    results['startup/first_frame'] = summarize([report['first_frame_ms'] for report in reports])
+    results[f'startup/songs_listed_{STARTUP_LIBRARY_SIZE}'] = summarize(
+        [report['songs_listed_ms'] for report in reports])
+
+
+def bench_rendering(window, results):
+    """Full-window paints in music mode, both transitions and game mode"""
+    game = window.game
+
+    # Music mode with a scrolling song name
+    window.current_song_name = "A very long song name that needs the marquee"
+    results['render/music_mode'] = measure(window.repaint, 200)
+
+    # Halfway through the fade into game mode
+    window.show_game_mode()
+    window.transition_progress = 0.5
+    results['render/transition_to_game'] = measure(window.repaint, 200)
+
+    # Game mode proper (fade finished); nothing ticks while we measure
+    window.update_transition(1.0)
+    for name in ("game", "stars", "transition", "rotation"):
+        window.frame_scheduler.set_active(name, False)
+    for count in STUCK_KUNAI_COUNTS:
+        game.stuck_kunai.clear()
+        for angle in stuck_angles(count):
+            game.stuck_kunai.add(angle)
+        results[f'render/game_mode_{count}_stuck'] = measure(window.repaint, 200)
+
+    # Halfway back to music mode
+    window.exit_game_mode()
+    window.frame_scheduler.set_active("reverse_transition", False)
+    window.reverse_transition_progress = 0.5
+    results['render/transition_to_music'] = measure(window.repaint, 200)
+    window.is_reverse_transitioning = False
+
+
+def bench_physics(window, results):
+    """Game steps (as update_game runs them) and the star twinkle"""
+    import game_core
+
+    for count in STUCK_KUNAI_COUNTS:
+        core = game_core.GameCore(seed=1)
+        for angle in stuck_angles(count):
+            core.stuck_kunai.add(angle)
+        runner = game_core.FixedStepRunner(core)
+        frame = [0]
+
+        def step():
+            # A kunai in flight most of the time, like a busy game
+            if frame[0] % 20 == 0:
+                runner.push(game_core.LAUNCH)
+            frame[0] += 1
+            runner.advance(game_core.SIM_STEP)
+            if core.game_over:
+                core.replay()
+        results[f'physics/step_{count}_stuck'] = measure(step, 2000)
+
+    results['physics/star_twinkle'] = measure(lambda: window.update_stars(0.016), 2000)
+
+
+def make_folder(root, count):
+    """Create `count` empty audio files (names only matter to the scan)"""
+    folder = Path(root) / f"music_{count}"
+    folder.mkdir()
+    for i in range(count):
+        (folder / f"Artist {i % 97:02d} - Track {i:06d}.mp3").touch()
+    return folder
+
+
+def bench_library(results, sizes):
+    """Cold and warm folder scans, loading the cached rows, and building the search index"""
+    from music_library import MusicLibrary
+    from song_search import TrigramIndex
+
+    root = tempfile.mkdtemp(prefix="swish_kunai_bench_")
+    try:
+        for count in sizes:
+            folder = make_folder(root, count)
+            repeat = 3 if count >= 100000 else 5
+            db_path = Path(root) / f"library_{count}.db"
+
+            def cold_scan():
+                for suffix in ("", "-wal", "-shm"):
+                    Path(str(db_path) + suffix).unlink(missing_ok=True)
+                library = MusicLibrary(db_path)
+                library.scan(folder, probe=False)
+                library.close()
+            results[f'library/scan_cold_{count}'] = measure(cold_scan, repeat, warmup=0)
+
+            library = MusicLibrary(db_path)
+            library.scan(folder, probe=False)
+            results[f'library/scan_warm_{count}'] = measure(
+                lambda: library.scan(folder, probe=False), repeat, warmup=1)
+            # What the GUI thread pays at startup: the indexed rows, no stat calls
+            results[f'library/load_cached_{count}'] = measure(
+                lambda: library.load(folder), repeat, warmup=1)
+
+            def build_index():
+                index = TrigramIndex()
+                for name in library.tracks:
+                    track = library.tracks[name]
+                    index.add(name, track['title'], track['artist'])
+            results[f'library/search_index_{count}'] = measure(build_index, repeat, warmup=0)
+            library.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def zipf_titles(count, seed=1):
+    """`count` song titles of 1-4 words drawn with Zipf frequencies (word k has weight 1/k)"""
+    import random
+    rng = random.Random(seed)
+    weights = [1.0 / rank for rank in range(1, len(TITLE_WORDS) + 1)]
+    return [" ".join(rng.choices(TITLE_WORDS, weights, k=rng.randint(1, 4)))
+            for _ in range(count)]
+
+
+def bench_search(results, sizes):
+    """Every keystroke of typing SEARCH_QUERIES into a Zipf-distributed library"""
+    from song_search import TrigramIndex
+
+    for count in sizes:
+        index = TrigramIndex()
+        for i, title in enumerate(zipf_titles(count)):
+            index.add(f"{i:06d}.mp3", title, f"Artist {i % 97}")
+        for label, query in SEARCH_QUERIES.items():
+            samples = []
+            for _ in range(3):
+                for end in range(1, len(query) + 1):
+                    start = time.perf_counter()
+                    index.search(query[:end])
+                    samples.append((time.perf_counter() - start) * 1000.0)
+            results[f'search/{label}_{count}'] = summarize(samples)
+
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline_ms, current_ms) for every regression"""
+    regressions = []
+    for name, stats in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        old_ms = before['median_ms']
+        new_ms = stats['median_ms']
+        if new_ms > old_ms * (1 + threshold) and new_ms - old_ms > NOISE_FLOOR_MS:
+            regressions.append((name, old_ms, new_ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Swish Kunai offscreen benchmarks")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write results")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before flagging a regression (0.15 = 15%%)")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_MS,
+                        help="fail when the median time to first frame exceeds this (ms)")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k-file folder")
+    parser.add_argument("--startup-probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    output = Path(args.output).resolve()
+    baseline_path = Path(args.baseline).resolve() if args.baseline else None
+
+    if args.startup_probe:
+        return startup_probe()  # The parent chose the working directory
+
+    # The window runs in a throwaway directory with copied assets and empty
+    # settings, so the user's own settings, library index and caches are untouched
+    from replay import make_sandbox
+    sandbox = make_sandbox(tempfile.mkdtemp(prefix="swish_kunai_window_"))
+    os.chdir(sandbox)
+    try:
+        from PyQt6.QtCore import QT_VERSION_STR
+        from PyQt6.QtWidgets import QApplication
+        from music_player_window import MusicPlayerWindow
+
+        app = QApplication(sys.argv)
+        window = MusicPlayerWindow()
+        window.show()
+        app.processEvents()  # Expose the window so repaint() really paints
+
+        results = {}
+        bench_startup(results)
+        bench_rendering(window, results)
+        bench_physics(window, results)
+        window.close()
+        sizes = FOLDER_SIZES[:2] if args.quick else FOLDER_SIZES
+        bench_library(results, sizes)
+        bench_search(results, sizes)
+    finally:
+        os.chdir(SCRIPT_DIR)
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+    for name, stats in results.items():
+        print(f"{name:36s} median {stats['median_ms']:9.3f} ms   p95 {stats['p95_ms']:9.3f} ms")
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    failed = False
+    startup_ms = results['startup/first_frame']['median_ms']
+    if startup_ms > args.startup_budget:
+        print(f"STARTUP OVER BUDGET: {startup_ms:.0f} ms to first frame "
+              f"(budget {args.startup_budget:.0f} ms)")
+        failed = True
+
+    if baseline_path:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, old_ms, new_ms in regressions:
+            print(f"REGRESSION {name}: {old_ms:.3f} ms -> {new_ms:.3f} ms "
+                  f"({(new_ms / old_ms - 1) * 100:+.0f}%)")
+        if regressions:
+            failed = True
+        else:
+            print("No regressions against baseline")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
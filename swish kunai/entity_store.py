@@ -0,0 +1,135 @@
+"""
+Entity Store
+Struct-of-arrays storage for kunai and stars. Every field is a preallocated
+array('d') column and entities are rows; removing one swaps the last row into
+its place, so steady-state frames allocate nothing. When NumPy is installed
+batch updates run on zero-copy views of the same columns, otherwise on a
+plain loop over them. NumPy is only imported when the first view is taken
+(or by load_numpy, ahead of time), as it is a large part of startup.
+"""
+
+import importlib.util
+from array import array
+
+# Batch updates fall back to Python loops without NumPy
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None  # Set by load_numpy()
+
+
+def load_numpy():
+    """Import NumPy if it's installed and not imported yet"""
+    global np
+    if np is None and HAVE_NUMPY:
+        import numpy
+        np = numpy
+    return np
+
+
+class ColumnStore:
+    """Rows of float fields stored column by column"""
+    FIELDS = ()
+
+    def __init__(self, capacity=32):
+        self.count = 0
+        self.capacity = 0
+        self._views = {}
+        for name in self.FIELDS:
+            setattr(self, name, array('d'))
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, capacity):
+        # NumPy views pin the array buffers - drop them before resizing
+        self._views.clear()
+        for name in self.FIELDS:
+            getattr(self, name).extend([0.0] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def append(self, **values):
+        """Add a row (missing fields are 0.0) and return its index"""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        index = self.count
+        for name in self.FIELDS:
+            getattr(self, name)[index] = values.get(name, 0.0)
+        self.count += 1
+        return index
+
+    def remove(self, index):
+        """Delete a row by moving the last row into its place"""
+        last = self.count - 1
+        if index != last:
+            for name in self.FIELDS:
+                column = getattr(self, name)
+                column[index] = column[last]
+        self.count = last
+
+    def clear(self):
+        self.count = 0
+
+    def view(self, name):
+        """NumPy view of a column's live rows (shares memory with the column)"""
+        view = self._views.get(name)
+        if view is None:
+            numpy = load_numpy()
+            view = numpy.frombuffer(getattr(self, name), dtype=numpy.float64)
+            self._views[name] = view
+        return view[:self.count]
+
+
+class KunaiStore(ColumnStore):
+    """Flying kunai positions and vertical velocities"""
+    FIELDS = ('x', 'y', 'prev_y', 'velocity_y')
+
+    def save_previous(self):
+        """Remember heights before a step (for interpolated rendering)"""
+        if HAVE_NUMPY:
+            self.view('prev_y')[:] = self.view('y')
+            return
+        y, prev_y = self.y, self.prev_y
+        for i in range(self.count):
+            prev_y[i] = y[i]
+
+    def integrate(self, steps, gravity):
+        """Move every kunai by its velocity, then apply gravity"""
+        if HAVE_NUMPY:
+            velocity = self.view('velocity_y')
+            self.view('y')[:] += velocity * steps
+            velocity += gravity * steps
+            return
+        y, velocity = self.y, self.velocity_y
+        for i in range(self.count):
+            y[i] += velocity[i] * steps
+            velocity[i] += gravity * steps
+
+
+class StarStore(ColumnStore):
+    """Twinkling stars: position, size and fade state"""
+    FIELDS = ('x', 'y', 'size', 'opacity', 'fade_speed', 'fade_direction',
+              'min_opacity', 'max_opacity')
+
+    def twinkle(self, steps):
+        """Fade every star, bouncing between its min and max opacity"""
+        if HAVE_NUMPY:
+            opacity = self.view('opacity')
+            direction = self.view('fade_direction')
+            high = self.view('max_opacity')
+            low = self.view('min_opacity')
+            opacity += self.view('fade_speed') * direction * steps
+            # Reverse direction at the limits
+            direction[opacity >= high] = -1
+            direction[opacity <= low] = 1
+            np.clip(opacity, low, high, out=opacity)
+            return
+        opacity, direction = self.opacity, self.fade_direction
+        high, low, speed = self.max_opacity, self.min_opacity, self.fade_speed
+        for i in range(self.count):
+            opacity[i] += speed[i] * direction[i] * steps
+            if opacity[i] >= high[i]:
+                opacity[i] = high[i]
+                direction[i] = -1
+            elif opacity[i] <= low[i]:
+                opacity[i] = low[i]
+                direction[i] = 1
@@ -0,0 +1,185 @@
+"""
+Event Log
+Lightweight structured logging. Entries (time, level, category, message, args)
+go into a preallocated ring buffer; formatting and console/file output happen
+on a background thread, so the GUI thread never blocks on terminal I/O. Calls
+below the configured level return straight away. On an unhandled exception
+the traceback and the most recent entries are written to error_log.txt.
+
+    SWISH_KUNAI_LOG=debug|info|warning|error|off   (default info)
+    SWISH_KUNAI_LOG_FILE=path                      (also append to a file)
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+# Entries kept in memory (older ones are overwritten)
+LOG_CAPACITY = 4096
+
+# How often the background thread writes pending entries out (seconds)
+FLUSH_INTERVAL = 0.2
+
+# Where crash dumps go
+CRASH_LOG_PATH = "error_log.txt"
+
+
+def level_from_environment():
+    """Log level requested via SWISH_KUNAI_LOG (INFO when unset)"""
+    name = os.environ.get("SWISH_KUNAI_LOG", "").strip().lower()
+    levels = {"debug": DEBUG, "info": INFO, "warning": WARNING, "warn": WARNING,
+              "error": ERROR, "off": OFF, "0": OFF}
+    return levels.get(name, INFO)
+
+
+class EventLog:
+    """Ring buffer of log entries plus the thread that writes them out"""
+    def __init__(self, capacity=LOG_CAPACITY, level=INFO, stream=None):
+        self.capacity = capacity
+        self.level = level
+        self.stream = stream  # None means sys.stdout at write time
+        self.file_path = None
+        self.origin = time.perf_counter()
+
+        # Preallocated slots; `written` counts every entry ever logged
+        self.entries = [None] * capacity
+        self.written = 0
+        self.flushed = 0  # Entries already handed to the output
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+
+        self.thread = None
+        self.stopping = threading.Event()
+
+    def enabled(self, level):
+        """Check before building expensive arguments"""
+        return level >= self.level
+
+    def log(self, level, category, message, *args):
+        """Record an entry; `message % args` is only formatted when it's written out"""
+        if level < self.level:
+            return
+        entry = (time.perf_counter() - self.origin, level, category, message, args)
+        with self.lock:
+            self.entries[self.written % self.capacity] = entry
+            self.written += 1
+
+    def debug(self, category, message, *args):
+        if DEBUG >= self.level:
+            self.log(DEBUG, category, message, *args)
+
+    def info(self, category, message, *args):
+        if INFO >= self.level:
+            self.log(INFO, category, message, *args)
+
+    def warning(self, category, message, *args):
+        if WARNING >= self.level:
+            self.log(WARNING, category, message, *args)
+
+    def error(self, category, message, *args):
+        if ERROR >= self.level:
+            self.log(ERROR, category, message, *args)
+
+    def recent(self, count=None):
+        """Formatted lines for the newest entries still in the buffer, oldest first"""
+        with self.lock:
+            available = min(self.written, self.capacity)
+            count = available if count is None else min(count, available)
+            first = self.written - count
+            entries = [self.entries[i % self.capacity] for i in range(first, self.written)]
+        return [_format(entry) for entry in entries]
+
+    def start(self):
+        """Start writing entries out in the background"""
+        if self.thread is not None:
+            return
+        self.file_path = os.environ.get("SWISH_KUNAI_LOG_FILE") or None
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._run, name="EventLog", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopping.wait(FLUSH_INTERVAL):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Write out everything logged since the last flush"""
+        with self.flush_lock:
+            with self.lock:
+                # If the writer lapped us, the oldest pending entries are gone
+                dropped = max(0, self.written - self.flushed - self.capacity)
+                first = self.flushed + dropped
+                entries = [self.entries[i % self.capacity] for i in range(first, self.written)]
+                self.flushed = self.written
+            if not entries and not dropped:
+                return
+            lines = [_format(entry) for entry in entries]
+            if dropped:
+                lines.insert(0, f"... {dropped} log entries dropped ...")
+            text = "\n".join(lines) + "\n"
+            try:
+                stream = self.stream or sys.stdout
+                stream.write(text)
+                stream.flush()
+                if self.file_path:
+                    with open(self.file_path, 'a', encoding='utf-8') as f:
+                        f.write(text)
+            except (OSError, ValueError, AttributeError):
+                pass  # No console (pythonw) or it was closed - keep the ring only
+
+    def close(self):
+        """Stop the background thread after a final flush"""
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+    def dump(self, path, header=""):
+        """Write `header` and every entry still in the buffer to `path`"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if header:
+                f.write(header.rstrip("\n") + "\n\n")
+            f.write("Recent events:\n")
+            f.write("\n".join(self.recent()) + "\n")
+
+
+def _format(entry):
+    elapsed, level, category, message, args = entry
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = f"{message} {args!r}"
+    return f"{elapsed:10.3f} {LEVEL_NAMES.get(level, level):5s} [{category}] {message}"
+
+
+def install_crash_handler(log, path=CRASH_LOG_PATH):
+    """Dump the traceback and recent log entries to `path` on an unhandled exception"""
+    previous_hook = sys.excepthook
+
+    def crash_hook(exc_type, exc_value, exc_traceback):
+        header = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+        try:
+            log.flush()
+            log.dump(path, header)
+        except OSError:
+            pass
+        previous_hook(exc_type, exc_value, exc_traceback)
+
+    sys.excepthook = crash_hook
+
+
+# Shared log for the whole application
+event_log = EventLog(level=level_from_environment())
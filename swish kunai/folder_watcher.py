@@ -0,0 +1,76 @@
+"""
+Folder Watcher
+Watches the music folder for changes. Uses the OS notifier behind
+QFileSystemWatcher (inotify on Linux) and falls back to polling the folder's
+mtime when the path can't be watched (e.g. network shares). Bursts of
+notifications are coalesced into one folder_changed signal; the folder is
+never listed here - the window has it checked on the worker thread.
+"""
+
+import os
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+from frame_metrics import MeasuredTimer
+from event_log import event_log
+
+# How long to wait for a burst of changes (copying an album) to settle
+SETTLE_MS = 300
+
+# Polling interval for the fallback mode
+POLL_INTERVAL_MS = 2000
+
+
+class FolderWatcher(QObject):
+    """Emits folder_changed once a burst of changes to the watched folder settles"""
+    # The watched folder
+    folder_changed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.folder = None
+        self.last_mtime_ns = None
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._schedule_diff)
+
+        # Coalesce bursts of change notifications into one signal
+        self.settle_timer = MeasuredTimer("fs_settle", self._settled, self)
+        self.settle_timer.setSingleShot(True)
+
+        # Fallback: cheap stat of the folder itself
+        self.poll_timer = MeasuredTimer("fs_poll", self._poll, self)
+
+    def watch(self, folder):
+        """Start watching a folder"""
+        self.stop()
+        self.folder = folder
+        self.last_mtime_ns = self._folder_mtime()
+        if not self.watcher.addPath(folder):
+            event_log.warning("library", "Can't watch %s - polling for changes instead", folder)
+            self.poll_timer.start(POLL_INTERVAL_MS)
+
+    def stop(self):
+        """Stop watching the current folder"""
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.poll_timer.stop()
+        self.settle_timer.stop()
+        self.folder = None
+
+    def _folder_mtime(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll(self):
+        mtime_ns = self._folder_mtime()
+        if mtime_ns != self.last_mtime_ns:
+            self.last_mtime_ns = mtime_ns
+            self._schedule_diff()
+
+    def _schedule_diff(self, *args):
+        self.settle_timer.start(SETTLE_MS)
+
+    def _settled(self):
+        if self.folder:
+            self.folder_changed.emit(self.folder)
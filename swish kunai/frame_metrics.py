@@ -0,0 +1,253 @@
+"""
+Frame Metrics
+Per-frame timing for the animation clock. Every scheduler frame records its
+length and the time spent simulating (tick callbacks), painting and handling
+input, in a fixed-size ring of array('d') columns. Per-subsystem tick cost and
+lateness against each subsystem's own due time are kept alongside, as are
+those of the window's other timers (MeasuredTimer). The same data feeds the
+on-screen HUD (F3) and a CSV/JSON trace export (F4, or
+SWISH_KUNAI_FRAME_TRACE=path on exit).
+"""
+
+import csv
+import itertools
+import json
+import os
+import time
+from array import array
+from pathlib import Path
+from PyQt6.QtCore import Qt, QRect, QTimer
+from PyQt6.QtGui import QColor, QFont
+
+# Frames kept for the HUD and trace (one minute at ~60 FPS)
+FRAME_HISTORY = 3600
+
+# Columns of the frame ring, in trace order
+FRAME_FIELDS = ('time_s', 'frame_ms', 'sim_ms', 'paint_ms', 'event_ms')
+
+# Area covered by the HUD (bottom-left, below the buttons and clear of the base kunai)
+HUD_RECT = QRect(5, 606, 225, 90)
+
+# The HUD text is refreshed this often (seconds) rather than every frame
+HUD_REFRESH = 0.25
+
+
+def frame_trace_path():
+    """Where to write the frame trace on exit (SWISH_KUNAI_FRAME_TRACE), or None"""
+    path = os.environ.get("SWISH_KUNAI_FRAME_TRACE", "")
+    return Path(path) if path else None
+
+
+class _SubsystemStats:
+    """Tick cost and timer jitter of one scheduler subsystem or timer"""
+    __slots__ = ('ticks', 'cost_ms', 'worst_cost_ms', 'jitter_ms', 'worst_late_ms')
+
+    def __init__(self):
+        self.ticks = 0
+        self.cost_ms = 0.0
+        self.worst_cost_ms = 0.0
+        self.jitter_ms = 0.0  # Sum of |lateness|
+        self.worst_late_ms = 0.0
+
+
+class FrameMetrics:
+    """Rolling per-frame timings plus per-subsystem tick statistics"""
+    def __init__(self, capacity=FRAME_HISTORY):
+        self.capacity = capacity
+        self.origin = time.perf_counter()
+        for name in FRAME_FIELDS:
+            setattr(self, name, array('d', [0.0]) * capacity)
+        self.recorded = 0  # Frames recorded in total; the ring keeps the last `capacity`
+        self.subsystems = {}  # name -> _SubsystemStats, in first-tick order
+        self.timers = {}  # name -> _SubsystemStats for timers outside the frame clock
+
+        # The frame in progress (None while the clock is stopped)
+        self.frame_start = None
+        self.pending_sim_ms = 0.0
+        self.pending_paint_ms = 0.0
+        self.pending_event_ms = 0.0
+
+    def __len__(self):
+        return min(self.recorded, self.capacity)
+
+    def begin_frame(self, now, interval_ms):
+        """A scheduler tick started; close the previous frame if there was one"""
+        if self.frame_start is not None:
+            self._record(interval_ms)
+        self.frame_start = now
+        self.pending_sim_ms = 0.0
+        self.pending_paint_ms = 0.0
+        self.pending_event_ms = 0.0
+
+    def drop_frame(self):
+        """The clock stopped - the open frame has no end, so forget it"""
+        self.frame_start = None
+
+    def add_tick(self, name, late_ms, cost_ms):
+        """One subsystem callback ran `late_ms` after it was due and took `cost_ms`"""
+        _add_sample(self.subsystems, name, late_ms, cost_ms)
+        self.pending_sim_ms += cost_ms
+
+    def add_timer(self, name, late_ms, cost_ms):
+        """A timer outside the frame clock fired `late_ms` late and its handler took `cost_ms`"""
+        _add_sample(self.timers, name, late_ms, cost_ms)
+
+    def add_paint(self, ms):
+        if self.frame_start is not None:
+            self.pending_paint_ms += ms
+
+    def add_event(self, ms):
+        if self.frame_start is not None:
+            self.pending_event_ms += ms
+
+    def _record(self, frame_ms):
+        slot = self.recorded % self.capacity
+        self.time_s[slot] = self.frame_start - self.origin
+        self.frame_ms[slot] = frame_ms
+        self.sim_ms[slot] = self.pending_sim_ms
+        self.paint_ms[slot] = self.pending_paint_ms
+        self.event_ms[slot] = self.pending_event_ms
+        self.recorded += 1
+
+    def frames(self):
+        """Recorded frames, oldest first, as tuples in FRAME_FIELDS order"""
+        count = len(self)
+        first = self.recorded - count
+        columns = [getattr(self, name) for name in FRAME_FIELDS]
+        return [tuple(column[(first + i) % self.capacity] for column in columns)
+                for i in range(count)]
+
+    @staticmethod
+    def _stats_summary(table):
+        return {
+            name: {
+                'ticks': stats.ticks,
+                'cost_avg_ms': stats.cost_ms / stats.ticks,
+                'cost_worst_ms': stats.worst_cost_ms,
+                'jitter_avg_ms': stats.jitter_ms / stats.ticks,
+                'late_worst_ms': stats.worst_late_ms,
+            }
+            for name, stats in table.items()
+        }
+
+    def summary(self):
+        """Averages, lows and per-subsystem statistics over the recorded frames"""
+        count = len(self)
+        frame_ms = sorted(self.frame_ms[:count], reverse=True)
+
+        def average(values):
+            return sum(values) / len(values) if values else 0.0
+
+        def low(fraction):
+            # Average of the slowest `fraction` of frames (at least one)
+            return average(frame_ms[:max(1, int(count * fraction))]) if count else 0.0
+
+        frame_avg = average(frame_ms)
+        return {
+            'frames': count,
+            'fps': 1000.0 / frame_avg if frame_avg else 0.0,
+            'frame_avg_ms': frame_avg,
+            'low_1_ms': low(0.01),
+            'low_0_1_ms': low(0.001),
+            'worst_frame_ms': frame_ms[0] if count else 0.0,
+            'sim_avg_ms': average(self.sim_ms[:count]),
+            'paint_avg_ms': average(self.paint_ms[:count]),
+            'event_avg_ms': average(self.event_ms[:count]),
+            'subsystems': self._stats_summary(self.subsystems),
+            'timers': self._stats_summary(self.timers),
+        }
+
+    def hud_lines(self):
+        """Short text lines for the on-screen HUD"""
+        s = self.summary()
+        lines = [
+            f"FPS {s['fps']:5.1f}  frame {s['frame_avg_ms']:5.2f} ms",
+            f"low 1% {s['low_1_ms']:5.2f}  0.1% {s['low_0_1_ms']:5.2f} ms",
+            f"sim {s['sim_avg_ms']:.2f} paint {s['paint_avg_ms']:.2f} "
+            f"event {s['event_avg_ms']:.2f}",
+        ]
+        # Jitter is the average timer error, late the worst lateness (ms)
+        for name, stats in itertools.chain(s['subsystems'].items(), s['timers'].items()):
+            lines.append(f"{name[:10]:10s} jit {stats['jitter_avg_ms']:5.2f} "
+                         f"late {stats['late_worst_ms']:4.1f}")
+        return lines
+
+    def export(self, path):
+        """Write the trace as CSV (frames only) or JSON (summary and frames) by suffix"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".csv":
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(FRAME_FIELDS)
+                writer.writerows(self.frames())
+            return
+        with open(path, 'w') as f:
+            json.dump({
+                'summary': self.summary(),
+                'fields': FRAME_FIELDS,
+                'frames': self.frames(),
+            }, f)
+
+
+def _add_sample(table, name, late_ms, cost_ms):
+    stats = table.get(name)
+    if stats is None:
+        stats = table[name] = _SubsystemStats()
+    stats.ticks += 1
+    stats.cost_ms += cost_ms
+    stats.worst_cost_ms = max(stats.worst_cost_ms, cost_ms)
+    stats.jitter_ms += abs(late_ms)
+    stats.worst_late_ms = max(stats.worst_late_ms, late_ms)
+
+
+class MeasuredTimer(QTimer):
+    """QTimer that calls `handler` on timeout and, once `metrics` is set, reports
+    how late each timeout fired and how long the handler took"""
+    def __init__(self, name, handler, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.handler = handler
+        self.metrics = None  # Optional FrameMetrics
+        self.due = None  # perf_counter time the next timeout is expected
+        self.timeout.connect(self._fire)
+
+    def start(self, msec=None):
+        if msec is None:
+            msec = self.interval()
+            super().start()
+        else:
+            super().start(msec)
+        self.due = time.perf_counter() + msec / 1000.0
+
+    def stop(self):
+        super().stop()
+        self.due = None
+
+    def _fire(self):
+        now = time.perf_counter()
+        late_ms = (now - self.due) * 1000.0 if self.due is not None else 0.0
+        if self.isSingleShot():
+            self.due = None
+        else:
+            # Like Qt, a repeating timer keeps its cadence unless it fell a whole interval behind
+            interval = self.interval() / 1000.0
+            self.due = (self.due or now) + interval
+            if self.due < now:
+                self.due = now + interval
+        self.handler()
+        if self.metrics is not None:
+            self.metrics.add_timer(self.name, late_ms, (time.perf_counter() - now) * 1000.0)
+
+
+def draw_hud(painter, metrics):
+    """Draw the timing HUD over the bottom-left corner of the window"""
+    painter.setOpacity(1.0)
+    painter.fillRect(HUD_RECT, QColor(0, 0, 0, 160))
+    painter.setPen(QColor(120, 255, 120))
+    painter.setFont(QFont("Monospace", 8))
+    line_height = 12
+    for i, line in enumerate(metrics.hud_lines()[:HUD_RECT.height() // line_height]):
+        painter.drawText(HUD_RECT.left() + 6, HUD_RECT.top() + 4 + i * line_height,
+                         HUD_RECT.width() - 12, line_height,
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, line)
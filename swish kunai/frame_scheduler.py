@@ -0,0 +1,147 @@
+"""
+Frame Scheduler
+Single animation clock for the window. Subsystems register a tick callback
+and the interval they need (the game 16 ms, the music-mode spin 50 ms); the
+clock sleeps until the next one is due, steps every due subsystem in a fixed
+order, and merges what they invalidate into at most one repaint per frame. It
+stops completely when no subsystem is animating or the window is minimized.
+With a FrameMetrics attached, every frame's length and each callback's cost
+and lateness against its own due time are fed to it.
+"""
+
+import time
+from PyQt6.QtCore import QObject, QTimer, Qt
+from PyQt6.QtGui import QRegion
+
+# Default subsystem interval in milliseconds (~60 FPS)
+FRAME_MS = 16
+
+# Subsystems due within this many seconds run in the current frame rather than waking again
+DUE_SLACK = 0.001
+
+# Longest step handed to subsystems, so a stall doesn't teleport animations
+MAX_FRAME_DT = 0.1
+
+
+class _Subsystem:
+    """Registered tick callback and its running state"""
+    __slots__ = ('name', 'callback', 'order', 'interval', 'active', 'due', 'last_tick')
+
+    def __init__(self, name, callback, order, interval):
+        self.name = name
+        self.callback = callback
+        self.order = order
+        self.interval = interval  # Seconds between ticks
+        self.active = False
+        self.due = 0.0  # perf_counter time of the next tick
+        self.last_tick = 0.0
+
+
+class FrameScheduler(QObject):
+    """Ticks active subsystems and coalesces their repaints"""
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.widget = widget
+        self.subsystems = []
+        self.by_name = {}
+        self.suspended = False
+        self.running = False
+        self.last_tick = None
+        self.metrics = None  # Optional FrameMetrics
+
+        # Area to repaint at the end of the current frame
+        self.dirty = QRegion()
+        self.dirty_all = False
+
+        # Re-armed after every frame for the next due subsystem
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+    def register(self, name, callback, order, interval_ms=FRAME_MS):
+        """Add a subsystem ticked every `interval_ms`; callback(dt) returns what to repaint
+
+        The return value may be None/False (nothing), True (whole window),
+        or a QRect/QRegion limited to the subsystem's own area.
+        """
+        subsystem = _Subsystem(name, callback, order, interval_ms / 1000.0)
+        self.subsystems.append(subsystem)
+        self.subsystems.sort(key=lambda s: s.order)
+        self.by_name[name] = subsystem
+
+    def set_active(self, name, active):
+        """Start or stop ticking a subsystem (its first tick comes one interval later)"""
+        subsystem = self.by_name[name]
+        if active and not subsystem.active:
+            now = time.perf_counter()
+            subsystem.last_tick = now
+            subsystem.due = now + subsystem.interval
+        subsystem.active = active
+        self._update_running()
+
+    def set_suspended(self, suspended):
+        """Pause all ticking (e.g. while the window is minimized)"""
+        self.suspended = suspended
+        self._update_running()
+
+    def _merge(self, area):
+        if not area:
+            return
+        if area is True:
+            self.dirty_all = True
+        else:
+            self.dirty = self.dirty.united(area)
+
+    def _update_running(self):
+        """Arm the timer for the next due subsystem, or stop the clock"""
+        active = [s for s in self.subsystems if s.active] if not self.suspended else []
+        now = time.perf_counter()
+        if active:
+            if not self.running:
+                self.running = True
+                self.last_tick = now
+            delay = min(s.due for s in active) - now
+            self.timer.start(max(0, int(delay * 1000)))
+        elif self.running:
+            self.running = False
+            self.timer.stop()
+            self._flush()
+            if self.metrics is not None:
+                self.metrics.drop_frame()
+
+    def _tick(self):
+        now = time.perf_counter()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.begin_frame(now, (now - self.last_tick) * 1000.0)
+        self.last_tick = now
+
+        # Fixed order; a subsystem may switch others on or off while ticking
+        for subsystem in self.subsystems:
+            if not subsystem.active or subsystem.due - now > DUE_SLACK:
+                continue
+            dt = min(now - subsystem.last_tick, MAX_FRAME_DT)
+            late_ms = (now - subsystem.due) * 1000.0
+            subsystem.last_tick = now
+            # Keep the subsystem's own cadence, dropping ticks it missed entirely
+            subsystem.due += subsystem.interval
+            if subsystem.due < now:
+                subsystem.due = now + subsystem.interval
+            start = time.perf_counter()
+            self._merge(subsystem.callback(dt))
+            if metrics is not None:
+                metrics.add_tick(subsystem.name, late_ms,
+                                 (time.perf_counter() - start) * 1000.0)
+
+        self._flush()
+        self._update_running()
+
+    def _flush(self):
+        """Issue the single repaint for this frame"""
+        if self.dirty_all:
+            self.widget.update()
+        elif not self.dirty.isEmpty():
+            self.widget.update(self.dirty)
+        self.dirty = QRegion()
+        self.dirty_all = False
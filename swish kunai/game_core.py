@@ -0,0 +1,291 @@
+"""
+Game Core
+Rules of the Swish Kunai game with no Qt dependency: the circle's spin, kunai
+flight, hits and collisions, scoring, speed ramps and rest periods. The
+simulation advances in fixed steps (FixedStepRunner turns real elapsed time
+into whole steps), and the window only renders the resulting state,
+interpolated between the last two steps. Hits are found by sweeping each
+kunai tip's path against the circle, so the step length can be raised
+without kunai tunnelling through it. Games can also be simulated headless
+from a seed.
+"""
+
+import math
+import random
+from angle_index import AngleIndex
+from entity_store import KunaiStore
+
+# Input actions accepted by GameCore.step()
+LAUNCH = "launch"
+REPLAY = "replay"  # Start over after a game over
+
+# Events returned by GameCore.step()
+HIT = "hit"
+GAME_OVER = "game_over"
+SPEED_UP = "speed_up"
+REST_STARTED = "rest_started"
+REST_TICK = "rest_tick"
+REST_OVER = "rest_over"
+
+# Circle geometry (window coordinates)
+CIRCLE_CENTER_X = 250
+CIRCLE_CENTER_Y = 220
+CIRCLE_RADIUS = 120
+
+# Where kunai are launched from, and half their sprite length (tip offset)
+KUNAI_BASE_X = 250
+KUNAI_BASE_Y = 620
+KUNAI_HALF_LENGTH = 60
+
+# Physics constants are per 16ms step, spin speeds in degrees per 50ms step
+PHYSICS_STEP = 0.016
+SPIN_STEP = 0.05
+LAUNCH_VELOCITY = -20
+GRAVITY = 0.3
+START_SPEED = 3.0
+SLOW_SPEED = 0.5  # While resting or after a game over
+
+# Default length of one simulation step (physics and spin advance together);
+# longer steps (e.g. 1/30 s on slow machines) give the same hits
+SIM_STEP = PHYSICS_STEP
+
+# Most steps run for one frame; after a longer stall the game slows down
+# instead of trying to catch up all at once
+MAX_CATCH_UP_STEPS = 8
+
+# Kunai closer than this (degrees) to a stuck one collide
+COLLISION_ANGLE = 5
+
+HIT_SCORE = 5
+
+# Speed ramp, rest start and rest length in seconds
+SPEED_UP_INTERVAL = 30
+REST_START = 35
+REST_DURATION = 60
+
+
+def circle_entry_time(x0, y0, x1, y1, cx, cy, radius):
+    """Fraction (0..1) along the segment where it first enters the circle, or None"""
+    dx = x1 - x0
+    dy = y1 - y0
+    fx = x0 - cx
+    fy = y0 - cy
+    a = dx * dx + dy * dy
+    c = fx * fx + fy * fy - radius * radius
+    if a == 0 or c < 0:
+        return None  # Not moving, or already inside
+    b = 2 * (fx * dx + fy * dy)
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return None  # Path misses the circle
+    t = (-b - math.sqrt(disc)) / (2 * a)
+    return t if 0 <= t <= 1 else None
+
+
+class GameCore:
+    """Complete game state, advanced by step(dt, inputs)"""
+    def __init__(self, seed=None):
+        self.seed = seed
+        # All randomness in a game (e.g. the star layout) comes from here
+        self.random = random.Random(seed)
+        self.reset()
+
+    def reset(self, rotation=0.0, seed=None):
+        """Start a fresh game with the circle at `rotation` degrees (optionally reseeded)"""
+        if seed is not None:
+            self.seed = seed
+            self.random.seed(seed)
+        self.rotation = rotation
+        self.previous_rotation = rotation  # Rotation before the last step (for interpolation)
+        self.game_score = 0
+        self.game_over = False
+        self.game_time = 0.0  # Total game time in seconds
+        self.last_speed_increase = 0  # When we last increased speed
+        self.base_game_speed = START_SPEED
+        self.is_resting = False
+        self.rest_time_remaining = 0
+        self.rest_elapsed = 0.0  # Time since the countdown last ticked
+        # Flying kunai: x, y, prev_y (before the last step) and velocity_y columns
+        self.active_kunai = KunaiStore()
+        # Angles (relative to the circle's surface) of kunai stuck to the circle
+        self.stuck_kunai = AngleIndex()
+        self.last_hit_angle = None
+
+    def replay(self):
+        """Clear the board after a game over (time and speed carry on)"""
+        self.game_over = False
+        self.game_score = 0
+        self.stuck_kunai.clear()
+        self.active_kunai.clear()
+
+    def step(self, dt, inputs=()):
+        """Advance the game by dt seconds after applying inputs; returns the events that happened"""
+        events = []
+        # Remember where everything was, for interpolated rendering
+        self.previous_rotation = self.rotation
+        self.active_kunai.save_previous()
+        for action in inputs:
+            if action == REPLAY and self.game_over:
+                self.replay()
+            elif action == LAUNCH and not self.game_over:
+                self.active_kunai.append(x=KUNAI_BASE_X, y=KUNAI_BASE_Y,
+                                         prev_y=KUNAI_BASE_Y, velocity_y=LAUNCH_VELOCITY)
+
+        self._spin(dt)
+        if not self.game_over and not self.is_resting:
+            self._advance(dt, events)
+        if self.is_resting:
+            self._rest(dt, events)
+        return events
+
+    def _spin(self, dt):
+        """Rotate the circle; speed depends on game state"""
+        if self.game_over or self.is_resting:
+            speed = SLOW_SPEED
+        else:
+            # Active gameplay: speed increases over time
+            speed = self.base_game_speed
+        self.rotation += speed * dt / SPIN_STEP
+
+    def _advance(self, dt, events):
+        """Move kunai, resolve hits and apply the speed ramp and rest schedule"""
+        steps = dt / PHYSICS_STEP
+        self.game_time += dt
+
+        # Speed increase every 30 seconds
+        if int(self.game_time) >= self.last_speed_increase + SPEED_UP_INTERVAL and self.last_speed_increase < SPEED_UP_INTERVAL:
+            self.base_game_speed += 1.0
+            self.last_speed_increase = int(self.game_time)
+            events.append(SPEED_UP)
+
+        # Rest period at 35 seconds
+        if self.game_time >= REST_START and self.last_speed_increase < 2 * SPEED_UP_INTERVAL:
+            self.is_resting = True
+            self.rest_time_remaining = REST_DURATION
+            self.rest_elapsed = 0.0
+            events.append(REST_STARTED)
+            return
+
+        # Move every kunai at once (slight gravity effect)
+        kunai = self.active_kunai
+        kunai.integrate(steps, GRAVITY)
+
+        # Walk backwards so removing a row (swapping the last one in) is safe
+        for i in range(kunai.count - 1, -1, -1):
+            # Sweep the kunai tip (top of the sprite) over this step's path
+            x = kunai.x[i]
+            tip_start = kunai.prev_y[i] - KUNAI_HALF_LENGTH
+            tip_end = kunai.y[i] - KUNAI_HALF_LENGTH
+            t = circle_entry_time(x, tip_start, x, tip_end,
+                                  CIRCLE_CENTER_X, CIRCLE_CENTER_Y, CIRCLE_RADIUS)
+
+            if t is not None:
+                # Hit - the tip sticks where it crossed the circumference
+                kunai.y[i] = kunai.prev_y[i] + (kunai.y[i] - kunai.prev_y[i]) * t
+                dx = x - CIRCLE_CENTER_X
+                dy = tip_start + (tip_end - tip_start) * t - CIRCLE_CENTER_Y
+                # Angle relative to the circle's surface at the moment of impact,
+                # so it turns with the circle
+                rotation = self.previous_rotation + (self.rotation - self.previous_rotation) * t
+                surface_angle = (math.degrees(math.atan2(dy, dx)) - rotation) % 360
+                if self.stuck_kunai.within(surface_angle, COLLISION_ANGLE):
+                    self.game_over = True
+                    events.append(GAME_OVER)
+                else:
+                    self.stuck_kunai.add(surface_angle)
+                    self.last_hit_angle = surface_angle
+                    self.game_score += HIT_SCORE
+                    events.append(HIT)
+                # Remove from the active list either way
+                kunai.remove(i)
+            elif kunai.y[i] < -150:
+                # Went off screen (top)
+                kunai.remove(i)
+
+    def rotation_at(self, alpha):
+        """Circle rotation `alpha` (0..1) of the way from the previous step to the current one"""
+        return self.previous_rotation + (self.rotation - self.previous_rotation) * alpha
+
+    def kunai_y_at(self, index, alpha):
+        """Height of flying kunai `index`, interpolated the same way"""
+        kunai = self.active_kunai
+        return kunai.prev_y[index] + (kunai.y[index] - kunai.prev_y[index]) * alpha
+
+    def _rest(self, dt, events):
+        """Count the rest period down once per elapsed second"""
+        self.rest_elapsed += dt
+        if self.rest_elapsed < 1.0:
+            return
+        self.rest_elapsed -= 1.0
+        self.rest_time_remaining -= 1
+        events.append(REST_TICK)
+        if self.rest_time_remaining <= 0:
+            self.is_resting = False
+            self.last_speed_increase = 2 * SPEED_UP_INTERVAL
+            events.append(REST_OVER)
+
+
+class FixedStepRunner:
+    """Turns real elapsed time into whole fixed-length steps of a GameCore"""
+    def __init__(self, core, step_length=SIM_STEP):
+        self.core = core
+        self.step_length = step_length
+        self.accumulator = 0.0  # Elapsed time not yet simulated
+        self.pending_inputs = []  # Actions for the next step
+        self.steps_run = 0
+        self.recording = None  # Replay receiving every applied input
+        self.playback = None  # Step index -> actions, replacing player input
+        self.playback_steps = 0
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.pending_inputs.clear()
+        self.steps_run = 0
+        self.recording = None
+        self.playback = None
+
+    def start_recording(self, replay):
+        """Record every input (with the step it applies at) into `replay`"""
+        self.recording = replay
+
+    def start_playback(self, replay):
+        """Take inputs from `replay` instead of push()"""
+        self.playback = replay.inputs_by_step()
+        self.playback_steps = replay.total_steps
+
+    def playback_done(self):
+        return self.playback is not None and self.steps_run >= self.playback_steps
+
+    def push(self, action):
+        """Queue a player action; it applies at the start of the next step"""
+        self.pending_inputs.append(action)
+
+    def advance(self, elapsed):
+        """Simulate `elapsed` seconds of real time; returns the events of every step run"""
+        self.accumulator += elapsed
+        events = []
+        steps = 0
+        while self.accumulator >= self.step_length:
+            if self.playback is not None:
+                if self.playback_done():
+                    break
+                inputs = self.playback.get(self.steps_run, ())
+            else:
+                inputs, self.pending_inputs = self.pending_inputs, []
+            if self.recording is not None:
+                for action in inputs:
+                    self.recording.record(self.steps_run, action)
+            events.extend(self.core.step(self.step_length, inputs))
+            self.steps_run += 1
+            if self.recording is not None:
+                self.recording.total_steps = self.steps_run
+            self.accumulator -= self.step_length
+            steps += 1
+            if steps >= MAX_CATCH_UP_STEPS:
+                self.accumulator = min(self.accumulator, self.step_length)
+                break
+        return events
+
+    def alpha(self):
+        """How far real time is between the last step and the next (0..1)"""
+        return min(self.accumulator / self.step_length, 1.0)
@@ -0,0 +1,56 @@
+"""
+Kunai Atlas
+Sprite sheet holding the kunai pre-rotated at fixed angular steps. Every kunai
+on screen (base, flying and stuck) becomes one pixmap fragment, so a frame
+draws them all with a single drawPixmapFragments call instead of a
+save/translate/rotate/draw/restore sequence per sprite.
+"""
+
+import math
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPixmap, QPainter
+
+# Angular resolution of the atlas in degrees (180 sprites)
+ATLAS_STEP = 2
+
+# Sprites per atlas row
+ATLAS_COLUMNS = 14
+
+
+class KunaiAtlas:
+    """Pre-rotated copies of one sprite, addressed by angle"""
+    def __init__(self, pixmap, step=ATLAS_STEP):
+        self.step = step
+        self.count = int(360 // step)
+        # Square cells big enough for the sprite at any angle
+        self.cell = math.ceil(math.hypot(pixmap.width(), pixmap.height())) + 2
+        rows = math.ceil(self.count / ATLAS_COLUMNS)
+
+        self.pixmap = QPixmap(ATLAS_COLUMNS * self.cell, rows * self.cell)
+        self.pixmap.fill(Qt.GlobalColor.transparent)
+        self.sources = []
+
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        half = self.cell / 2
+        for index in range(self.count):
+            left = (index % ATLAS_COLUMNS) * self.cell
+            top = (index // ATLAS_COLUMNS) * self.cell
+            painter.save()
+            painter.translate(left + half, top + half)
+            painter.rotate(index * step)
+            painter.drawPixmap(QPointF(-pixmap.width() / 2, -pixmap.height() / 2), pixmap)
+            painter.restore()
+            self.sources.append(QRectF(left, top, self.cell, self.cell))
+        painter.end()
+
+    def fragment(self, x, y, angle):
+        """Fragment drawing the sprite centred at (x, y), rotated by `angle` degrees"""
+        index = round(angle / self.step) % self.count
+        return QPainter.PixmapFragment.create(QPointF(x, y), self.sources[index])
+
+    def draw(self, painter, fragments):
+        """Draw a batch of fragments in one call"""
+        if fragments:
+            painter.drawPixmapFragments(fragments, self.pixmap)
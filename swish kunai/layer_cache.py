@@ -0,0 +1,103 @@
+"""
+Layer Cache
+Pre-rendered pixmaps for the window's static layers. The spinning circle with
+its music-note glyph is rendered once and blitted rotated every frame, and the
+backgrounds are scaled once for the current window size and device pixel
+ratio instead of being redrawn from vector paths or source images.
+"""
+
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QPixmap, QPainter, QPainterPath, QPen, QBrush, QColor, QFont
+
+# Circle drawn in the layer (matches the 240px album-art circle)
+CIRCLE_DIAMETER = 240
+CIRCLE_PEN_WIDTH = 5
+
+# Layer edge length with room for the outline
+CIRCLE_LAYER_SIZE = CIRCLE_DIAMETER + 2 * CIRCLE_PEN_WIDTH
+
+
+def draw_layer_region(painter, pixmap, area):
+    """Draw the part of a full-window layer that covers `area` (logical pixels)"""
+    dpr = pixmap.devicePixelRatio()
+    source = QRectF(area.x() * dpr, area.y() * dpr, area.width() * dpr, area.height() * dpr)
+    painter.drawPixmap(QRectF(area), pixmap, source)
+
+
+class LayerCache:
+    """Builds static layers on first use and rebuilds them when size or DPR changes"""
+    def __init__(self):
+        self.sources = {}  # Name -> unscaled source pixmap
+        self.backgrounds = {}  # Name -> pixmap scaled for self.background_key
+        self.background_key = None
+        self.circle = None
+        self.circle_dpr = None
+
+    def set_background_source(self, name, pixmap):
+        """Register (or replace) the source image of a background layer"""
+        self.sources[name] = pixmap
+        self.backgrounds.pop(name, None)
+
+    def background(self, name, size, dpr):
+        """Return the background scaled to `size` at `dpr`, or None if it has no source"""
+        key = (size.width(), size.height(), dpr)
+        if key != self.background_key:
+            # Window resized or moved to a screen with a different DPR
+            self.backgrounds.clear()
+            self.background_key = key
+        layer = self.backgrounds.get(name)
+        if layer is None:
+            source = self.sources.get(name)
+            if source is None or source.isNull():
+                return None
+            layer = source.scaled(round(size.width() * dpr), round(size.height() * dpr),
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation)
+            layer.setDevicePixelRatio(dpr)
+            self.backgrounds[name] = layer
+        return layer
+
+    def circle_layer(self, dpr):
+        """Return the white circle with the music note, rendered for `dpr`"""
+        if self.circle is None or self.circle_dpr != dpr:
+            self.circle = self._render_circle(dpr)
+            self.circle_dpr = dpr
+        return self.circle
+
+    def draw_circle(self, painter, center, rotation):
+        """Blit the circle layer centred on `center`, rotated by `rotation` degrees"""
+        layer = self.circle_layer(painter.device().devicePixelRatioF())
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.translate(center.x(), center.y())
+        painter.rotate(rotation)
+        half = CIRCLE_LAYER_SIZE / 2
+        painter.drawPixmap(QPointF(-half, -half), layer)
+        painter.restore()
+
+    def _render_circle(self, dpr):
+        size = round(CIRCLE_LAYER_SIZE * dpr)
+        layer = QPixmap(size, size)
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(layer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pen = QPen()
+
+        # Circle (filled white with black border)
+        painter.setBrush(QBrush(QColor(255, 255, 255)))
+        pen.setColor(QColor(0, 0, 0))
+        pen.setWidth(CIRCLE_PEN_WIDTH)
+        painter.setPen(pen)
+        painter.drawEllipse(CIRCLE_PEN_WIDTH, CIRCLE_PEN_WIDTH, CIRCLE_DIAMETER, CIRCLE_DIAMETER)
+
+        # Music note - same placement as on the window (baseline at 195,280 for a circle at 130,100)
+        music_font = QFont("Ink Free", 140, QFont.Weight.Bold)
+        path = QPainterPath()
+        path.addText(65 + CIRCLE_PEN_WIDTH, 180 + CIRCLE_PEN_WIDTH, music_font, "♪")
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(path)
+        painter.fillPath(path, QBrush(QColor(0, 0, 0)))
+        painter.end()
+        return layer
@@ -6,12 +6,18 @@ Main application entry point using PyQt6
 import sys
 from PyQt6.QtWidgets import QApplication
 from music_player_window import MusicPlayerWindow
+from event_log import event_log, install_crash_handler
 
 def main():
+    # Log output happens on a background thread; crashes dump recent events to error_log.txt
+    event_log.start()
+    install_crash_handler(event_log)
     app = QApplication(sys.argv)
     window = MusicPlayerWindow()
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    event_log.close()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
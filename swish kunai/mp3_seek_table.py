@@ -0,0 +1,106 @@
+"""
+MP3 Seek Table
+Frame-offset index for MP3 files. Walking the frame headers once gives the
+byte offset of the frame playing at every SEEK_STEP seconds, so seeking in
+VBR files is a constant-time lookup instead of a decode from the start.
+"""
+
+# Resolution of the table in seconds
+SEEK_STEP = 0.25
+
+# Bitrates in kbps indexed by [version_is_mpeg1][layer][bitrate_index]
+_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+
+# Sample rates indexed by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+
+def _parse_header(data, pos):
+    """Return (frame_length, samples_per_frame, sample_rate) or None if not a frame header"""
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = (b2 >> 4) & 0x0F
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // sample_rate + padding, 576, sample_rate
+    return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+
+
+def _skip_id3(data):
+    """Return the offset of the first byte after an ID3v2 tag"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+class Mp3SeekTable:
+    """Byte offsets of the frames playing at each SEEK_STEP boundary"""
+    def __init__(self, offsets, duration):
+        self.offsets = offsets
+        self.duration = duration
+
+    @classmethod
+    def build(cls, data):
+        """Scan MP3 bytes and return a table, or None if no frames were found"""
+        pos = _skip_id3(data)
+        end = len(data) - 4
+        offsets = []
+        elapsed = 0.0
+        next_mark = 0.0
+        while pos < end:
+            header = _parse_header(data, pos)
+            if header is None:
+                # Lost sync (junk or trailing tag) - look for the next frame start
+                pos = data.find(b"\xFF", pos + 1)
+                if pos < 0:
+                    break
+                continue
+            length, samples, sample_rate = header
+            if length <= 0:
+                break
+            # Record this frame for every step boundary it covers
+            while next_mark <= elapsed:
+                offsets.append(pos)
+                next_mark += SEEK_STEP
+            elapsed += samples / sample_rate
+            pos += length
+
+        if not offsets:
+            return None
+        return cls(offsets, elapsed)
+
+    def lookup(self, seconds):
+        """Return (byte_offset, actual_seconds) for the frame at a position"""
+        index = int(max(0.0, seconds) / SEEK_STEP)
+        index = min(index, len(self.offsets) - 1)
+        return self.offsets[index], index * SEEK_STEP
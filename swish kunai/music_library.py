@@ -0,0 +1,245 @@
+"""
+Music Library
+Persistent SQLite index of the music folder (path, size, mtime, duration and tags)
+so startup only re-probes files that changed since the last run. The module
+functions each take their own connection, so a worker thread can read a
+folder's cached rows, check the folder with stat_folder/diff_folder and write
+what changed, leaving MusicLibrary (on the GUI thread) only to take over the
+results with set_folder and apply_scanned.
+"""
+
+import itertools
+import os
+import sqlite3
+from pathlib import Path
+
+# Audio file types the player can load
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.flac', '.m4a', '.ogg')
+
+# Fallback length used when a file can't be probed
+DEFAULT_DURATION = 180
+
+
+def probe_file(path):
+    """Read duration and basic tags from an audio file using mutagen"""
+    info = {'duration': None, 'title': "", 'artist': "", 'album': ""}
+    try:
+        from mutagen import File
+        audio = File(path, easy=True)
+        if audio is None:
+            return info
+        if audio.info:
+            info['duration'] = audio.info.length
+        tags = audio.tags or {}
+        for key in ('title', 'artist', 'album'):
+            value = tags.get(key)
+            # Easy tags are lists of strings
+            if isinstance(value, list):
+                value = value[0] if value else ""
+            info[key] = str(value) if value else ""
+    except Exception:
+        pass  # mutagen missing or unreadable file - keep defaults
+    return info
+
+
+def stat_folder(folder):
+    """Return {file name: (size, mtime_ns)} for the audio files in a folder"""
+    current = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            current[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return current
+
+
+def snapshot(tracks):
+    """{file name: (size, mtime_ns)} of track dicts, for diff_folder"""
+    return {name: (track['size'], track['mtime_ns']) for name, track in tracks.items()}
+
+
+def diff_folder(known, current):
+    """Compare two {name: (size, mtime_ns)} maps; returns (added, changed, removed) names"""
+    added = [name for name in current if name not in known]
+    changed = [name for name, stat in current.items() if name in known and known[name] != stat]
+    removed = [name for name in known if name not in current]
+    return added, changed, removed
+
+
+def open_index(db_path):
+    """Connect to the index database, creating it on first use
+
+    Every thread that touches the index opens its own connection.
+    """
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS tracks (
+            path TEXT PRIMARY KEY,
+            folder TEXT NOT NULL,
+            name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            duration REAL,
+            title TEXT,
+            artist TEXT,
+            album TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS tracks_folder ON tracks(folder)")
+    conn.commit()
+    return conn
+
+
+def read_folder(conn, folder):
+    """{file name: track dict} of a folder's indexed rows (nothing on disk is checked)"""
+    rows = conn.execute(
+        "SELECT name, size, mtime_ns, duration, title, artist, album "
+        "FROM tracks WHERE folder = ?", (str(Path(folder)),)).fetchall()
+    return {
+        row[0]: {'name': row[0], 'size': row[1], 'mtime_ns': row[2],
+                 'duration': row[3], 'title': row[4] or "",
+                 'artist': row[5] or "", 'album': row[6] or ""}
+        for row in rows
+    }
+
+
+def read_stats(conn, folder):
+    """{file name: (size, mtime_ns)} of a folder's indexed rows, for diff_folder"""
+    rows = conn.execute("SELECT name, size, mtime_ns FROM tracks WHERE folder = ?",
+                        (str(Path(folder)),))
+    return {name: (size, mtime_ns) for name, size, mtime_ns in rows}
+
+
+def make_track(name, size, mtime_ns):
+    """An unprobed track dict (see MusicLibrary.unprobed)"""
+    return {'name': name, 'size': size, 'mtime_ns': mtime_ns,
+            'duration': None, 'title': "", 'artist': "", 'album': ""}
+
+
+def scanned_tracks(current, added, changed):
+    """Unprobed track dicts for the new and modified files of a folder diff"""
+    return [make_track(name, *current[name]) for name in itertools.chain(added, changed)]
+
+
+def track_row(folder, track):
+    """Convert a track dict to a database row"""
+    return (os.path.join(folder, track['name']), folder, track['name'],
+            track['size'], track['mtime_ns'], track['duration'],
+            track['title'], track['artist'], track['album'])
+
+
+def write_changes(conn, folder, tracks, removed):
+    """Store (re)indexed track dicts and delete removed file names, in one transaction"""
+    folder = str(Path(folder))
+    with conn:
+        if tracks:
+            conn.executemany("INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             [track_row(folder, track) for track in tracks])
+        if removed:
+            conn.executemany("DELETE FROM tracks WHERE path = ?",
+                             [(os.path.join(folder, name),) for name in removed])
+
+
+class MusicLibrary:
+    """On-disk index of audio files keyed by path"""
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.conn = open_index(self.db_path)
+
+        # In-memory view of the current folder: file name -> track dict
+        self.folder = None
+        self.tracks = {}
+
+    def load(self, folder):
+        """Make `folder` current using only the indexed rows; returns sorted file names
+
+        Nothing on disk is checked - follow up with stat_folder() and
+        apply_changes().
+        """
+        self.set_folder(folder, read_folder(self.conn, folder))
+        return sorted(self.tracks, key=str.lower)
+
+    def set_folder(self, folder, tracks):
+        """Make `folder` current with its tracks as read by read_folder()"""
+        self.folder = str(Path(folder))
+        self.tracks = tracks
+
+    def apply_changes(self, current, added, changed, removed, probe=False):
+        """Record a folder diff: new and modified files are (re)indexed, removed ones dropped
+
+        `current` is the stat_folder() result the diff came from. Modified
+        files lose their probe info, so they show up in unprobed() again.
+        """
+        tracks = scanned_tracks(current, added, changed)
+        if probe:
+            for track in tracks:
+                self._apply_info(track, probe_file(os.path.join(self.folder, track['name'])))
+        write_changes(self.conn, self.folder, tracks, removed)
+        self.apply_scanned(tracks, removed)
+
+    def apply_scanned(self, tracks, removed):
+        """Take over track dicts already written by write_changes() and drop removed names"""
+        for track in tracks:
+            self.tracks[track['name']] = track
+        for name in removed:
+            self.tracks.pop(name, None)
+
+    def scan(self, folder, probe=True):
+        """Sync the index with a folder and return the sorted list of file names
+
+        Unchanged files (same size and mtime) are served straight from the
+        database; only new or modified files are probed with mutagen. With
+        probe=False they are recorded unprobed and can be filled in later
+        with update_info (see unprobed).
+        """
+        self.load(folder)
+        current = stat_folder(self.folder)
+        self.apply_changes(current, *diff_folder(snapshot(self.tracks), current), probe=probe)
+        return sorted(self.tracks, key=lambda x: x.lower())
+
+    def _apply_info(self, track, info):
+        """Copy probe results into a track (0 duration marks an unreadable file)"""
+        track.update(info)
+        if not track['duration']:
+            track['duration'] = 0.0
+
+    def unprobed(self):
+        """Return names of tracks in the current folder that haven't been probed yet"""
+        return [name for name, track in self.tracks.items() if track['duration'] is None]
+
+    def update_info(self, results):
+        """Store probe results: a list of (file name, info) pairs"""
+        rows = []
+        for name, info in results:
+            track = self.tracks.get(name)
+            if track is None:
+                continue  # File was removed while probing
+            self._apply_info(track, info)
+            rows.append(track_row(self.folder, track))
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def get_track(self, name):
+        """Return the indexed info for a file name in the current folder"""
+        return self.tracks.get(name)
+
+    def get_duration(self, name):
+        """Return the cached duration of a track in seconds"""
+        track = self.tracks.get(name)
+        if track and track['duration']:
+            return track['duration']
+        return DEFAULT_DURATION
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
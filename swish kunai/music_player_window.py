@@ -5,10 +5,50 @@ Displays the music player interface using asset images with clickable elements
 
 from PyQt6.QtWidgets import QMainWindow, QLabel, QPushButton
 from PyQt6.QtGui import QPixmap, QPainter, QMouseEvent, QIcon
-from PyQt6.QtCore import Qt, QRect, QPoint, QSize
+from PyQt6.QtCore import Qt, QRect, QPoint, QSize, QEvent, QTimer
 from pathlib import Path
-import pygame
-import json
+import itertools
+import math
+import secrets
+import time
+from music_library import MusicLibrary
+from track_loader import TrackLoader
+from folder_watcher import FolderWatcher
+from song_list_model import SongListModel, TRACK_INDEX_ROLE
+from song_search import TrigramIndex
+from playback_state import PlaybackClock, open_mixer
+from asset_loader import AssetLoader, GAME_ASSETS, load_game_images
+from waveform_cache import WaveformAnalyzer, waveform_available, waveform_key
+from settings_store import SettingsStore
+from frame_scheduler import FrameScheduler
+from layer_cache import LayerCache, draw_layer_region
+from kunai_atlas import KunaiAtlas
+import game_core
+from star_field import StarField, STAR_FIELD_RECT
+from game_core import GameCore, FixedStepRunner, KUNAI_BASE_X, KUNAI_BASE_Y
+from replay import Replay, FrameCosts, LAST_GAME_PATH
+from stall_meter import StallMeter, stall_meter_enabled
+from event_log import event_log, INFO
+from frame_metrics import FrameMetrics, MeasuredTimer, HUD_RECT, HUD_REFRESH, draw_hud, frame_trace_path
+
+# Area covered by the progress slider, thumb and time label
+SLIDER_AREA_RECT = QRect(70, 455, 360, 75)
+
+# Spinning circle including its hover glow
+CIRCLE_RECT = QRect(114, 84, 272, 272)
+
+# Clip rect of the scrolling song name
+MARQUEE_RECT = QRect(100, 380, 300, 30)
+
+# More new songs than this are merged into the list with one sort, not one insert each
+BULK_INSERT_THRESHOLD = 500
+
+# Events whose handling counts as input time in the frame metrics
+INPUT_EVENT_TYPES = {
+    QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease,
+    QEvent.Type.MouseButtonDblClick, QEvent.Type.MouseMove,
+    QEvent.Type.KeyPress, QEvent.Type.KeyRelease, QEvent.Type.Wheel,
+}
 
 class ClickableButton(QPushButton):
     """Custom button that uses asset images"""
@@ -37,7 +77,7 @@ class ClickableButton(QPushButton):
         self.clicked.connect(self.on_click)
     
     def on_click(self):
-        print(f"Button clicked: {self.objectName()}")
+        event_log.debug("ui", "Button clicked: %s", self.objectName())
         return True
 
 class MusicPlayerWindow(QMainWindow):
@@ -46,13 +86,17 @@ class MusicPlayerWindow(QMainWindow):
         self.setWindowTitle("Swish Kunai")
         self.setFixedSize(500, 700)
         
+        # Pre-rendered static layers (backgrounds, circle and note)
+        self.layer_cache = LayerCache()
+        
         # Load background pixmap (will be painted in paintEvent)
         self.background_pixmap = None
         self.load_background()
         
-        # Load blue background for game mode
+        # Game-mode images (blue background, star, kunai) are decoded in the
+        # background once the window is up - see on_game_images_loaded
         self.blue_background_pixmap = None
-        self.load_blue_background()
+        self.game_assets_ready = False
         
         # Load thumb pixmap
         self.thumb_pixmap = None
@@ -102,14 +146,28 @@ class MusicPlayerWindow(QMainWindow):
         # Track progress for programmatic slider
         self.thumb_progress = 0.0
         
-        # Rotation angle for spinning circle animation
+        # Rotation angle for spinning circle animation; music mode draws it in
+        # whole degrees, and drawn_rotation is the last one invalidated
         self.circle_rotation = 0.0
-        
-        # Setup animation timer for spinning circle (don't start yet)
-        from PyQt6.QtCore import QTimer
-        self.rotation_timer = QTimer(self)
-        self.rotation_timer.timeout.connect(self.update_rotation)
-        # Don't auto-start - only start when play is clicked
+        self.drawn_rotation = 0
+        
+        # Single animation clock: every animated subsystem is ticked here in
+        # this order, at its own interval (ms), and their repaints are merged
+        # into one per frame. Music mode only needs 20 wake-ups a second.
+        # Nothing is active yet - rotation only starts when play is clicked
+        self.frame_scheduler = FrameScheduler(self)
+        self.frame_scheduler.register("rotation", self.update_rotation, 0, 50)  # 1 degree per 50ms
+        self.frame_scheduler.register("game", self.update_game, 1)
+        self.frame_scheduler.register("stars", self.update_stars, 3, 50)
+        self.frame_scheduler.register("marquee", self.update_marquee, 4, 50)  # 1px per 50ms
+        self.frame_scheduler.register("transition", self.update_transition, 5)
+        self.frame_scheduler.register("reverse_transition", self.update_reverse_transition, 6)
+        self.frame_scheduler.register("hud", self.update_hud, 7, int(HUD_REFRESH * 1000))
+        
+        # Per-frame sim/paint/input timings; F3 shows the HUD, F4 exports a trace
+        self.frame_metrics = FrameMetrics()
+        self.frame_scheduler.metrics = self.frame_metrics
+        self.show_frame_hud = False
         
         # Click detection timer for single vs double click
         self.click_timer = QTimer(self)
@@ -127,30 +185,30 @@ class MusicPlayerWindow(QMainWindow):
         # Track music folder and songs
         self.music_folder = None
         self.song_list = []
+        self.song_model = SongListModel(self)  # Virtualized view of song_list for the overlay
+        
+        # Type-ahead search index, built in small slices after the folder loads
+        self.search_index = TrigramIndex()
+        self.search_pending = []  # Songs still waiting to be indexed
+        self.search_build_timer = MeasuredTimer("search_idx", self.build_search_index_step, self)
         self.current_song_index = 0
         self.current_song_name = "Unknown"
         
-        # Initialize pygame mixer for music playback
-        pygame.mixer.init()
-        
-        # Setup music end event to auto-advance to next song
-        from PyQt6.QtCore import QTimer
-        self.music_check_timer = QTimer(self)
-        self.music_check_timer.timeout.connect(self.check_music_end)
-        self.music_check_timer.start(1000)  # Check every second
+        # pygame's mixer is opened when the first track plays (see mixer_music)
+        self.mixer = None
+        self.volume = 1.0
         
-        # Timer for updating song time display
-        self.time_update_timer = QTimer(self)
-        self.time_update_timer.timeout.connect(self.update_time_display)
-        self.time_update_timer.start(100)  # Update every 100ms
+        # Playback position and the end of each track come from the clock,
+        # which wakes only when the shown time changes or the track ends
+        self.playback_clock = PlaybackClock(self)
+        self.playback_clock.track_ended.connect(self.on_track_ended)
+        self.playback_clock.position_changed.connect(self.on_position_changed)
         self.current_time = 0.0
         self.total_time = 0.0
         
-        # Marquee effect for song name
+        # Marquee effect for song name (scrolls 1px per 50ms)
         self.marquee_offset = 0
-        self.marquee_timer = QTimer(self)
-        self.marquee_timer.timeout.connect(self.update_marquee)
-        self.marquee_timer.start(50)  # Update every 50ms for smooth scrolling
+        self.marquee_position = 0.0
         
         # Thumb dragging state
         self.is_dragging_thumb = False
@@ -161,197 +219,347 @@ class MusicPlayerWindow(QMainWindow):
         # Transition animation for game mode
         self.is_transitioning = False
         self.transition_progress = 0.0
-        self.transition_timer = QTimer(self)
-        self.transition_timer.timeout.connect(self.update_transition)
         
         # Reverse transition (game mode -> music mode)
         self.is_reverse_transitioning = False
         self.reverse_transition_progress = 0.0
-        self.reverse_transition_timer = QTimer(self)
-        self.reverse_transition_timer.timeout.connect(self.update_reverse_transition)
-        
-        # Game state
-        self.game_score = 0
-        self.game_over = False
-        self.is_stopping = False  # Flag for gradual deceleration
-        self.current_rotation_speed = 0.0  # Actual rotation speed (for deceleration)
-        self.game_time = 0  # Track total game time in seconds
-        self.last_speed_increase = 0  # Track when we last increased speed
-        self.base_game_speed = 3.0  # Starting speed
-        self.is_resting = False  # Flag for rest period
-        self.rest_time_remaining = 0  # Countdown for rest period
-        self.kunai_base_x = 250  # Center horizontally for base kunai
-        self.kunai_base_y = 620  # Bottom of screen for base kunai
-        # List to store active kunai: each item is {'x': x, 'y': y, 'velocity_y': vy}
-        self.active_kunai = []
-        # List to store kunai stuck to circle: each item is {'angle': angle_in_degrees}
-        self.stuck_kunai = []
-        
-        # Stars for game mode background
-        self.stars = []
+        
+        # Game state lives in the Qt-free game core; the window only renders it
+        self.game = GameCore()
+        self.in_game_mode = False  # The core drives the circle while True
+        # Runs the core in fixed steps from real elapsed time, whatever the frame rate
+        self.game_runner = FixedStepRunner(self.game)
+        self.game_alpha = 0.0  # Render position between the last two steps
+        # Replay playback: per-frame costs, and whether the scheduler drives it
+        self.replay_costs = None
+        self.replay_realtime = False
+        self.replay_close_when_done = False
+        
+        # Stars for game mode background (sprite sheet baked when the star image arrives)
         self.star_pixmap = None
-        self.load_star_image()
+        self.star_field = StarField(self.star_pixmap)
         self.initialize_stars()
         
-        # Load kunai image
+        # Kunai image (arrives with the other game-mode images)
         self.kunai_pixmap = None
-        self.load_kunai()
-        
-        # Game update timer
-        self.game_timer = QTimer(self)
-        self.game_timer.timeout.connect(self.update_game)
-        
-        # Star animation timer
-        self.star_timer = QTimer(self)
-        self.star_timer.timeout.connect(self.update_stars)
-        
-        # Settings file path for persistent storage
-        self.settings_file = Path("swish_kunai_settings.json")
-        
-        # Load saved settings (music folder)
+        self.kunai_atlas = None  # Pre-rotated sprites, built on first game
+        
+        # Worker thread for the game-mode images (started after the first frame)
+        self.asset_loader = AssetLoader(self)
+        self.asset_loader.game_images_loaded.connect(self.on_game_images_loaded, Qt.ConnectionType.QueuedConnection)
+        
+        # Persistent settings (written in the background, batched and atomic)
+        self.settings = SettingsStore(Path("swish_kunai_settings.json"))
+        self.resume_position = 0.0  # Where to continue the first track after startup
+        
+        # On-disk index of the music folder (durations and tags)
+        self.library = MusicLibrary(Path("swish_kunai_library.db"))
+        
+        # Worker pool for opening tracks and probing metadata off the GUI thread
+        self.track_loader = TrackLoader(self)
+        self.track_loader.track_loaded.connect(self.on_track_loaded, Qt.ConnectionType.QueuedConnection)
+        self.track_loader.track_failed.connect(self.on_track_failed, Qt.ConnectionType.QueuedConnection)
+        self.track_loader.metadata_probed.connect(self.on_metadata_probed, Qt.ConnectionType.QueuedConnection)
+        self.track_loader.folder_loaded.connect(self.on_folder_loaded, Qt.ConnectionType.QueuedConnection)
+        self.track_loader.folder_scanned.connect(self.on_folder_scanned, Qt.ConnectionType.QueuedConnection)
+        self.loading_folder = None  # Folder whose songs the worker is reading
+        self.autoplay = None  # (song index, position) to play once the folder's songs are listed
+        # Watch the music folder so new/removed files show up without a restart
+        self.folder_watcher = FolderWatcher(self)
+        self.folder_watcher.folder_changed.connect(self.on_folder_changed)
+        
+        self.pending_load_id = None  # Request id of the track currently being opened
+        self.current_stream = None  # In-memory file object pygame is playing from
+        self.current_data = None  # Raw bytes of the playing track
+        self.current_seek_table = None  # Mp3SeekTable for the playing track (MP3 only)
+        
+        # Gapless playback: the next track is read ahead and queued in the mixer
+        self.gapless_enabled = True
+        self.prefetch_load_id = None  # Request id of the track being read ahead
+        self.queued_song_name = None  # Track waiting in pygame's queue
+        self.queued_stream = None
+        self.queued_data = None
+        self.queued_seek_table = None
+        
+        # Slider seeks are coalesced to at most one per frame while dragging
+        self.pending_seek = None
+        self.seek_timer = MeasuredTimer("seek", self.apply_pending_seek, self)
+        self.seek_timer.setSingleShot(True)
+
+        # Timers outside the frame clock report their lateness to the HUD and trace too
+        for timer in (self.playback_clock.timer, self.search_build_timer, self.seek_timer,
+                      self.folder_watcher.settle_timer, self.folder_watcher.poll_timer):
+            timer.metrics = self.frame_metrics
+
+        # Optional waveform in the progress slider (toggle with W)
+        self.show_waveform = False
+        self.waveform_analyzer = None
+        if waveform_available():
+            self.waveform_analyzer = WaveformAnalyzer(Path("waveform_cache"), self)
+            self.waveform_analyzer.waveform_ready.connect(self.on_waveform_ready)
+        self.current_waveform_key = None
+        self.waveform_lines = None  # Pre-built peak lines for the current track
+        
+        # GUI-thread stall measurement (SWISH_KUNAI_STALL_METER=1)
+        self.stall_meter = StallMeter(self)
+        if stall_meter_enabled():
+            self.stall_meter.start()
+        
+        # Load saved settings; the saved music folder itself is read after the first frame
+        self.first_frame_shown = False
+        self.saved_song = None  # (last song index, position) to resume once the folder loads
         self.load_settings()
-        self.star_timer.start(50)  # Update stars every 50ms
         
-        # Create song list overlay (hidden initially)
-        self.create_song_list_overlay()
+        # Song list overlay is built the first time it opens (see show_song_list)
+        self.song_overlay = None
+        self.overlay_close_btn = None
         
         # Add + button for adding songs
         self.add_file_button()
     
-    def load_star_image(self):
-        """Load the star image for game mode background"""
-        star_path = Path("assets") / "star.png"
-        
-        if star_path.exists():
-            self.star_pixmap = QPixmap(str(star_path))
-        else:
-            print(f"Warning: Star image not found at {star_path}")
-            self.star_pixmap = None
-    
     def initialize_stars(self):
-        """Initialize stars for game mode background"""
-        import random
-        
-        # Create 30 stars in the top region of the screen
-        self.stars = []
-        for _ in range(30):
-            # Random size between 10-25 pixels
-            size = random.randint(10, 25)
-            
-            # Keep trying positions until we find one not overlapping the circle
-            # Circle is at (250, 220) with radius 120
-            attempts = 0
-            while attempts < 50:  # Limit attempts to avoid infinite loop
-                x = random.randint(20, 480)
-                y = random.randint(20, 350)
-                
-                # Check distance from circle center
-                dx = x - 250
-                dy = y - 220
-                distance = (dx**2 + dy**2) ** 0.5
-                
-                # If star is far enough from circle (radius 120 + buffer 40), use this position
-                if distance > 160:
-                    break
-                attempts += 1
-            
-            star = {
-                'x': x,
-                'y': y,
-                'size': size,  # Star size
-                'pixmap': None,  # Will store scaled pixmap
-                'opacity': random.uniform(0.3, 1.0),  # Starting opacity
-                'fade_speed': random.uniform(0.01, 0.03),  # How fast it fades
-                'fade_direction': random.choice([1, -1]),  # 1 = fade in, -1 = fade out
-                'min_opacity': random.uniform(0.2, 0.4),  # Minimum brightness
-                'max_opacity': random.uniform(0.7, 1.0)   # Maximum brightness
-            }
-            
-            # Create scaled pixmap for this star if base image exists
-            if self.star_pixmap:
-                star['pixmap'] = self.star_pixmap.scaled(size, size,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation)
-            
-            self.stars.append(star)
+        """Initialize stars for game mode background (layout comes from the game's seed)"""
+        self.star_field.populate(self.game.random)
     
-    def update_stars(self):
-        """Update star fade animations"""
-        for star in self.stars:
-            # Update opacity
-            star['opacity'] += star['fade_speed'] * star['fade_direction']
-            
-            # Reverse direction if hitting limits
-            if star['opacity'] >= star['max_opacity']:
-                star['opacity'] = star['max_opacity']
-                star['fade_direction'] = -1
-            elif star['opacity'] <= star['min_opacity']:
-                star['opacity'] = star['min_opacity']
-                star['fade_direction'] = 1
-        
-        # Trigger repaint if in game mode
-        if self.quit_btn.isVisible():
-            self.update()
+    def update_stars(self, dt):
+        """Update star fade animations (only ticked while game mode is on screen)"""
+        self.star_field.twinkle(dt)
+        return STAR_FIELD_RECT
+    
+    def mixer_music(self):
+        """pygame's music player, importing pygame and opening the audio device on first use"""
+        if self.mixer is None:
+            self.mixer = open_mixer().mixer
+            self.mixer.music.set_volume(self.volume)
+            self.playback_clock.attach_mixer()
+        return self.mixer.music
     
     def load_settings(self):
         """Load saved settings from JSON file"""
         try:
-            if self.settings_file.exists():
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                    saved_folder = settings.get('music_folder')
-                    
-                    if saved_folder and Path(saved_folder).exists():
-                        # Load the saved music folder
-                        self.music_folder = saved_folder
-                        self.load_songs_from_folder()
-                        print(f"Loaded saved music folder: {saved_folder}")
-                        print(f"Found {len(self.song_list)} songs")
-                        
-                        # Load last song index
-                        last_index = settings.get('last_song_index', 0)
-                        if 0 <= last_index < len(self.song_list):
-                            self.current_song_index = last_index
-                            # Auto-play the last song
-                            self.play_current_song()
-                        else:
-                            self.current_song_index = 0
-                    else:
-                        print("Saved folder no longer exists")
+            if self.settings.path.exists():
+                settings = self.settings.load()
+                
+                # Playback preferences
+                self.volume = settings.get('volume', 1.0)  # Applied when the mixer opens
+                if settings.get('repeat', False) != self.is_repeat_on:
+                    self.toggle_repeat()
+                self.show_waveform = settings.get('show_waveform', False) and self.waveform_analyzer is not None
+                
+                saved_folder = settings.get('music_folder')
+                
+                if saved_folder and Path(saved_folder).exists():
+                    # Loaded (and the last song resumed) once the window is on screen
+                    self.music_folder = saved_folder
+                    self.saved_song = (settings.get('last_song_index', 0), settings.get('last_position', 0.0))
+                else:
+                    event_log.warning("settings", "Saved folder no longer exists")
             else:
-                print("No saved settings found - please select a music folder")
+                event_log.info("settings", "No saved settings found - please select a music folder")
         except Exception as e:
-            print(f"Error loading settings: {e}")
+            event_log.error("settings", "Error loading settings: %s", e)
+    
+    def finish_startup(self):
+        """Work kept off the first frame: game images, then the saved music folder"""
+        self.asset_loader.load_game_images()
+        if self.saved_song is None:
+            return
+        # Auto-play the last song where we left off, once the folder's songs are listed
+        self.autoplay = self.saved_song
+        self.saved_song = None
+        self.load_songs_from_folder()
+        event_log.info("library", "Loading saved music folder: %s", self.music_folder)
     
     def save_settings(self):
-        """Save settings to JSON file"""
-        try:
-            settings = {
-                'music_folder': self.music_folder,
-                'last_song_index': self.current_song_index
-            }
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=2)
-            print(f"Settings saved: {self.music_folder}, song index: {self.current_song_index}")
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        """Queue the current song for saving (written in the background)"""
+        self.settings.update(
+            music_folder=self.music_folder,
+            last_song_index=self.current_song_index,
+            last_position=0.0
+        )
     
     def load_songs_from_folder(self):
-        """Load all audio files from the current music folder"""
+        """Read the current music folder's indexed songs, then check the folder itself
+
+        Both happen on the worker pool: the index's rows arrive in
+        on_folder_loaded and the differences found on disk in on_folder_scanned.
+        """
         if not self.music_folder:
             return
+        self.folder_watcher.stop()  # Restarted once the scan has caught up
+        self.loading_folder = str(Path(self.music_folder))
+        self.track_loader.load_folder(self.library.db_path, self.loading_folder)
+    
+    def on_folder_loaded(self, folder, tracks, names):
+        """Show a folder's indexed songs as soon as the worker has read them"""
+        if folder != self.loading_folder:
+            return  # Another folder was chosen meanwhile
+        with self.stall_meter.measure("on_folder_loaded"):
+            self.library.set_folder(folder, tracks)
+            self.song_list = names
+            self.current_song_index = 0
+            self.song_model.set_songs(self.song_list)
+        event_log.info("library", "Found %d indexed songs in %s", len(self.song_list), folder)
+        
+        # (Re)build the search index without blocking the event loop
+        self.search_index = TrigramIndex()
+        self.search_pending = list(self.song_list)
+        self.search_build_timer.start(0)
+        self.start_autoplay()
+    
+    def on_folder_scanned(self, folder, tracks, diff):
+        """Take over what a background scan or check found and wrote, then probe (and watch) the folder"""
+        if folder != self.library.folder or folder != self.loading_folder:
+            return  # Another folder was chosen meanwhile
+        added, changed, removed = diff
+        with self.stall_meter.measure("on_folder_scanned"):
+            playing = self.playing_song_identity()
+            self.library.apply_scanned(tracks, removed)
+            self.apply_song_changes(added, removed, playing)
+        event_log.info("library", "Scanned %s: %d songs (%d new, %d changed, %d removed)",
+                       folder, len(self.song_list), len(added), len(changed), len(removed))
+        
+        if self.folder_watcher.folder != folder:
+            # First scan: new and modified files (and any left unprobed last
+            # time) are probed in the background
+            self.track_loader.probe_folder(folder, self.library.unprobed())
+            self.folder_watcher.watch(folder)
+        else:
+            self.track_loader.probe_folder(folder, itertools.chain(added, changed))
         
-        folder_path = Path(self.music_folder)
-        audio_extensions = ('.mp3', '.wav', '.flac', '.m4a', '.ogg')
+        # Not indexed before - the scan has listed the songs now (if there are any)
+        self.start_autoplay()
+        self.autoplay = None
+    
+    def start_autoplay(self):
+        """Play the song startup or a newly picked folder asked for, once the list has songs"""
+        if self.autoplay is None or not self.song_list:
+            return
+        index, position = self.autoplay
+        self.autoplay = None
+        if 0 <= index < len(self.song_list):
+            self.current_song_index = index
+            self.resume_position = position
+            self.play_current_song()
+    
+    def on_folder_changed(self, folder):
+        """Files came or went: have the worker check the folder against the index"""
+        if folder == self.library.folder:
+            self.track_loader.check_folder(self.library.db_path, folder)
+    
+    def playing_song_identity(self):
+        """(name, size, mtime_ns) of the current song, to recognize it after a rename"""
+        if not self.song_list:
+            return None
+        name = self.song_list[self.current_song_index]
+        track = self.library.get_track(name)
+        if track is None:
+            return None
+        return name, track['size'], track['mtime_ns']
+    
+    def apply_song_changes(self, added, removed, playing=None):
+        """Update the song list for files added to and removed from the index in one batch
+
+        `playing` is playing_song_identity() from before the index changed.
+        """
+        import os
+        self.remove_songs(removed)
+        self.insert_songs(added)
+        
+        # A rename arrives as a removal plus an addition. Renaming keeps size and
+        # mtime, so an added file matching the removed current song is that song
+        if playing is not None and playing[0] in removed:
+            for name in added:
+                track = self.library.get_track(name)
+                if (track['size'], track['mtime_ns']) == playing[1:]:
+                    self.current_song_index = self.song_model.song_index(name)
+                    if self.current_data is not None:
+                        self.current_song_name = os.path.splitext(name)[0]
+                        self.update_marquee_state()
+                        self.update(MARQUEE_RECT)
+                    break
         
-        # Find all audio files
-        self.song_list = []
-        for file in folder_path.iterdir():
-            if file.suffix.lower() in audio_extensions:
-                self.song_list.append(file.name)
+        # The queued track is gone: queue whatever follows the current song now
+        if self.queued_song_name is not None and self.queued_song_name in removed:
+            self.stage_next_song()
         
-        # Sort alphabetically
-        self.song_list.sort(key=lambda x: x.lower())
+        if removed or added:
+            self.settings.update(last_song_index=self.current_song_index)
+    
+    def insert_songs(self, names):
+        """Insert newly indexed files into the sorted song list"""
+        import bisect
+        if not names:
+            return
+        if not self.song_list or len(names) > BULK_INSERT_THRESHOLD:
+            self.merge_songs(names)
+            return
+        for name in names:
+            index = bisect.bisect_left(self.song_list, name.lower(), key=str.lower)
+            self.song_model.insert_song(index, name)
+            # Keep pointing at the playing track
+            if len(self.song_list) > 1 and index <= self.current_song_index:
+                self.current_song_index += 1
+            self.index_song(name)
+        self.refresh_search()
+    
+    def merge_songs(self, names):
+        """Add many files with one sort and one model update (a first scan or a
+        newly picked folder); they join the search index in slices"""
+        current = self.song_list[self.current_song_index] if self.song_list else None
+        searching = self.song_model.matches is not None
+        self.song_list = sorted(itertools.chain(self.song_list, names), key=str.lower)
+        self.song_model.set_songs(self.song_list)
+        if current is not None:
+            # Keep pointing at the playing track
+            self.current_song_index = self.song_model.song_index(current)
+        if searching:
+            self.song_model.set_matches(self.search_index.search(self.search_box.text()))
+        self.search_pending.extend(names)
+        self.search_build_timer.start(0)
+    
+    def remove_songs(self, names):
+        """Delete files dropped from the index from the sorted song list"""
+        if not names:
+            return
+        for name in names:
+            self.search_index.remove(name)
+            index = self.song_model.song_index(name)
+            if index < 0:
+                continue
+            self.song_model.remove_song(index)
+            # Keep pointing at the playing track (or the one after a removed current track)
+            if index < self.current_song_index:
+                self.current_song_index -= 1
+        self.current_song_index = max(0, min(self.current_song_index, len(self.song_list) - 1))
+        self.refresh_search()
+    
+    def index_song(self, name):
+        """Add a song's title, artist and file name to the search index"""
+        track = self.library.get_track(name)
+        if track is None:
+            return  # Removed before it was indexed
+        self.search_index.add(name, track['title'], track['artist'])
+    
+    def build_search_index_step(self):
+        """Index the next slice of songs (keeps each event-loop turn short)"""
+        batch = self.search_pending[-500:]
+        del self.search_pending[-500:]
+        for name in batch:
+            self.index_song(name)
+        if not self.search_pending:
+            self.search_build_timer.stop()
+            self.refresh_search()
+    
+    def search_songs(self, text):
+        """Filter the song overlay to ranked matches for the search box text"""
+        self.song_model.set_matches(self.search_index.search(text))
+        self.song_list_widget.scrollToTop()  # Best match first
+    
+    def refresh_search(self):
+        """Re-run the current search after the library changed"""
+        if self.song_model.matches is not None:
+            self.song_model.set_matches(self.search_index.search(self.search_box.text()))
     
     def create_buttons(self):
         """Create clickable UI buttons using asset images"""
@@ -403,15 +611,20 @@ class MusicPlayerWindow(QMainWindow):
         if self.is_playing:
             # Switch to pause icon and start rotation
             self.play_btn.setIcon(self.pause_icon)
-            self.rotation_timer.start(50)
-            pygame.mixer.music.unpause()
-            print("Playing...")
+            self.frame_scheduler.set_active("rotation", True)
+            self.update_marquee_state()
+            self.mixer_music().unpause()
+            self.playback_clock.resume()
+            event_log.info("playback", "Playing...")
         else:
             # Switch to play icon and stop rotation
             self.play_btn.setIcon(self.play_icon)
-            self.rotation_timer.stop()
-            pygame.mixer.music.pause()
-            print("Paused")
+            self.frame_scheduler.set_active("rotation", False)
+            self.update_marquee_state()
+            self.mixer_music().pause()
+            self.playback_clock.pause()
+            self.settings.update(last_position=round(self.playback_clock.position(), 2))
+            event_log.info("playback", "Paused")
         
         return True
     
@@ -428,7 +641,7 @@ class MusicPlayerWindow(QMainWindow):
                     border: none;
                 }
             """)
-            print("Repeat ON")
+            event_log.info("playback", "Repeat ON")
         else:
             # Remove highlight
             self.repeat_btn.setStyleSheet("""
@@ -441,7 +654,13 @@ class MusicPlayerWindow(QMainWindow):
                     border-radius: 10px;
                 }
             """)
-            print("Repeat OFF")
+            event_log.info("playback", "Repeat OFF")
+        
+        self.settings.update(repeat=self.is_repeat_on)
+        
+        # The queued track depends on the repeat mode
+        if self.current_data is not None:
+            self.stage_next_song()
         
         return True
     
@@ -450,27 +669,13 @@ class MusicPlayerWindow(QMainWindow):
         bg_path = Path("assets") / "border background.png"
         
         if bg_path.exists():
+            # Kept unscaled - the layer cache scales it for the window size and DPR
             self.background_pixmap = QPixmap(str(bg_path))
-            self.background_pixmap = self.background_pixmap.scaled(500, 700, 
-                Qt.AspectRatioMode.IgnoreAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation)
+            self.layer_cache.set_background_source("music", self.background_pixmap)
         else:
-            print(f"Warning: Background image not found at {bg_path}")
+            event_log.warning("assets", "Background image not found at %s", bg_path)
             self.background_pixmap = None
     
-    def load_blue_background(self):
-        """Load the blue background for game mode"""
-        blue_bg_path = Path("assets") / "blue background.png"
-        
-        if blue_bg_path.exists():
-            self.blue_background_pixmap = QPixmap(str(blue_bg_path))
-            self.blue_background_pixmap = self.blue_background_pixmap.scaled(500, 700,
-                Qt.AspectRatioMode.IgnoreAspectRatio,
-                Qt.TransformationMode.SmoothTransformation)
-        else:
-            print(f"Warning: Blue background image not found at {blue_bg_path}")
-            self.blue_background_pixmap = None
-    
     def load_thumb(self):
         """Load the thumb pixmap"""
         thumb_path = Path("assets") / "thumb.png"
@@ -482,28 +687,37 @@ class MusicPlayerWindow(QMainWindow):
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation)
         else:
-            print(f"Warning: Thumb image not found at {thumb_path}")
+            event_log.warning("assets", "Thumb image not found at %s", thumb_path)
             self.thumb_pixmap = None
     
-    def load_kunai(self):
-        """Load the kunai pixmap for game mode"""
-        kunai_path = Path("assets") / "kunai_knife.png"
-        
-        if kunai_path.exists():
-            self.kunai_pixmap = QPixmap(str(kunai_path))
-            # Scale to double size (120 pixels tall)
-            self.kunai_pixmap = self.kunai_pixmap.scaled(60, 120,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation)
-            
-            # Rotate 1 degree to the right to fix bent appearance
-            from PyQt6.QtGui import QTransform
-            transform = QTransform().rotate(1)
-            self.kunai_pixmap = self.kunai_pixmap.transformed(transform,
-                Qt.TransformationMode.SmoothTransformation)
-        else:
-            print(f"Warning: Kunai image not found at {kunai_path}")
-            self.kunai_pixmap = None
+    def on_game_images_loaded(self, images):
+        """Game-mode images decoded in the background"""
+        if self.game_assets_ready:
+            return  # Game mode was entered first and loaded them itself
+        self.apply_game_images(images)
+        # Scale the game background now rather than on the first transition frame
+        self.layer_cache.background("game", self.size(), self.devicePixelRatioF())
+    
+    def ensure_game_assets(self):
+        """Load the game-mode images now if the background load hasn't finished"""
+        if not self.game_assets_ready:
+            self.apply_game_images(load_game_images())
+    
+    def apply_game_images(self, images):
+        """Turn decoded game-mode images into pixmaps (GUI thread only)"""
+        self.game_assets_ready = True
+        for name, file_name in GAME_ASSETS.items():
+            if images[name] is None:
+                event_log.warning("assets", "Image not found at %s", Path("assets") / file_name)
+        
+        if images['game_background'] is not None:
+            self.blue_background_pixmap = QPixmap.fromImage(images['game_background'])
+            self.layer_cache.set_background_source("game", self.blue_background_pixmap)
+        if images['star'] is not None:
+            self.star_pixmap = QPixmap.fromImage(images['star'])
+            self.star_field.set_sprite(self.star_pixmap)
+        if images['kunai'] is not None:
+            self.kunai_pixmap = QPixmap.fromImage(images['kunai'])
     
     def add_file_button(self):
         """Add + button to open file dialog for selecting music"""
@@ -531,7 +745,7 @@ class MusicPlayerWindow(QMainWindow):
     
     def create_song_list_overlay(self):
         """Create the song list overlay window"""
-        from PyQt6.QtWidgets import QListWidget
+        from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
         
         self.song_overlay = QLabel(self)
         self.song_overlay.setGeometry(0, 0, 500, 700)
@@ -542,30 +756,63 @@ class MusicPlayerWindow(QMainWindow):
         """)
         self.song_overlay.hide()
         
-        # Create list widget for songs
-        self.song_list_widget = QListWidget(self)
+        # Create list view for songs (rows are only built for what's on screen).
+        # A one-column table with fixed row heights: QListView lays out every
+        # row whenever the row count changes, a fixed-size header doesn't
+        self.song_list_widget = QTableView(self)
+        self.song_list_widget.horizontalHeader().hide()
+        self.song_list_widget.horizontalHeader().setStretchLastSection(True)
+        self.song_list_widget.verticalHeader().hide()
+        self.song_list_widget.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.song_list_widget.verticalHeader().setDefaultSectionSize(46)
+        self.song_list_widget.setShowGrid(False)
+        self.song_list_widget.setWordWrap(False)
+        self.song_list_widget.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.song_list_widget.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.song_list_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.song_list_widget.setModel(self.song_model)
         self.song_list_widget.setGeometry(50, 100, 400, 500)
         self.song_list_widget.setStyleSheet("""
-            QListWidget {
+            QTableView {
                 background-color: transparent;
                 color: white;
                 font-family: 'Ink Free';
                 font-size: 20px;
                 border: none;
             }
-            QListWidget::item {
-                padding: 10px;
+            QTableView::item {
+                padding: 0px 10px;
                 border-bottom: 1px solid rgba(255, 255, 255, 30);
             }
-            QListWidget::item:hover {
+            QTableView::item:hover {
                 background-color: rgba(255, 255, 255, 20);
             }
-            QListWidget::item:selected {
+            QTableView::item:selected {
                 background-color: rgba(255, 255, 255, 40);
             }
         """)
         self.song_list_widget.hide()
-        self.song_list_widget.itemClicked.connect(self.select_song)
+        self.song_list_widget.clicked.connect(self.select_song)
+        
+        # Type-ahead search box above the list
+        from PyQt6.QtWidgets import QLineEdit
+        self.search_box = QLineEdit(self)
+        self.search_box.setGeometry(50, 40, 360, 40)
+        self.search_box.setPlaceholderText("Search songs...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setStyleSheet("""
+            QLineEdit {
+                background-color: rgba(255, 255, 255, 20);
+                color: white;
+                font-family: 'Ink Free';
+                font-size: 20px;
+                border-radius: 20px;
+                border: 2px solid rgba(255, 255, 255, 40);
+                padding: 0px 12px;
+            }
+        """)
+        self.search_box.textChanged.connect(self.search_songs)
+        self.search_box.hide()
         
         # Add X button to close overlay
         close_btn = QPushButton("✕", self)
@@ -597,57 +844,62 @@ class MusicPlayerWindow(QMainWindow):
             
             if folder:
                 self.music_folder = folder
-                print(f"Music folder selected: {folder}")
+                event_log.info("library", "Music folder selected: %s", folder)
                 
-                # Load songs from folder
+                # Load songs from folder and auto-play the first one once they're listed
+                self.autoplay = (0, 0.0)
                 self.load_songs_from_folder()
                 
                 # Save settings for next time
                 self.save_settings()
                 
-                print(f"Found {len(self.song_list)} songs")
-                
-                # Auto-play first song if songs were found
-                if self.song_list:
-                    self.current_song_index = 0
-                    self.play_current_song()
-                
                 return True
         else:
             # Subsequent times: show song list overlay
             if self.song_list:
                 self.show_song_list()
             else:
-                print("No songs found in folder")
+                event_log.warning("library", "No songs found in folder")
         
         return False
     
     def show_song_list(self):
         """Display the song list overlay"""
-        self.song_list_widget.clear()
-        for song in self.song_list:
-            self.song_list_widget.addItem(song)
+        if self.song_overlay is None:
+            self.create_song_list_overlay()
+        
+        # The model already mirrors song_list - just jump to the playing track
+        if self.song_list and self.song_model.matches is None:
+            current = self.song_model.index(self.current_song_index)
+            self.song_list_widget.setCurrentIndex(current)
+            self.song_list_widget.scrollTo(current)
         
         self.song_overlay.show()
         self.song_list_widget.show()
+        self.search_box.show()
         self.overlay_close_btn.show()
         self.song_overlay.raise_()
         self.song_list_widget.raise_()
+        self.search_box.raise_()
         self.overlay_close_btn.raise_()
+        self.search_box.setFocus()
     
     def close_song_overlay(self):
         """Close the song list overlay"""
         self.song_overlay.hide()
         self.song_list_widget.hide()
+        self.search_box.hide()
         self.overlay_close_btn.hide()
     
-    def select_song(self, item):
+    def select_song(self, index):
         """Handle song selection from list"""
-        selected_song = item.text()
-        print(f"Selected song: {selected_song}")
+        event_log.info("playback", "Selected song: %s", index.data())
         
-        # Find the index of the selected song
-        self.current_song_index = self.song_list.index(selected_song)
+        # Rows map straight to song_list indices
+        song_index = index.data(TRACK_INDEX_ROLE)
+        if song_index < 0:
+            return  # Song was removed from the folder
+        self.current_song_index = song_index
         
         # Close the overlay
         self.close_song_overlay()
@@ -656,61 +908,321 @@ class MusicPlayerWindow(QMainWindow):
         self.play_current_song()
     
     def play_current_song(self):
-        """Load and play the current song"""
+        """Start loading the current song; playback begins in on_track_loaded"""
         if not self.song_list or self.current_song_index >= len(self.song_list):
             return
         
         import os
-        song_path = os.path.join(self.music_folder, self.song_list[self.current_song_index])
-        
-        try:
-            pygame.mixer.music.load(song_path)
-            pygame.mixer.music.play()
+        with self.stall_meter.measure("play_current_song"):
+            song_name = self.song_list[self.current_song_index]
+            song_path = os.path.join(self.music_folder, song_name)
+            
+            # Loading a new track drops whatever was queued behind the old one
+            self.prefetch_load_id = None
+            if song_name == self.queued_song_name:
+                # Already read ahead - start immediately
+                self.pending_load_id = None
+                data = self.queued_data
+                seek_table = self.queued_seek_table
+            else:
+                # Open (and probe if the library has no duration yet) on the worker pool
+                track = self.library.get_track(song_name)
+                needs_probe = track is None or track['duration'] is None
+                self.pending_load_id = self.track_loader.load_track(song_path, song_name, needs_probe)
+                data = None
+                seek_table = None
+            self.clear_queued_song()
             
             # Update current song name (remove file extension)
-            self.current_song_name = os.path.splitext(self.song_list[self.current_song_index])[0]
+            self.current_song_name = os.path.splitext(song_name)[0]
             
             # Reset slider thumb to start
             self.thumb_progress = 0.0
             
-            # Try to estimate song length
-            try:
-                from mutagen import File
-                audio = File(song_path)
-                if audio and audio.info:
-                    self.song_length = audio.info.length
-                else:
-                    self.song_length = 180  # Default 3 minutes
-            except:
-                self.song_length = 180  # Default 3 minutes if mutagen not available
+            # Song length comes from the library index (no probing on track change)
+            self.song_length = self.library.get_duration(song_name)
             
             # Update UI to playing state
             self.is_music_playing = True
             self.is_playing = True
             self.play_btn.setIcon(self.pause_icon)
-            self.rotation_timer.start(50)
+            self.frame_scheduler.set_active("rotation", True)
+            self.update_marquee_state()
             
-            # Trigger repaint to update song name
-            self.update()
+            # Trigger repaint to update song name and slider
+            self.update(MARQUEE_RECT)
+            self.update(SLIDER_AREA_RECT)
             
             # Save settings with current song index
             self.save_settings()
             
-            print(f"Now playing: {self.song_list[self.current_song_index]}")
+            if data is not None:
+                self.start_playback(song_name, data, seek_table)
+    
+    def on_track_loaded(self, request_id, song_name, data, info, seek_table):
+        """Start playback (or queue the next track) once the worker pool has read the file"""
+        if info is not None:
+            self.library.update_info([(song_name, info)])
+        
+        if request_id == self.prefetch_load_id:
+            self.prefetch_load_id = None
+            self.queue_next_song(song_name, data, seek_table)
+            return
+        if request_id != self.pending_load_id:
+            return  # User already skipped to another track
+        self.pending_load_id = None
+        
+        with self.stall_meter.measure("on_track_loaded"):
+            if info is not None:
+                self.song_length = self.library.get_duration(song_name)
+                self.playback_clock.set_duration(self.song_length)
+            self.start_playback(song_name, data, seek_table)
+    
+    def start_playback(self, song_name, data, seek_table=None):
+        """Play a track from its in-memory bytes and stage the one after it"""
+        import io
+        try:
+            # Keep a reference - pygame streams from this object while playing
+            self.current_data = data
+            self.current_seek_table = seek_table
+            self.current_stream = io.BytesIO(data)
+            self.mixer_music().load(self.current_stream, Path(song_name).suffix.lstrip('.'))
+            self.mixer_music().play()
+            self.playback_clock.start(self.song_length)
+            if not self.is_music_playing:
+                self.mixer_music().pause()  # Paused while the file was loading
+                self.playback_clock.pause()
+            event_log.info("playback", "Now playing: %s", song_name)
+        except Exception as e:
+            event_log.error("playback", "Error playing song: %s", e)
+            return
+        if self.resume_position:
+            # First track after startup continues where the last session stopped
+            position = self.resume_position
+            self.resume_position = 0.0
+            self.seek_to(position)
+        self.load_waveform(song_name)
+        self.stage_next_song()
+    
+    def next_song_index(self):
+        """Index of the track that follows the current one"""
+        if self.is_repeat_on:
+            return self.current_song_index
+        return (self.current_song_index + 1) % len(self.song_list)
+    
+    def stage_next_song(self):
+        """Read ahead the next track so it can be queued before the current one ends"""
+        import os
+        self.prefetch_load_id = None
+        self.clear_queued_song()
+        if not self.gapless_enabled or not self.song_list or self.current_data is None:
+            return
+        
+        index = self.next_song_index()
+        song_name = self.song_list[index]
+        if index == self.current_song_index:
+            # Repeat: the bytes are already in memory
+            self.queue_next_song(song_name, self.current_data, self.current_seek_table)
+            return
+        
+        track = self.library.get_track(song_name)
+        needs_probe = track is None or track['duration'] is None
+        self.prefetch_load_id = self.track_loader.load_track(
+            os.path.join(self.music_folder, song_name), song_name, needs_probe)
+    
+    def queue_next_song(self, song_name, data, seek_table=None):
+        """Hand a read-ahead track to pygame's queue"""
+        import io
+        try:
+            # Separate stream object - the current track may be reading from the same bytes
+            stream = io.BytesIO(data)
+            self.mixer_music().queue(stream, Path(song_name).suffix.lstrip('.'))
         except Exception as e:
-            print(f"Error playing song: {e}")
-    
-    def check_music_end(self):
-        """Check if current song has ended and advance to next"""
-        if not pygame.mixer.music.get_busy() and self.is_music_playing:
-            # Song has ended
-            if self.is_repeat_on:
-                # Repeat current song
-                pygame.mixer.music.play()
-                print(f"Repeating: {self.song_list[self.current_song_index]}")
+            event_log.warning("playback", "Couldn't queue next song: %s", e)
+            return
+        self.queued_song_name = song_name
+        self.queued_stream = stream
+        self.queued_data = data
+        self.queued_seek_table = seek_table
+    
+    def clear_queued_song(self):
+        """Forget the queued track (pygame drops its queue when the music changes)"""
+        self.queued_song_name = None
+        self.queued_stream = None
+        self.queued_data = None
+        self.queued_seek_table = None
+    
+    def advance_to_queued_song(self):
+        """The mixer moved on to the queued track - update the UI to match"""
+        import bisect
+        import os
+        song_name = self.queued_song_name
+        index = self.song_model.song_index(song_name)
+        if index < 0 and self.song_list:
+            # Removed from the folder since it was queued; point at the song before
+            # where it was so the next track is the one that followed it
+            index = bisect.bisect_left(self.song_list, song_name.lower(), key=str.lower) - 1
+            index %= len(self.song_list)
+        if index >= 0:
+            self.current_song_index = index
+        self.current_data = self.queued_data
+        self.current_seek_table = self.queued_seek_table
+        self.current_stream = self.queued_stream
+        self.clear_queued_song()
+        
+        self.current_song_name = os.path.splitext(song_name)[0]
+        self.update_marquee_state()
+        self.thumb_progress = 0.0
+        self.song_length = self.library.get_duration(song_name)
+        # The new track has already been playing since the mixer switched over
+        self.playback_clock.start(self.song_length, max(0, self.mixer_music().get_pos()) / 1000.0)
+        self.update(MARQUEE_RECT)
+        self.update(SLIDER_AREA_RECT)
+        self.save_settings()
+        event_log.info("playback", "Now playing: %s", song_name)
+        
+        self.load_waveform(song_name)
+        self.stage_next_song()
+    
+    def load_waveform(self, song_name):
+        """Show the cached waveform for a track, analyzing it in the background if needed"""
+        import os
+        self.waveform_lines = None
+        self.current_waveform_key = None
+        if not self.show_waveform or self.waveform_analyzer is None:
+            return
+        track = self.library.get_track(song_name)
+        if track is None:
+            return
+        song_path = os.path.join(self.music_folder, song_name)
+        self.current_waveform_key = waveform_key(song_path, track['size'], track['mtime_ns'])
+        peaks = self.waveform_analyzer.request(self.current_waveform_key, song_path)
+        if peaks is not None:
+            self.set_waveform(peaks)
+    
+    def on_waveform_ready(self, key):
+        """Background analysis finished - show it if it's still the current track"""
+        peaks = self.waveform_analyzer.finished(key)
+        if key == self.current_waveform_key and peaks is not None:
+            self.set_waveform(peaks)
+    
+    def set_waveform(self, peaks):
+        """Turn memory-mapped min/max peaks into slider lines (one per pixel)"""
+        from PyQt6.QtCore import QLineF
+        scale = 12 / 127  # Peaks reach 12px above and below the slider line
+        self.waveform_lines = [
+            QLineF(self.slider_start_x + x, self.slider_y - int(high) * scale,
+                   self.slider_start_x + x, self.slider_y - int(low) * scale)
+            for x, (low, high) in enumerate(peaks)
+        ]
+        self.update(SLIDER_AREA_RECT)
+    
+    def keyPressEvent(self, event):
+        """Keyboard shortcuts: W toggles the waveform slider, Up/Down change volume,
+        F3 toggles the frame timing HUD and F4 exports a frame trace"""
+        if event.key() == Qt.Key.Key_F3:
+            self.show_frame_hud = not self.show_frame_hud
+            # Keep the clock ticking while the HUD is up so frames are measured
+            self.frame_scheduler.set_active("hud", self.show_frame_hud)
+            self.update(HUD_RECT)
+            return
+        if event.key() == Qt.Key.Key_F4:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            for suffix in (".csv", ".json"):
+                path = Path("traces") / f"frame_trace_{stamp}{suffix}"
+                try:
+                    self.frame_metrics.export(path)
+                    event_log.info("metrics", "Frame trace written to %s", path)
+                except OSError as e:
+                    event_log.error("metrics", "Error writing frame trace: %s", e)
+            return
+        if event.key() == Qt.Key.Key_W and self.waveform_analyzer is not None:
+            self.show_waveform = not self.show_waveform
+            self.settings.update(show_waveform=self.show_waveform)
+            if self.song_list and self.current_data is not None:
+                self.load_waveform(self.song_list[self.current_song_index])
             else:
-                # Advance to next song
-                self.play_next_song()
+                self.waveform_lines = None
+            self.update(SLIDER_AREA_RECT)
+            return
+        if event.key() in (Qt.Key.Key_Up, Qt.Key.Key_Down):
+            # Volume in 10% steps
+            step = 0.1 if event.key() == Qt.Key.Key_Up else -0.1
+            self.volume = round(max(0.0, min(1.0, self.volume + step)), 2)
+            if self.mixer is not None:
+                self.mixer.music.set_volume(self.volume)
+            self.settings.update(volume=self.volume)
+            return
+        super().keyPressEvent(event)
+    
+    def seek_to(self, seconds):
+        """Jump to a position in the current track"""
+        import io
+        if self.current_data is None:
+            return
+        seconds = max(0.0, min(seconds, self.song_length))
+        
+        try:
+            if self.current_seek_table:
+                # MP3: restart the stream at the right frame (exact even for VBR)
+                offset, seconds = self.current_seek_table.lookup(seconds)
+                self.current_stream = io.BytesIO(self.current_data[offset:])
+                self.mixer_music().load(self.current_stream, "mp3")
+                self.mixer_music().play()
+                # Loading dropped the queue - put the next track back
+                if self.queued_song_name is not None:
+                    self.queue_next_song(self.queued_song_name, self.queued_data, self.queued_seek_table)
+            else:
+                self.mixer_music().set_pos(seconds)
+        except Exception as e:
+            event_log.warning("playback", "Seeking failed: %s", e)  # Some formats (e.g. WAV) can't seek
+            return
+        
+        self.playback_clock.start(self.song_length, seconds)
+        if not self.is_music_playing:
+            self.mixer_music().pause()
+            self.playback_clock.pause()
+    
+    def apply_pending_seek(self):
+        """Perform the latest seek requested while dragging the thumb"""
+        if self.pending_seek is not None:
+            seconds = self.pending_seek
+            self.pending_seek = None
+            self.seek_to(seconds)
+    
+    def on_track_failed(self, request_id, song_name, error):
+        """Report a track that couldn't be opened"""
+        if request_id == self.pending_load_id:
+            self.pending_load_id = None
+            event_log.error("playback", "Error playing song: %s", error)
+    
+    def on_metadata_probed(self, folder, results):
+        """Store a batch of background probe results in the library"""
+        if folder == self.library.folder:
+            self.library.update_info(results)
+            # Pick up new titles/artists for songs that are already searchable
+            for name, info in results:
+                if name in self.search_index.texts:
+                    self.index_song(name)
+    
+    def on_track_ended(self):
+        """The mixer finished a track - follow the queue or advance to the next song"""
+        if self.pending_load_id is not None:
+            return  # Next song is still being opened
+        if self.queued_song_name is not None:
+            # Gapless: the queued track is already playing
+            self.advance_to_queued_song()
+            return
+        if not self.is_music_playing:
+            return
+        if self.is_repeat_on:
+            # Repeat current song
+            self.mixer_music().play()
+            self.playback_clock.start(self.song_length)
+            event_log.info("playback", "Repeating: %s", self.song_list[self.current_song_index])
+        else:
+            # Advance to next song
+            self.play_next_song()
     
     def play_next_song(self):
         """Play the next song in the playlist"""
@@ -728,28 +1240,36 @@ class MusicPlayerWindow(QMainWindow):
         self.current_song_index = (self.current_song_index - 1) % len(self.song_list)
         self.play_current_song()
     
-    def update_time_display(self):
-        """Update the current playback time and slider position"""
-        if pygame.mixer.music.get_busy():
-            # Get position in seconds
-            self.current_time = pygame.mixer.music.get_pos() / 1000.0
-            
-            # Update slider thumb position based on song progress
-            # BUT only if user is not currently dragging the thumb
-            if not self.is_dragging_thumb and hasattr(self, 'song_length') and self.song_length > 0:
-                self.thumb_progress = min(self.current_time / self.song_length, 1.0)
-            
-            self.update()  # Trigger repaint to update time display
+    def on_position_changed(self, seconds):
+        """Update the time display and slider once per displayed second"""
+        self.current_time = float(seconds)
+        
+        # Update slider thumb position based on song progress
+        # BUT only if user is not currently dragging the thumb
+        if not self.is_dragging_thumb and hasattr(self, 'song_length') and self.song_length > 0:
+            self.thumb_progress = min(self.current_time / self.song_length, 1.0)
+        
+        # Only the slider strip and time label changed
+        self.update(SLIDER_AREA_RECT)
+    
+    def update_marquee_state(self):
+        """Tick the marquee only while playing a name too long to show centered"""
+        self.frame_scheduler.set_active("marquee", self.is_music_playing and len(self.current_song_name) > 15)
     
-    def update_marquee(self):
+    def update_marquee(self, dt):
         """Update marquee scrolling offset"""
         # Only scroll if music is playing
         if len(self.current_song_name) > 15 and self.is_music_playing:
-            self.marquee_offset += 1
+            self.marquee_position += max(1, round(dt / 0.05))  # 1px per 50ms tick
             # Reset when scrolled past the text
-            if self.marquee_offset > len(self.current_song_name) * 20:  # Approximate pixel width
-                self.marquee_offset = -200  # Start from right
-            self.update()  # Trigger repaint
+            if self.marquee_position > len(self.current_song_name) * 20:  # Approximate pixel width
+                self.marquee_position = -200  # Start from right
+            # Repaint only when the text actually moved a pixel
+            offset = int(self.marquee_position)
+            if offset != self.marquee_offset:
+                self.marquee_offset = offset
+                return MARQUEE_RECT
+        return False
     
     def mousePressEvent(self, event: QMouseEvent):
         """Detect single and double clicks on the album art circle, and thumb dragging"""
@@ -759,19 +1279,12 @@ class MusicPlayerWindow(QMainWindow):
             # In game mode, clicking anywhere launches a kunai
             if self.quit_btn.isVisible():
                 # Check if game is over and handle button clicks
-                if self.game_over:
+                if self.game.game_over:
                     # Replay button (150, 380, 200x60)
                     if 150 <= click_pos.x() <= 350 and 380 <= click_pos.y() <= 440:
-                        # Replay the game
-                        self.game_over = False
-                        self.game_score = 0
-                        self.stuck_kunai.clear()
-                        self.active_kunai.clear()
-                        self.rotation_direction = 1  # Reset to clockwise
-                        self.is_stopping = False  # Reset stopping flag
-                        self.current_rotation_speed = 0.0
-                        self.game_timer.start(16)  # Restart game timer
-                        print("Replaying game...")
+                        # Replay the game (applied on the next game step, so it is recorded too)
+                        self.game_runner.push(game_core.REPLAY)
+                        event_log.info("game", "Replaying game...")
                         self.update()
                         return
                     
@@ -801,14 +1314,10 @@ class MusicPlayerWindow(QMainWindow):
                         self.click_count = 0
                         self.handle_double_click()
                 else:
-                    # Clicking outside circle - launch kunai
-                    new_kunai = {
-                        'x': self.kunai_base_x,
-                        'y': self.kunai_base_y,
-                        'velocity_y': -20  # Fast launch speed upward
-                    }
-                    self.active_kunai.append(new_kunai)
-                    print(f"Kunai launched! Active kunai: {len(self.active_kunai)}")
+                    # Clicking outside circle - launch kunai on the next game step
+                    self.game_runner.push(game_core.LAUNCH)
+                    event_log.debug("game", "Kunai launched! Active kunai: %d",
+                                    len(self.game.active_kunai) + len(self.game_runner.pending_inputs))
                 
                 return  # Don't process other clicks in game mode
             
@@ -842,6 +1351,13 @@ class MusicPlayerWindow(QMainWindow):
                     self.click_count = 0
                     self.handle_double_click()
     
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        """Finish a thumb drag with a final seek to where it was released"""
+        if event.button() == Qt.MouseButton.LeftButton and self.is_dragging_thumb:
+            self.is_dragging_thumb = False
+            self.seek_timer.stop()
+            self.apply_pending_seek()
+    
     def mouseMoveEvent(self, event: QMouseEvent):
         """Detect when cursor hovers over album art circle and handle thumb dragging"""
         mouse_pos = event.pos()
@@ -854,20 +1370,14 @@ class MusicPlayerWindow(QMainWindow):
             new_progress = (x - self.slider_start_x) / (self.slider_end_x - self.slider_start_x)
             self.thumb_progress = new_progress
             
-            # Seek in the song if music is loaded
-            if self.song_list and pygame.mixer.music.get_busy():
-                # Get song length and seek to position
-                # Note: pygame doesn't provide easy way to get total length
-                # We'll use an approximate method
-                try:
-                    # Seek to position (in seconds)
-                    # This is approximate since we don't have total duration
-                    seek_time = new_progress * 180  # Assume max 3 minutes for now
-                    pygame.mixer.music.set_pos(seek_time)
-                except:
-                    pass  # Seeking may not work for all formats
+            # Seek in the song if music is loaded, at most once per frame
+            if self.song_list and self.current_data is not None:
+                self.pending_seek = new_progress * self.song_length
+                self.current_time = self.pending_seek  # Show the target time while dragging
+                if not self.seek_timer.isActive():
+                    self.seek_timer.start(16)
             
-            self.update()
+            self.update(SLIDER_AREA_RECT)
             return
         
         # Calculate distance from album art center for hover effect
@@ -880,130 +1390,42 @@ class MusicPlayerWindow(QMainWindow):
         self.is_hovering_circle = distance <= self.album_art_radius
         
         # Trigger repaint if hover state changed
+        if was_hovering != self.is_hovering_circle:
+            self.update(CIRCLE_RECT)
+    
+    def update_game(self, dt):
+        """Run the game core for the elapsed time and report what needs repainting"""
+        sim_start = time.perf_counter()
+        events = self.game_runner.advance(dt)
+        if self.replay_costs is not None:
+            self.replay_costs.sim_ms.append((time.perf_counter() - sim_start) * 1000.0)
+            if self.replay_realtime and self.game_runner.playback_done():
+                self.finish_replay()
+                return True
         
-        # Don't update if game is over
-        if self.game_over:
-            return
-        
-        # Handle rest period
-        if self.is_resting:
-            # Rest period countdown happens in separate timer
-            return
-        
-        # Update game time (16ms per frame = 0.016s)
-        self.game_time += 0.016
-        
-        # Check for speed increase every 30 seconds
-        if int(self.game_time) >= self.last_speed_increase + 30 and self.last_speed_increase < 30:
-            self.base_game_speed += 1.0  # Increase by 1 degree per update
-            self.last_speed_increase = int(self.game_time)
-            print(f"Speed increased! New speed: {self.base_game_speed}°/update")
-        
-        # Check for rest period at 35 seconds
-        if self.game_time >= 35 and not self.is_resting and self.last_speed_increase < 60:
-            self.start_rest_period()
-            return
-        
-        # Update all active kunai
-        kunai_to_remove = []
-        
-        for i, kunai in enumerate(self.active_kunai):
-            # Update kunai position
-            kunai['y'] += kunai['velocity_y']
-            kunai['velocity_y'] += 0.3  # Slight gravity effect
-            
-            # Circle parameters
-            circle_center_x = 250
-            circle_center_y = 220
-            circle_radius = 120
-            
-            # Calculate distance from kunai tip to circle center
-            # Kunai tip is at the top of the sprite (y - height/2)
-            kunai_tip_y = kunai['y'] - 60  # Half of 120px height
-            dx = kunai['x'] - circle_center_x
-            dy = kunai_tip_y - circle_center_y
-            distance = (dx**2 + dy**2) ** 0.5
-            
-            # Check if kunai tip touched the circle circumference
-            if distance <= circle_radius and distance >= circle_radius - 30:
-                # Hit! Stick the kunai to the circle
-                # Calculate the angle where kunai hit in world space
-                world_angle = math.degrees(math.atan2(dy, dx))
-                
-                # Subtract current circle rotation to get angle relative to circle's surface
-                # This makes the kunai stick to a specific point on the rotating circle
-                circle_surface_angle = world_angle - self.circle_rotation
-                
-                # Normalize to 0-360 range
-                while circle_surface_angle < 0:
-                    circle_surface_angle += 360
-                while circle_surface_angle >= 360:
-                    circle_surface_angle -= 360
-                
-                # Check for collision with existing stuck kunai
-                collision_detected = False
-                for stuck in self.stuck_kunai:
-                    # Calculate angular difference
-                    angle_diff = abs(stuck['angle'] - circle_surface_angle)
-                    # Handle wrap-around (e.g., 359° and 1° are only 2° apart)
-                    if angle_diff > 180:
-                        angle_diff = 360 - angle_diff
-                    
-                    # If kunai are within 5 degrees of each other, it's a collision
-                    if angle_diff < 5:
-                        collision_detected = True
-                        break
-                
-                if collision_detected:
-                    # Game Over!
-                    self.game_over = True
-                    self.game_timer.stop()
-                    print(f"GAME OVER! Kunai collision detected. Final Score: {self.game_score}")
-                    self.update()  # Trigger repaint to show game over screen
-                else:
-                    # Add to stuck kunai with the surface-relative angle
-                    self.stuck_kunai.append({'angle': circle_surface_angle})
-                    
-                    # Increase score
-                    self.game_score += 5
-                    print(f"Hit! Score: {self.game_score}, Stuck kunai: {len(self.stuck_kunai)}, angle: {circle_surface_angle:.1f}°")
-                
-                # Mark for removal from active list either way
-                kunai_to_remove.append(i)
-            # Remove if kunai goes off screen (top)
-            elif kunai['y'] < -150:
-                kunai_to_remove.append(i)
-        
-        # Remove kunai that hit or went off screen (iterate backwards to avoid index issues)
-        for i in reversed(kunai_to_remove):
-            self.active_kunai.pop(i)
-        
-        # Trigger repaint if there are active kunai or stuck kunai
-        if self.active_kunai or self.stuck_kunai:
-            self.update()
-    
-    def start_rest_period(self):
-        """Start the 1-minute rest period"""
-        self.is_resting = True
-        self.rest_time_remaining = 60
-        print("Rest period started! Take a 1-minute break...")
-        from PyQt6.QtCore import QTimer
-        self.rest_timer = QTimer(self)
-        self.rest_timer.timeout.connect(self.update_rest_countdown)
-        self.rest_timer.start(1000)
-        self.update()
-    
-    def update_rest_countdown(self):
-        """Update the rest period countdown"""
-        self.rest_time_remaining -= 1
-        if self.rest_time_remaining <= 0:
-            self.rest_timer.stop()
-            self.is_resting = False
-            self.last_speed_increase = 60
-            print("Rest period over! Game resuming...")
-            self.update()
-        else:
-            self.update()
+        # Render between the last two simulation steps so motion stays smooth at any frame rate
+        self.game_alpha = self.game_runner.alpha()
+        self.circle_rotation = self.game.rotation_at(self.game_alpha)
+        
+        # Runs every frame - skip the loop unless game events are being logged
+        if events and event_log.enabled(INFO):
+            for event in events:
+                if event == game_core.HIT:
+                    event_log.info("game", "Hit! Score: %d, Stuck kunai: %d, angle: %.1f°",
+                                   self.game.game_score, len(self.game.stuck_kunai), self.game.last_hit_angle)
+                elif event == game_core.GAME_OVER:
+                    event_log.info("game", "GAME OVER! Kunai collision detected. Final Score: %d", self.game.game_score)
+                elif event == game_core.SPEED_UP:
+                    event_log.info("game", "Speed increased! New speed: %s°/update", self.game.base_game_speed)
+                elif event == game_core.REST_STARTED:
+                    event_log.info("game", "Rest period started! Take a 1-minute break...")
+                elif event == game_core.REST_OVER:
+                    event_log.info("game", "Rest period over! Game resuming...")
+        
+        # Kunai, overlays and score changes can be anywhere; otherwise only the circle turned
+        if events or self.game.active_kunai or self.game.stuck_kunai or self.game.game_over:
+            return True
+        return CIRCLE_RECT
     
     def handle_single_click(self):
         """Handle single click - toggle play/pause and rotation (disabled in game mode)"""
@@ -1016,27 +1438,32 @@ class MusicPlayerWindow(QMainWindow):
         
         # If no songs loaded, open folder dialog
         if not self.song_list:
-            print("No songs loaded, opening folder dialog...")
+            event_log.info("ui", "No songs loaded, opening folder dialog...")
             self.open_file_dialog()
             return
         
         self.is_music_playing = not self.is_music_playing
         
         if self.is_music_playing:
-            print("Music playing...")
+            event_log.info("playback", "Music playing...")
             # Resume music playback
-            pygame.mixer.music.unpause()
+            self.mixer_music().unpause()
+            self.playback_clock.resume()
             # Start rotation animation
-            self.rotation_timer.start(50)
+            self.frame_scheduler.set_active("rotation", True)
+            self.update_marquee_state()
             # Also update the play button icon
             self.is_playing = True
             self.play_btn.setIcon(self.pause_icon)
         else:
-            print("Music paused")
+            event_log.info("playback", "Music paused")
             # Pause music playback
-            pygame.mixer.music.pause()
+            self.mixer_music().pause()
+            self.playback_clock.pause()
+            self.settings.update(last_position=round(self.playback_clock.position(), 2))
             # Stop rotation animation
-            self.rotation_timer.stop()
+            self.frame_scheduler.set_active("rotation", False)
+            self.update_marquee_state()
             # Also update the play button icon
             self.is_playing = False
             self.play_btn.setIcon(self.play_icon)
@@ -1045,33 +1472,48 @@ class MusicPlayerWindow(QMainWindow):
         """Handle double click - toggle between music mode and game mode"""
         if self.quit_btn.isVisible():
             # Already in game mode, exit back to music mode
-            print("Exiting game mode via double-click...")
+            event_log.info("game", "Exiting game mode via double-click...")
             self.exit_game_mode()
         else:
             # Enter game mode
-            print("Entering game mode...")
+            event_log.info("game", "Entering game mode...")
             self.show_game_mode()
     
-    def show_game_mode(self):
-        """Show game mode with smooth transition"""
-        print("Starting transition to game mode...")
+    def show_game_mode(self, replay=None):
+        """Show game mode with smooth transition (optionally playing back a replay)"""
+        event_log.info("game", "Starting transition to game mode...")
         self.is_transitioning = True
         self.transition_progress = 0.0
-        self.transition_timer.start(16)  # ~60 FPS
-        
-        # Automatically start rotation when entering game mode with faster speed
-        self.rotation_timer.stop()  # Stop current rotation
-        self.rotation_timer.start(50)  # Same interval, but will rotate 2 degrees per update
+        self.frame_scheduler.set_active("transition", True)
+        
+        # Game images normally arrive in the background; load them now if not
+        self.ensure_game_assets()
+        
+        # Pre-rotate the kunai sprites once (first game only)
+        if self.kunai_atlas is None and self.kunai_pixmap:
+            self.kunai_atlas = KunaiAtlas(self.kunai_pixmap)
+        
+        # Fresh game, continuing from the circle's current angle; the core spins it from now on.
+        # New games get a fresh seed and are recorded; replays bring their own seed and inputs
+        self.game_runner.reset()
+        if replay is None:
+            seed = secrets.randbits(63)
+            self.game.reset(rotation=self.circle_rotation, seed=seed)
+            self.game_runner.start_recording(Replay(seed, self.circle_rotation, self.game_runner.step_length))
+        else:
+            self.game.reset(rotation=replay.start_rotation, seed=replay.seed)
+            self.game_runner.start_playback(replay)
+        self.in_game_mode = True
         
-        # Reinitialize stars for fresh animation
+        # Reinitialize stars for fresh animation (they start twinkling once the fade completes)
         self.initialize_stars()
         
-        # Start game timer
-        self.game_timer.start(16)  # ~60 FPS for smooth game physics
+        # Start the game (physics and the circle's game-mode spin)
+        self.frame_scheduler.set_active("game", True)
     
-    def update_transition(self):
+    def update_transition(self, dt):
         """Update transition animation"""
-        self.transition_progress += 0.02  # Adjust speed (0.02 = ~0.8 seconds)
+        self.transition_progress += 0.02 * dt / 0.016  # 0.02 per 16ms = ~0.8 seconds
         
         # Fade out all buttons during transition using graphics effect
         from PyQt6.QtWidgets import QGraphicsOpacityEffect
@@ -1087,7 +1529,7 @@ class MusicPlayerWindow(QMainWindow):
         
         if self.transition_progress >= 1.0:
             self.transition_progress = 1.0
-            self.transition_timer.stop()
+            self.frame_scheduler.set_active("transition", False)
             self.is_transitioning = False
             
             # Hide all music player buttons after fade completes
@@ -1101,37 +1543,76 @@ class MusicPlayerWindow(QMainWindow):
             # Show quit button (no text label needed)
             self.quit_btn.show()
             self.quit_btn.raise_()
+            
+            # Star field is on screen now
+            self.frame_scheduler.set_active("stars", True)
         
-        self.update()  # Trigger repaint
+        return True  # Trigger repaint
     
     def exit_game_mode(self):
         """Exit game mode and return to music player with fade-in transition"""
-        print("Exiting game mode...")
+        event_log.info("game", "Exiting game mode...")
         self.quit_btn.hide()
         
         # Hide overlay close button if visible
-        self.overlay_close_btn.hide()
-        
-        # Rotation speed will automatically adjust back to normal (1 degree) when not in game mode
+        if self.overlay_close_btn is not None:
+            self.overlay_close_btn.hide()
+        
+        # Stop the game and reset its state; the circle goes back to normal
+        # music-mode rotation (1 degree) from where the game left it
+        self.frame_scheduler.set_active("game", False)
+        self.frame_scheduler.set_active("stars", False)
+        self.in_game_mode = False
+        
+        # Keep the session so it can be replayed (python replay.py replays/last_game.skr)
+        recording = self.game_runner.recording
+        if recording is not None and recording.inputs:
+            try:
+                recording.save(LAST_GAME_PATH)
+            except OSError as e:
+                event_log.error("replay", "Error saving replay: %s", e)
         
-        # Stop game timer and reset game state
-        self.game_timer.stop()
-        self.active_kunai.clear()  # Remove all active kunai
-        self.stuck_kunai.clear()  # Remove all stuck kunai
-        self.game_over = False  # Reset game over state
-        self.game_time = 0  # Reset game time
-        self.last_speed_increase = 0  # Reset speed tracking
-        self.base_game_speed = 3.0  # Reset to starting speed
-        self.is_resting = False  # Reset rest state
+        self.replay_costs = None
+        self.game_runner.step_length = game_core.SIM_STEP
+        self.game.reset(rotation=self.circle_rotation)
+        self.game_runner.reset()
+        self.frame_scheduler.set_active("rotation", True)
         
         # Start reverse transition
         self.is_reverse_transitioning = True
         self.reverse_transition_progress = 0.0
-        self.reverse_transition_timer.start(16)  # ~60 FPS
+        self.frame_scheduler.set_active("reverse_transition", True)
+    
+    def play_replay(self, replay, realtime=True, close_when_done=False):
+        """Play back a recorded game - in real time, or stepping and painting as fast as possible"""
+        event_log.info("replay", "Playing replay (seed %d, %d steps)...", replay.seed, replay.total_steps)
+        self.replay_costs = FrameCosts()
+        self.replay_realtime = realtime
+        self.replay_close_when_done = close_when_done
+        self.game_runner.step_length = replay.step_length
+        self.show_game_mode(replay)
+        if realtime:
+            return
+        
+        # Skip the fade, then run one simulation step and one synchronous paint per frame
+        self.update_transition(1.0)
+        self.frame_scheduler.set_active("game", False)
+        while not self.game_runner.playback_done():
+            self.update_game(replay.step_length)
+            self.repaint()
+        self.finish_replay()
+    
+    def finish_replay(self):
+        """Report playback costs and leave game mode"""
+        event_log.info("replay", "%s", self.replay_costs.report())
+        event_log.info("replay", "Replay finished. Final Score: %d", self.game.game_score)
+        self.exit_game_mode()
+        if self.replay_close_when_done:
+            self.close()
     
-    def update_reverse_transition(self):
+    def update_reverse_transition(self, dt):
         """Update reverse transition animation (game mode -> music mode)"""
-        self.reverse_transition_progress += 0.02  # Same speed as forward transition
+        self.reverse_transition_progress += 0.02 * dt / 0.016  # Same speed as forward transition
         
         # Fade in all buttons during reverse transition
         from PyQt6.QtWidgets import QGraphicsOpacityEffect
@@ -1148,7 +1629,7 @@ class MusicPlayerWindow(QMainWindow):
         
         if self.reverse_transition_progress >= 1.0:
             self.reverse_transition_progress = 1.0
-            self.reverse_transition_timer.stop()
+            self.frame_scheduler.set_active("reverse_transition", False)
             self.is_reverse_transitioning = False
             
             # Ensure all buttons are at full opacity
@@ -1158,67 +1639,120 @@ class MusicPlayerWindow(QMainWindow):
                     if effect and isinstance(effect, QGraphicsOpacityEffect):
                         effect.setOpacity(1.0)
         
-        self.update()  # Trigger repaint
+        return True  # Trigger repaint
     
     def show_success_page(self):
         """Show the success page (game mode entry)"""
         # This method is no longer used for game mode
         pass
     
-    def update_rotation(self):
-        """Update rotation angle for spinning animation"""
-        # Rotation speed depends on mode and game state
-        if self.quit_btn.isVisible():
-            # Game mode
-            if self.is_stopping:
-                # Gradual deceleration to stop
-                if abs(self.current_rotation_speed) > 0.01:
-                    # Reduce speed by 2% each frame (smooth deceleration)
-                    self.current_rotation_speed *= 0.98
-                    rotation_speed = self.current_rotation_speed
-                else:
-                    # Stopped completely
-                    rotation_speed = 0
-                    self.current_rotation_speed = 0
-                    # Hide game over overlay once stopped
-                    if self.game_over:
-                        self.game_over = False
-            elif self.game_over or self.is_resting:
-                # Game over or resting: slow rotation
-                rotation_speed = 0.5
-            else:
-                # Active gameplay: use current game speed (increases over time)
-                rotation_speed = self.base_game_speed
-        else:
-            # Music mode: normal rotation (always clockwise)
-            rotation_speed = 1.0
-        
-        # Update rotation (can go negative or beyond 360)
-        self.circle_rotation += rotation_speed
-        
-        # No normalization - allow rotation to accumulate in either direction
-        # This ensures stuck kunai stay in the correct position
-        
-        self.update()  # Trigger repaint
+    def update_hud(self, dt):
+        """Refresh the frame timing HUD (ticked every HUD_REFRESH seconds)"""
+        return HUD_RECT
+    
+    def update_rotation(self, dt):
+        """Update rotation angle for spinning animation (music mode)"""
+        # In game mode the game core spins the circle
+        if self.in_game_mode:
+            return False
+        
+        # Normal rotation (always clockwise), 1 degree per 50ms tick. Whole steps
+        # (more if ticks were missed) so timer jitter never skips a drawn degree
+        self.circle_rotation += max(1, round(dt / 0.05))
+        
+        # No normalization - allow rotation to accumulate.
+        # The circle only looks different once it reaches the next whole degree
+        angle = int(self.circle_rotation)
+        if angle == self.drawn_rotation:
+            return False
+        self.drawn_rotation = angle
+        return CIRCLE_RECT
+    
+    def changeEvent(self, event):
+        """Stop animating while the window is minimized"""
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.frame_scheduler.set_suspended(self.isMinimized())
+        super().changeEvent(event)
+    
+    def closeEvent(self, event):
+        """Stop background work before the window closes"""
+        # Remember where we stopped and write everything out before exiting
+        if self.current_data is not None:
+            self.settings.update(last_position=round(self.playback_clock.position(), 2))
+        self.settings.close()
+        
+        self.folder_watcher.stop()
+        self.track_loader.shutdown()
+        self.asset_loader.shutdown()
+        if self.waveform_analyzer is not None:
+            self.waveform_analyzer.shutdown()
+        if stall_meter_enabled():
+            event_log.info("metrics", "%s", self.stall_meter.report())
+        trace_path = frame_trace_path()
+        if trace_path is not None:
+            try:
+                self.frame_metrics.export(trace_path)
+            except OSError as e:
+                event_log.error("metrics", "Error writing frame trace: %s", e)
+        super().closeEvent(event)
+    
+    def event(self, event):
+        """Deliver an event, timing input handling for the frame metrics"""
+        if event.type() not in INPUT_EVENT_TYPES:
+            return super().event(event)
+        start = time.perf_counter()
+        handled = super().event(event)
+        self.frame_metrics.add_event((time.perf_counter() - start) * 1000.0)
+        return handled
     
     def paintEvent(self, event):
+        """Paint the window (plus the HUD when shown) and record how long it took;
+        the first paint also kicks off the work startup deferred"""
+        paint_start = time.perf_counter()
+        self.paint_window(event)
+        if self.show_frame_hud and event.region().intersects(HUD_RECT):
+            painter = QPainter(self)
+            draw_hud(painter, self.frame_metrics)
+            painter.end()
+        paint_ms = (time.perf_counter() - paint_start) * 1000.0
+        self.frame_metrics.add_paint(paint_ms)
+        if self.replay_costs is not None:
+            self.replay_costs.paint_ms.append(paint_ms)
+        if not self.first_frame_shown:
+            # First frame is up - now load what startup deferred
+            self.first_frame_shown = True
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def paint_window(self, event):
         """Draw all UI elements in correct order"""
-        from PyQt6.QtGui import QFont, QPainterPath, QPen, QColor, QBrush
+        from PyQt6.QtGui import QFont, QPen, QColor, QBrush
         
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
+        # Only the invalidated part of the window needs redrawing;
+        # layers outside it are skipped entirely
+        area = event.rect()
+        region = event.region()
+        
+        # Backgrounds come pre-scaled for the current size and DPR
+        dpr = self.devicePixelRatioF()
+        background = self.layer_cache.background("music", self.size(), dpr)
+        blue_background = None
+        if self.is_transitioning or self.is_reverse_transitioning or self.quit_btn.isVisible():
+            blue_background = self.layer_cache.background("game", self.size(), dpr)
+        
         # Handle transition animation (music -> game)
         if self.is_transitioning:
             # Blend between purple and blue backgrounds
-            if self.background_pixmap and self.blue_background_pixmap:
+            if background and blue_background:
                 # Draw purple background
                 painter.setOpacity(1.0 - self.transition_progress)
-                painter.drawPixmap(0, 0, self.background_pixmap)
+                draw_layer_region(painter, background, area)
                 
                 # Draw blue background on top with increasing opacity
                 painter.setOpacity(self.transition_progress)
-                painter.drawPixmap(0, 0, self.blue_background_pixmap)
+                draw_layer_region(painter, blue_background, area)
                 
                 # Draw UI elements with fading opacity (inverse of blue background)
                 painter.setOpacity(1.0 - self.transition_progress)
@@ -1229,14 +1763,14 @@ class MusicPlayerWindow(QMainWindow):
         # Handle reverse transition animation (game -> music)
         elif self.is_reverse_transitioning:
             # Blend between blue and purple backgrounds
-            if self.background_pixmap and self.blue_background_pixmap:
+            if background and blue_background:
                 # Draw blue background
                 painter.setOpacity(1.0 - self.reverse_transition_progress)
-                painter.drawPixmap(0, 0, self.blue_background_pixmap)
+                draw_layer_region(painter, blue_background, area)
                 
                 # Draw purple background on top with increasing opacity
                 painter.setOpacity(self.reverse_transition_progress)
-                painter.drawPixmap(0, 0, self.background_pixmap)
+                draw_layer_region(painter, background, area)
                 
                 # Draw UI elements with increasing opacity
                 painter.setOpacity(self.reverse_transition_progress)
@@ -1248,15 +1782,15 @@ class MusicPlayerWindow(QMainWindow):
             painter.setOpacity(1.0)  # Full opacity when not transitioning
         
         # Draw background image first
-        if self.quit_btn.isVisible() and self.blue_background_pixmap:
+        if self.quit_btn.isVisible() and blue_background:
             # Game mode - show blue background
-            painter.drawPixmap(0, 0, self.blue_background_pixmap)
+            draw_layer_region(painter, blue_background, area)
             # Continue to draw circle in game mode (don't return yet)
-        elif self.background_pixmap:
+        elif background:
             # Music player mode - show purple background
-            painter.drawPixmap(0, 0, self.background_pixmap)
+            draw_layer_region(painter, background, area)
         else:
-            painter.fillRect(self.rect(), QColor(180, 120, 220))
+            painter.fillRect(area, QColor(180, 120, 220))
         
         # Don't draw UI elements if success screen is showing (but allow circle in game mode)
         if self.success_label.isVisible() and not self.quit_btn.isVisible():
@@ -1266,7 +1800,8 @@ class MusicPlayerWindow(QMainWindow):
         pen = QPen()
         
         # Draw hover glow effect around circle (before rotation, so it doesn't rotate)
-        if self.is_hovering_circle:
+        circle_dirty = region.intersects(CIRCLE_RECT)
+        if self.is_hovering_circle and circle_dirty:
             # Draw multiple rings for glow effect
             for i in range(3):
                 alpha = 60 - (i * 20)  # Fade out as rings get larger
@@ -1278,94 +1813,18 @@ class MusicPlayerWindow(QMainWindow):
                 painter.drawEllipse(130 - offset, 100 - offset, 240 + (offset * 2), 240 + (offset * 2))
         
         # Draw circle for MUSIC MODE (will be redrawn on top in game mode)
-        if not self.quit_btn.isVisible():
-            # Save painter state before rotation
-            painter.save()
-            
-            # Rotate around the circle center (250, 220)
-            painter.translate(250, 220)
-            painter.rotate(self.circle_rotation)
-            painter.translate(-250, -220)
-            
-            # Draw circle (filled white with black border)
+        if not self.quit_btn.isVisible() and circle_dirty:
+            # Draw circle and music note (cached layer) rotated around its center;
+            # whole degrees in music mode, smooth while the game core spins it
             painter.setOpacity(1.0)
-            painter.setBrush(QBrush(QColor(255, 255, 255)))  # White fill
-            pen.setColor(QColor(0, 0, 0))
-            pen.setWidth(5)
-            painter.setPen(pen)
-            painter.drawEllipse(130, 100, 240, 240)
-            
-            # Draw music note
-            painter.setOpacity(1.0)
-            music_font = QFont("Ink Free", 140, QFont.Weight.Bold)
-            painter.setFont(music_font)
-            path = QPainterPath()
-            path.addText(195, 280, music_font, "♪")
-            pen.setColor(QColor(0, 0, 0))
-            pen.setWidth(5)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawPath(path)
-            painter.fillPath(path, QBrush(QColor(0, 0, 0)))
-            
-            # Restore painter state after rotation
-            painter.restore()
+            angle = self.circle_rotation if self.in_game_mode else int(self.circle_rotation)
+            self.layer_cache.draw_circle(painter, self.album_art_center, angle)
         
         # If in game mode, stop here (only show circle, no other UI)
         if self.quit_btn.isVisible():
             # Draw twinkling stars in the background
             painter.setOpacity(1.0)
-            for star in self.stars:
-                if star['pixmap']:
-                    # Set star opacity for fade effect
-                    painter.setOpacity(star['opacity'])
-                    
-                    # Draw star image centered at position
-                    star_x = int(star['x'] - star['size']/2)
-                    star_y = int(star['y'] - star['size']/2)
-                    painter.drawPixmap(star_x, star_y, star['pixmap'])
-            
-            # Reset opacity for other elements
-            painter.setOpacity(1.0)
-            
-            # Draw stuck kunai (they rotate with the circle) - OUTSIDE rotation transform
-            if self.kunai_pixmap and self.stuck_kunai:
-                import math
-                circle_center_x = 250
-                circle_center_y = 220
-                circle_radius = 120
-                
-                print(f"Rendering {len(self.stuck_kunai)} stuck kunai at rotation {self.circle_rotation:.1f}°")
-                
-                for i, stuck in enumerate(self.stuck_kunai):
-                    # Calculate current angle including circle rotation
-                    current_angle = stuck['angle'] + self.circle_rotation
-                    angle_rad = math.radians(current_angle)
-                    
-                    # Position kunai tip on the circumference
-                    kunai_tip_x = circle_center_x + circle_radius * math.cos(angle_rad)
-                    kunai_tip_y = circle_center_y + circle_radius * math.sin(angle_rad)
-                    
-                    # Kunai center should be offset OUTWARD from tip
-                    kunai_center_x = kunai_tip_x + 60 * math.cos(angle_rad)
-                    kunai_center_y = kunai_tip_y + 60 * math.sin(angle_rad)
-                    
-                    print(f"  Kunai {i}: angle={stuck['angle']:.1f}° current={current_angle:.1f}° pos=({kunai_center_x:.0f}, {kunai_center_y:.0f})")
-                    
-                    # Save painter state for individual kunai rotation
-                    painter.save()
-                    
-                    # Translate to kunai position and rotate to point outward
-                    painter.translate(kunai_center_x, kunai_center_y)
-                    painter.rotate(current_angle - 90)  # -90 to point outward
-                    
-                    # Draw kunai centered at origin
-                    kunai_draw_x = -self.kunai_pixmap.width() / 2
-                    kunai_draw_y = -self.kunai_pixmap.height() / 2
-                    painter.drawPixmap(int(kunai_draw_x), int(kunai_draw_y), self.kunai_pixmap)
-                    
-                    # Restore painter state
-                    painter.restore()
+            self.star_field.draw(painter, area)
             
             # Draw score at top center
             score_font = QFont("Ink Free", 32, QFont.Weight.Bold)
@@ -1374,93 +1833,40 @@ class MusicPlayerWindow(QMainWindow):
             pen.setWidth(2)
             painter.setPen(pen)
             painter.setOpacity(1.0)
-            score_text = f"SCORE: {self.game_score}"
+            score_text = f"SCORE: {self.game.game_score}"
             painter.drawText(0, 30, 500, 50, Qt.AlignmentFlag.AlignCenter, score_text)
             
-            # Draw base kunai at bottom (always visible)
-            if self.kunai_pixmap:
-                base_kunai_x = int(self.kunai_base_x - self.kunai_pixmap.width() / 2)
-                base_kunai_y = int(self.kunai_base_y - self.kunai_pixmap.height() / 2)
-                painter.drawPixmap(base_kunai_x, base_kunai_y, self.kunai_pixmap)
-            
-            # Draw all active (launched) kunai
-            if self.kunai_pixmap:
-                for kunai in self.active_kunai:
-                    kunai_x = int(kunai['x'] - self.kunai_pixmap.width() / 2)
-                    kunai_y = int(kunai['y'] - self.kunai_pixmap.height() / 2)
-                    painter.drawPixmap(kunai_x, kunai_y, self.kunai_pixmap)
-            
-            # NOW draw circle and stuck kunai as TOP LAYER
-            # Save painter state before rotation
-            painter.save()
-            
-            # Rotate around the circle center (250, 220)
-            painter.translate(250, 220)
-            painter.rotate(self.circle_rotation)
-            painter.translate(-250, -220)
-            
-            # Draw circle (filled white with black border)
-            painter.setOpacity(1.0)
-            painter.setBrush(QBrush(QColor(255, 255, 255)))  # White fill
-            pen = QPen()
-            pen.setColor(QColor(0, 0, 0))
-            pen.setWidth(5)
-            painter.setPen(pen)
-            painter.drawEllipse(130, 100, 240, 240)
-            
-            # Draw music note
+            # NOW draw circle (cached layer) and all kunai as TOP LAYER
             painter.setOpacity(1.0)
-            music_font = QFont("Ink Free", 140, QFont.Weight.Bold)
-            painter.setFont(music_font)
-            path = QPainterPath()
-            path.addText(195, 280, music_font, "♪")
-            pen.setColor(QColor(0, 0, 0))
-            pen.setWidth(5)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawPath(path)
-            painter.fillPath(path, QBrush(QColor(0, 0, 0)))
+            self.layer_cache.draw_circle(painter, self.album_art_center, self.circle_rotation)
             
-            # Restore painter state after rotation
-            painter.restore()
-            
-            # Draw stuck kunai as ABSOLUTE TOP LAYER
-            if self.kunai_pixmap and self.stuck_kunai:
-                import math
+            # Draw every kunai (base, flying and stuck) in one batch from the atlas
+            if self.kunai_atlas:
+                # Base kunai at bottom (always visible) and launched kunai fly upright
+                fragments = [self.kunai_atlas.fragment(KUNAI_BASE_X, KUNAI_BASE_Y, 0)]
+                kunai = self.game.active_kunai
+                for i in range(kunai.count):
+                    kunai_y = self.game.kunai_y_at(i, self.game_alpha)
+                    fragments.append(self.kunai_atlas.fragment(kunai.x[i], kunai_y, 0))
+                
+                # Stuck kunai rotate with the circle
                 circle_center_x = 250
                 circle_center_y = 220
-                circle_radius = 120
-                
-                for i, stuck in enumerate(self.stuck_kunai):
+                for stuck_angle in self.game.stuck_kunai:
                     # Calculate current angle including circle rotation
-                    current_angle = stuck['angle'] + self.circle_rotation
+                    current_angle = stuck_angle + self.circle_rotation
                     angle_rad = math.radians(current_angle)
                     
-                    # Position kunai tip on the circumference
-                    kunai_tip_x = circle_center_x + circle_radius * math.cos(angle_rad)
-                    kunai_tip_y = circle_center_y + circle_radius * math.sin(angle_rad)
-                    
-                    # Kunai center should be offset OUTWARD from tip
-                    kunai_center_x = kunai_tip_x + 60 * math.cos(angle_rad)
-                    kunai_center_y = kunai_tip_y + 60 * math.sin(angle_rad)
-                    
-                    # Save painter state for individual kunai rotation
-                    painter.save()
-                    
-                    # Translate to kunai position and rotate to point outward
-                    painter.translate(kunai_center_x, kunai_center_y)
-                    painter.rotate(current_angle - 90)  # -90 to point outward
-                    
-                    # Draw kunai centered at origin
-                    kunai_draw_x = -self.kunai_pixmap.width() / 2
-                    kunai_draw_y = -self.kunai_pixmap.height() / 2
-                    painter.drawPixmap(int(kunai_draw_x), int(kunai_draw_y), self.kunai_pixmap)
-                    
-                    # Restore painter state
-                    painter.restore()
+                    # Kunai tip sits on the circumference (radius 120), its center 60px further out
+                    kunai_center_x = circle_center_x + 180 * math.cos(angle_rad)
+                    kunai_center_y = circle_center_y + 180 * math.sin(angle_rad)
+                    fragments.append(self.kunai_atlas.fragment(kunai_center_x, kunai_center_y,
+                                                               current_angle - 90))  # -90 to point outward
+                
+                self.kunai_atlas.draw(painter, fragments)
             
             # Draw Game Over overlay if game is over
-            if self.game_over:
+            if self.game.game_over:
                 # Semi-transparent black overlay
                 painter.setOpacity(0.8)
                 painter.fillRect(0, 0, 500, 700, QColor(0, 0, 0))
@@ -1479,7 +1885,7 @@ class MusicPlayerWindow(QMainWindow):
                 painter.setFont(score_font)
                 pen.setColor(QColor(255, 255, 255))  # White
                 painter.setPen(pen)
-                painter.drawText(0, 280, 500, 50, Qt.AlignmentFlag.AlignCenter, f"Final Score: {self.game_score}")
+                painter.drawText(0, 280, 500, 50, Qt.AlignmentFlag.AlignCenter, f"Final Score: {self.game.game_score}")
                 
                 # Replay button
                 replay_rect = QRect(150, 380, 200, 60)
@@ -1505,7 +1911,7 @@ class MusicPlayerWindow(QMainWindow):
                 painter.drawText(close_rect, Qt.AlignmentFlag.AlignCenter, "CLOSE")
             
             # Draw Rest Period overlay if resting
-            if self.is_resting:
+            if self.game.is_resting:
                 painter.setOpacity(0.85)
                 painter.fillRect(0, 0, 500, 700, QColor(0, 0, 0))
                 painter.setOpacity(1.0)
@@ -1519,7 +1925,7 @@ class MusicPlayerWindow(QMainWindow):
                 painter.setFont(countdown_font)
                 pen.setColor(QColor(255, 255, 255))
                 painter.setPen(pen)
-                painter.drawText(0, 320, 500, 100, Qt.AlignmentFlag.AlignCenter, f"{self.rest_time_remaining}")
+                painter.drawText(0, 320, 500, 100, Qt.AlignmentFlag.AlignCenter, f"{self.game.rest_time_remaining}")
                 instruction_font = QFont("Ink Free", 24)
                 painter.setFont(instruction_font)
                 painter.drawText(0, 450, 500, 40, Qt.AlignmentFlag.AlignCenter, "Take a break!")
@@ -1527,68 +1933,83 @@ class MusicPlayerWindow(QMainWindow):
             return
         
         # Draw song name with marquee effect between circle and slider
-        text_font = QFont("Ink Free", 22, QFont.Weight.Bold)  # Decreased from 28 to 22pt
-        painter.setFont(text_font)
-        pen.setWidth(1)
-        pen.setColor(QColor(0, 0, 0))
-        painter.setPen(pen)
-        
-        # Create clipping region for marquee effect (increased width)
-        painter.save()
-        clip_rect = QRect(100, 380, 300, 30)  # Increased from 200 to 300 width, moved left
-        painter.setClipRect(clip_rect)
-        
-        # Draw text with offset for marquee
-        if len(self.current_song_name) > 15:
-            # Scrolling text
-            painter.drawText(100 - self.marquee_offset, 380, 500, 30, 
-                           Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, 
-                           self.current_song_name)
-        else:
-            # Centered text for short names
-            painter.drawText(100, 380, 300, 30, Qt.AlignmentFlag.AlignCenter, self.current_song_name)
+        if region.intersects(MARQUEE_RECT):
+            text_font = QFont("Ink Free", 22, QFont.Weight.Bold)  # Decreased from 28 to 22pt
+            painter.setFont(text_font)
+            pen.setWidth(1)
+            pen.setColor(QColor(0, 0, 0))
+            painter.setPen(pen)
         
-        painter.restore()
+            # Create clipping region for marquee effect (increased width)
+            painter.save()
+            clip_rect = QRect(100, 380, 300, 30)  # Increased from 200 to 300 width, moved left
+            painter.setClipRect(clip_rect)
+        
+            # Draw text with offset for marquee
+            if len(self.current_song_name) > 15:
+                # Scrolling text
+                painter.drawText(100 - self.marquee_offset, 380, 500, 30, 
+                               Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, 
+                               self.current_song_name)
+            else:
+                # Centered text for short names
+                painter.drawText(100, 380, 300, 30, Qt.AlignmentFlag.AlignCenter, self.current_song_name)
+        
+            painter.restore()
         
         # Draw time display below left side of slider
-        time_font = QFont("Ink Free", 18, QFont.Weight.Bold)  # Increased from 14 to 18pt, made bold
-        painter.setFont(time_font)
-        pen.setColor(QColor(0, 0, 0))  # Changed to black
-        pen.setWidth(2)  # Increased thickness
-        painter.setPen(pen)
-        # Format time as MM:SS
-        minutes = int(self.current_time // 60)
-        seconds = int(self.current_time % 60)
-        time_text = f"{minutes:02d}:{seconds:02d}"
-        painter.drawText(100, 500, 80, 25, Qt.AlignmentFlag.AlignLeft, time_text)  # Increased width from 60 to 80
-        
-        # Draw progress slider line
-        pen.setColor(QColor(100, 100, 100))  # Gray line
-        pen.setWidth(6)
-        painter.setPen(pen)
-        # Slider from x=100 to x=400, y=484
-        painter.drawLine(100, 484, 400, 484)
-        
-        # Draw progress fill (based on thumb_progress)
-        pen.setColor(QColor(150, 100, 200))  # Purple progress
-        pen.setWidth(6)
-        painter.setPen(pen)
-        progress_x = 100 + int(self.thumb_progress * 300)
-        painter.drawLine(100, 484, progress_x, 484)
-        
-        # Draw thumb using thumb.png
-        if self.thumb_pixmap:
-            # Center the thumb image at progress_x (48px image)
-            thumb_x = progress_x - 24  # Center 48px image
-            thumb_y = 460  # Vertical position (adjusted for larger size)
-            painter.drawPixmap(thumb_x, thumb_y, self.thumb_pixmap)
-        else:
-            # Fallback to programmatic circle if image not loaded
-            painter.setBrush(QBrush(QColor(200, 150, 230)))  # Purple thumb
-            pen.setColor(QColor(0, 0, 0))
-            pen.setWidth(2)
+        if region.intersects(SLIDER_AREA_RECT):
+            time_font = QFont("Ink Free", 18, QFont.Weight.Bold)  # Increased from 14 to 18pt, made bold
+            painter.setFont(time_font)
+            pen.setColor(QColor(0, 0, 0))  # Changed to black
+            pen.setWidth(2)  # Increased thickness
             painter.setPen(pen)
-            painter.drawEllipse(progress_x - 24, 460, 48, 48)
+            # Format time as MM:SS
+            minutes = int(self.current_time // 60)
+            seconds = int(self.current_time % 60)
+            time_text = f"{minutes:02d}:{seconds:02d}"
+            painter.drawText(100, 500, 80, 25, Qt.AlignmentFlag.AlignLeft, time_text)  # Increased width from 60 to 80
+        
+            progress_x = 100 + int(self.thumb_progress * 300)
+            if self.waveform_lines:
+                # Waveform slider: gray peaks, purple up to the current position
+                pen.setColor(QColor(100, 100, 100))
+                pen.setWidth(1)
+                painter.setPen(pen)
+                painter.drawLines(self.waveform_lines)
+                painter.save()
+                painter.setClipRect(100, 460, progress_x - 100, 50)
+                pen.setColor(QColor(150, 100, 200))
+                painter.setPen(pen)
+                painter.drawLines(self.waveform_lines)
+                painter.restore()
+            else:
+                # Draw progress slider line
+                pen.setColor(QColor(100, 100, 100))  # Gray line
+                pen.setWidth(6)
+                painter.setPen(pen)
+                # Slider from x=100 to x=400, y=484
+                painter.drawLine(100, 484, 400, 484)
+            
+                # Draw progress fill (based on thumb_progress)
+                pen.setColor(QColor(150, 100, 200))  # Purple progress
+                pen.setWidth(6)
+                painter.setPen(pen)
+                painter.drawLine(100, 484, progress_x, 484)
+        
+            # Draw thumb using thumb.png
+            if self.thumb_pixmap:
+                # Center the thumb image at progress_x (48px image)
+                thumb_x = progress_x - 24  # Center 48px image
+                thumb_y = 460  # Vertical position (adjusted for larger size)
+                painter.drawPixmap(thumb_x, thumb_y, self.thumb_pixmap)
+            else:
+                # Fallback to programmatic circle if image not loaded
+                painter.setBrush(QBrush(QColor(200, 150, 230)))  # Purple thumb
+                pen.setColor(QColor(0, 0, 0))
+                pen.setWidth(2)
+                painter.setPen(pen)
+                painter.drawEllipse(progress_x - 24, 460, 48, 48)
         
         # Reset opacity at the end
         painter.setOpacity(1.0)
@@ -0,0 +1,140 @@
+"""
+Playback State
+Event-driven playback clock. Position comes from a monotonic clock anchored at
+play/pause/seek instead of polling pygame, and a single one-shot timer wakes up
+only when the displayed second changes or the track is due to end.
+pygame itself is only imported, and the audio device opened, when the first
+track is about to play.
+"""
+
+import os
+import time
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from frame_metrics import MeasuredTimer
+from event_log import event_log
+
+# Set by open_mixer() - importing pygame is a large part of startup
+pygame = None
+
+# Fallback wake-up interval when pygame can't post end events
+FALLBACK_CHECK_MS = 250
+
+
+def open_mixer():
+    """Import pygame and initialize its mixer on first use; returns the pygame module"""
+    global pygame
+    if pygame is None:
+        import pygame as module
+        module.mixer.init()
+        pygame = module
+    return pygame
+
+
+class PlaybackClock(QObject):
+    """Publishes track-ended and position-changed notifications"""
+    # Whole seconds into the current track
+    position_changed = pyqtSignal(int)
+    # The mixer finished a track (it may already be playing the queued one)
+    track_ended = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.duration = 0.0
+        self.base_position = 0.0  # Seconds played before the current anchor
+        self.anchor = None  # Monotonic time playback (re)started, None while paused
+        self.last_second = -1
+        self.last_mixer_pos = 0  # Only used when end events are unavailable
+
+        self.timer = MeasuredTimer("playback", self._tick, self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+
+        # Set up by attach_mixer() once the mixer is open
+        self.end_events = False
+        self.end_event = None  # pygame event posted by the mixer when a track finishes
+
+    def attach_mixer(self):
+        """Ask the (now open) mixer to post an event when a track finishes"""
+        # pygame only posts end events once its event system (video subsystem) is up
+        self.end_event = pygame.USEREVENT + 1
+        # Reading that event queue from Qt slots must not pump the GUI thread's
+        # Win32 message queue (re-entering Qt) on Windows
+        os.environ.setdefault("SDL_WINDOWS_ENABLE_MESSAGELOOP", "0")
+        try:
+            if not pygame.display.get_init():
+                pygame.display.init()
+            pygame.mixer.music.set_endevent(self.end_event)
+            self.end_events = True
+        except pygame.error as e:
+            event_log.warning("playback", "Music end events unavailable (%s) - checking the mixer instead", e)
+
+    def position(self):
+        """Current position in seconds"""
+        if self.anchor is None:
+            return self.base_position
+        return self.base_position + (time.monotonic() - self.anchor)
+
+    def start(self, duration, position=0.0):
+        """A track started playing at `position` seconds"""
+        self.duration = duration
+        self.base_position = position
+        self.anchor = time.monotonic()
+        self.last_second = -1
+        self.last_mixer_pos = 0
+        if self.end_events:
+            # Loading a track halts the previous one, which posts a stale end event
+            pygame.event.clear(self.end_event)
+        self._tick()
+
+    def set_duration(self, duration):
+        """Update the expected length (e.g. after a late probe)"""
+        self.duration = duration
+        if self.anchor is not None:
+            self._schedule()
+
+    def pause(self):
+        if self.anchor is not None:
+            self.base_position = self.position()
+            self.anchor = None
+        self.timer.stop()
+
+    def resume(self):
+        if self.anchor is None and self.duration > 0:
+            self.anchor = time.monotonic()
+            self._tick()
+
+    def _tick(self):
+        """Deliver pending notifications, then sleep until the next one is due"""
+        if self._track_finished():
+            self.track_ended.emit()
+            if self.anchor is None:
+                return  # Listener stopped playback
+
+        second = int(self.position())
+        if second != self.last_second:
+            self.last_second = second
+            self.position_changed.emit(second)
+        self._schedule()
+
+    def _track_finished(self):
+        if self.end_events:
+            return bool(pygame.event.get(self.end_event))
+        # The mixer position restarts from zero when a queued track takes over
+        mixer_pos = pygame.mixer.music.get_pos()
+        wrapped = 0 <= mixer_pos < self.last_mixer_pos
+        self.last_mixer_pos = mixer_pos
+        return wrapped or (not pygame.mixer.music.get_busy() and self.position() > 0.5)
+
+    def _schedule(self):
+        if self.anchor is None:
+            return
+        position = self.position()
+        # Wake at the next whole second, or right when the track should end
+        delay = (int(position) + 1) - position
+        if self.duration > position:
+            delay = min(delay, self.duration - position + 0.01)
+        elif 0 < self.duration < position < self.duration + 2:
+            delay = min(delay, 0.05)  # Due any moment - the mixer drains its buffer last
+        if not self.end_events:
+            delay = min(delay, FALLBACK_CHECK_MS / 1000.0)
+        self.timer.start(max(1, int(delay * 1000)))
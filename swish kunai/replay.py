@@ -0,0 +1,191 @@
+"""
+Replay
+Compact binary recording of a game session: the seed, the circle's starting
+angle, the step length and speed/rest schedule the game ran with, and every
+player input tagged with the simulation step it applied at. Playing one back
+feeds the same inputs into the same steps, so physics and rendering repeat
+exactly - in real time inside the window, or as fast as possible headless,
+with per-frame simulation and paint cost reported at the end.
+
+    python replay.py replays/last_game.skr [--realtime]
+"""
+
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+import game_core
+
+MAGIC = b"SKRP"
+VERSION = 1
+
+# magic, version, seed, start rotation, step length, total steps,
+# schedule (start speed, speed-up interval, rest start, rest duration), input count
+_HEADER = struct.Struct("<4sBqddI4dI")
+
+# step index, action code
+_INPUT = struct.Struct("<IB")
+
+# Where the window keeps the last game session
+LAST_GAME_PATH = Path("replays") / "last_game.skr"
+
+ACTION_CODES = {game_core.LAUNCH: 0, game_core.REPLAY: 1}
+ACTIONS = {code: action for action, code in ACTION_CODES.items()}
+
+
+def current_schedule():
+    """Speed and rest schedule of the game rules in this build"""
+    return (float(game_core.START_SPEED), float(game_core.SPEED_UP_INTERVAL),
+            float(game_core.REST_START), float(game_core.REST_DURATION))
+
+
+class Replay:
+    """One recorded game session"""
+    def __init__(self, seed, start_rotation=0.0, step_length=game_core.SIM_STEP, schedule=None):
+        self.seed = seed
+        self.start_rotation = start_rotation
+        self.step_length = step_length
+        self.schedule = schedule or current_schedule()
+        self.total_steps = 0
+        self.inputs = []  # (step_index, action) in order
+
+    def record(self, step_index, action):
+        self.inputs.append((step_index, action))
+
+    def inputs_by_step(self):
+        """Step index -> tuple of actions applied at that step"""
+        by_step = {}
+        for step_index, action in self.inputs:
+            by_step.setdefault(step_index, []).append(action)
+        return {step_index: tuple(actions) for step_index, actions in by_step.items()}
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(MAGIC, VERSION, self.seed, self.start_rotation,
+                              self.step_length, self.total_steps, *self.schedule,
+                              len(self.inputs))]
+        parts.extend(_INPUT.pack(step_index, ACTION_CODES[action])
+                     for step_index, action in self.inputs)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size or data[:4] != MAGIC:
+            raise ValueError("Not a Swish Kunai replay")
+        (_magic, version, seed, start_rotation, step_length, total_steps,
+         *schedule, count) = _HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        if tuple(schedule) != current_schedule():
+            raise ValueError("Replay was recorded with a different speed/rest schedule")
+        if len(data) < _HEADER.size + count * _INPUT.size:
+            raise ValueError("Replay file is truncated")
+
+        replay = cls(seed, start_rotation, step_length, tuple(schedule))
+        replay.total_steps = total_steps
+        for i in range(count):
+            step_index, code = _INPUT.unpack_from(data, _HEADER.size + i * _INPUT.size)
+            if code not in ACTIONS:
+                raise ValueError(f"Unknown replay action {code}")
+            replay.inputs.append((step_index, ACTIONS[code]))
+        return replay
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class FrameCosts:
+    """Per-frame simulation and paint times collected during playback"""
+    def __init__(self):
+        self.sim_ms = array('d')
+        self.paint_ms = array('d')
+
+    def report(self):
+        """Return a human readable summary"""
+        lines = [f"Replay: {len(self.sim_ms)} frames"]
+        for label, samples in (("simulation", self.sim_ms), ("paint", self.paint_ms)):
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            lines.append(f"  {label}: avg {sum(ordered) / len(ordered):.3f} ms, "
+                         f"p95 {p95:.3f} ms, worst {ordered[-1]:.3f} ms")
+        return "\n".join(lines)
+
+
+def simulate(replay, core=None):
+    """Run a replay's physics only (no Qt) and return the finished GameCore"""
+    core = core or game_core.GameCore()
+    core.reset(replay.start_rotation, seed=replay.seed)
+    inputs = replay.inputs_by_step()
+    for step_index in range(replay.total_steps):
+        core.step(replay.step_length, inputs.get(step_index, ()))
+    return core
+
+
+def make_sandbox(root, settings=None):
+    """Prepare `root` as a working directory with copied assets and the given
+    (by default empty) settings, so a replay or benchmark run never reads or
+    rewrites the user's settings, library, music or last game"""
+    root = Path(root)
+    shutil.copytree(Path(__file__).resolve().parent / "assets", root / "assets")
+    with open(root / "swish_kunai_settings.json", 'w') as f:
+        json.dump(settings or {}, f)
+    return root
+
+
+def main():
+    """Play a replay file in the window (real time) or headless as fast as possible"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    realtime = "--realtime" in sys.argv
+    if len(args) != 1:
+        print("Usage: python replay.py <replay file> [--realtime]")
+        return 2
+    replay = Replay.load(args[0])
+
+    if not realtime:
+        # Headless: no window on screen and no audio device needed
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from PyQt6.QtWidgets import QApplication
+    from music_player_window import MusicPlayerWindow
+    from event_log import event_log
+
+    previous_dir = os.getcwd()
+    sandbox = make_sandbox(tempfile.mkdtemp(prefix="swish_kunai_replay_"))
+    os.chdir(sandbox)
+    event_log.start()
+    try:
+        app = QApplication(sys.argv)
+        window = MusicPlayerWindow()
+        window.show()
+        if realtime:
+            window.play_replay(replay, realtime=True, close_when_done=True)
+            exit_code = app.exec()
+        else:
+            app.processEvents()  # Let the window get exposed so repaint() really paints
+            window.play_replay(replay, realtime=False)
+            window.close()
+            exit_code = 0
+    finally:
+        event_log.close()
+        os.chdir(previous_dir)
+        shutil.rmtree(sandbox, ignore_errors=True)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
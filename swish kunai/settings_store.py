@@ -0,0 +1,118 @@
+"""
+Settings Store
+Batches settings changes in memory and writes them from a background thread
+once changes go quiet. Writes are atomic (temp file + rename), so a crash
+mid-write can never leave a truncated settings file behind.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from event_log import event_log
+
+# Write once no change has arrived for this long (seconds)
+QUIET_PERIOD = 1.0
+
+# ...but never hold unwritten changes for longer than this
+MAX_DELAY = 5.0
+
+
+class SettingsStore:
+    """Debounced, atomic JSON settings file"""
+    def __init__(self, path):
+        self.path = Path(path)
+        self.values = {}
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        self.version = 0  # Bumped on every change so an older snapshot never overwrites a newer one
+        self.written_version = 0
+        self.first_change = 0.0
+        self.last_change = 0.0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+        self.thread.start()
+
+    def load(self):
+        """Read the settings file and return a copy of its values"""
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                loaded = json.load(f)
+            with self.condition:
+                self.values.update(loaded)
+        return dict(self.values)
+
+    def update(self, **changes):
+        """Record changes; only values that actually changed schedule a write"""
+        with self.condition:
+            changed = {key: value for key, value in changes.items()
+                       if self.values.get(key) != value}
+            if not changed:
+                return
+            self.values.update(changed)
+            self.version += 1
+            now = time.monotonic()
+            if not self.dirty:
+                self.dirty = True
+                self.first_change = now
+            self.last_change = now
+            self.condition.notify()
+
+    def flush(self):
+        """Write pending changes right now (call on exit)"""
+        with self.condition:
+            if not self.dirty:
+                return
+            snapshot = self._take_snapshot()
+        self._write(snapshot)
+
+    def close(self):
+        """Flush and stop the writer thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join(timeout=2.0)
+        self.flush()
+
+    def _take_snapshot(self):
+        self.dirty = False
+        return self.version, dict(self.values)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.dirty and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return  # close() flushes whatever is left
+                # Wait for the changes to go quiet (bounded by MAX_DELAY)
+                while self.dirty and not self.closed:
+                    now = time.monotonic()
+                    remaining = min(self.last_change + QUIET_PERIOD,
+                                    self.first_change + MAX_DELAY) - now
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.closed or not self.dirty:
+                    continue
+                snapshot = self._take_snapshot()
+            self._write(snapshot)
+
+    def _write(self, snapshot):
+        """Atomically replace the settings file"""
+        version, values = snapshot
+        with self.write_lock:
+            if version <= self.written_version:
+                return  # A newer snapshot was already written
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump(values, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                self.written_version = version
+            except OSError as e:
+                event_log.error("settings", "Error saving settings: %s", e)
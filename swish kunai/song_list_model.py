@@ -0,0 +1,108 @@
+"""
+Song List Model
+Model/view backing for the song list overlay. Rows are produced on demand by
+the view (only visible rows are ever asked for), so opening the overlay costs
+the same for 10 or 100k tracks and no per-row objects are kept in memory.
+Switching between search results and the full list is reported as a row-count
+change plus dataChanged rather than a model reset.
+"""
+
+import bisect
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+# Role returning the song_list index (track id) for a row
+TRACK_INDEX_ROLE = Qt.ItemDataRole.UserRole
+
+
+class SongListModel(QAbstractListModel):
+    """Read-only view over the window's song_list"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.songs = []
+        self.matches = None  # Search results (song names) or None to show everything
+
+    def set_songs(self, songs):
+        """Replace the underlying song list (kept by reference, not copied)"""
+        self._replace_rows(songs, None)
+
+    def set_matches(self, matches):
+        """Show only the given song names, in order (None shows all songs)"""
+        if matches is None and self.matches is None:
+            return  # Already showing everything
+        self._replace_rows(self.songs, matches)
+
+    def _replace_rows(self, songs, matches):
+        """Swap the row source, notifying views of the count change and changed rows
+
+        A model reset would make the view re-query every row; a single
+        insert/remove for the difference plus one dataChanged doesn't.
+        """
+        old_count = self.rowCount()
+        new_count = len(matches) if matches is not None else len(songs)
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self.songs = songs
+            self.matches = matches
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self.songs = songs
+            self.matches = matches
+            self.endInsertRows()
+        else:
+            self.songs = songs
+            self.matches = matches
+        # Rows that existed before may now show a different song
+        common = min(old_count, new_count)
+        if common:
+            self.dataChanged.emit(self.index(0), self.index(common - 1))
+
+    def song_index(self, name):
+        """Find a song's index in the sorted song list"""
+        index = bisect.bisect_left(self.songs, name.lower(), key=str.lower)
+        while index < len(self.songs) and self.songs[index] != name:
+            index += 1
+        return index if index < len(self.songs) else -1
+
+    def insert_song(self, index, name):
+        """Insert a song into the underlying list and notify views"""
+        if self.matches is not None:
+            # Rows follow the search results, which the owner refreshes
+            self.songs.insert(index, name)
+            return
+        self.beginInsertRows(QModelIndex(), index, index)
+        self.songs.insert(index, name)
+        self.endInsertRows()
+
+    def remove_song(self, index):
+        """Remove a song from the underlying list and notify views"""
+        if self.matches is not None:
+            self.songs.pop(index)
+            return
+        self.beginRemoveRows(QModelIndex(), index, index)
+        self.songs.pop(index)
+        self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.matches is not None:
+            return len(self.matches)
+        return len(self.songs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if self.matches is not None:
+            name = self.matches[row]
+            if role == Qt.ItemDataRole.DisplayRole:
+                return name
+            if role == TRACK_INDEX_ROLE:
+                return self.song_index(name)
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.songs[row]
+        if role == TRACK_INDEX_ROLE:
+            return row
+        return None
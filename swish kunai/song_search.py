@@ -0,0 +1,191 @@
+"""
+Song Search
+Trigram index over song titles, artists and file names for type-ahead search.
+Each keystroke intersects the query's posting sets, rarest first. When a
+common word or a single letter matches too many songs to rank, only the
+shortest matching texts are ranked, so results can refresh on every key
+without debouncing and the cap still keeps the best-ranked songs. When
+there are few exact hits, songs sharing enough trigrams with the query are
+checked word by word, allowing one typo (a wrong, missing, extra or swapped
+letter) in each query word of TYPO_MIN_WORD letters or more.
+"""
+
+import heapq
+import itertools
+import re
+from collections import Counter, defaultdict
+
+# Anything that isn't a letter or digit separates words
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Query words this long may contain one typo
+TYPO_MIN_WORD = 4
+
+# A typo inside a word breaks up to three of its trigrams
+KEYS_PER_TYPO = 3
+
+# Cap on songs ranked per query - short queries and common words can match
+# most of the library, so only the shortest matching texts are ranked
+MAX_CANDIDATES = 2000
+
+# Posting entries counted while looking for typo matches before giving up
+MAX_TYPO_SCAN = 50000
+
+# Songs checked word by word for typos, most shared trigrams first
+MAX_TYPO_CHECKS = 500
+
+
+def normalize(text):
+    """Lower-case and collapse punctuation to single spaces"""
+    return _SEPARATORS.sub(" ", text.casefold()).strip()
+
+
+def index_keys(text):
+    """Keys indexed for a normalized text: trigrams plus word-start bigrams"""
+    padded = f" {text} "
+    keys = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    # " a" lets single-character queries match word starts
+    keys.update(" " + word[0] for word in text.split())
+    return keys
+
+
+def query_keys(query):
+    """Keys to look up for a normalized query"""
+    if len(query) < 3:
+        # Short queries match word starts
+        return {" " + query}
+    return {query[i:i + 3] for i in range(len(query) - 2)}
+
+
+def typo_budget(words):
+    """How many typos a query made of `words` may contain (one per long word)"""
+    return sum(1 for word in words if len(word) >= TYPO_MIN_WORD)
+
+
+def required_keys(count, typos):
+    """How many of a query's `count` keys a song with `typos` typos still contains"""
+    return max(1, count - KEYS_PER_TYPO * typos)
+
+
+def within_one_edit(a, b):
+    """True if `a` becomes `b` with at most one substitution, insertion,
+    deletion or swap of adjacent letters"""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    i = 0
+    shorter = min(len(a), len(b))
+    while i < shorter and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (a[i + 1:] == b[i + 1:]
+                or (a[i + 1:i + 2] == b[i:i + 1] and a[i:i + 1] == b[i + 1:i + 2]
+                    and a[i + 2:] == b[i + 2:]))
+    if len(a) > len(b):
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+def word_matches(word, text_words):
+    """True if some word of the text starts with `word`, give or take one typo"""
+    size = len(word)
+    for candidate in text_words:
+        if candidate.startswith(word):
+            return True
+        if size >= TYPO_MIN_WORD and len(candidate) >= size - 1:
+            # The song's word may be longer than what has been typed so far
+            if (within_one_edit(word, candidate[:size])
+                    or within_one_edit(word, candidate[:size + 1])
+                    or within_one_edit(word, candidate[:size - 1])):
+                return True
+    return False
+
+
+class TrigramIndex:
+    """Incrementally maintained n-gram index keyed by song file name"""
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.keys = {}   # name -> set of indexed keys
+        self.texts = {}  # name -> normalized searchable text
+        self.by_length = defaultdict(set)  # text length -> names
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, name, title="", artist=""):
+        """Index a song (re-indexes it if already present)"""
+        if name in self.texts:
+            self.remove(name)
+        text = normalize(" ".join(part for part in (title, artist, name) if part))
+        keys = index_keys(text)
+        self.texts[name] = text
+        self.keys[name] = keys
+        self.by_length[len(text)].add(name)
+        for key in keys:
+            self.postings[key].add(name)
+
+    def remove(self, name):
+        """Drop a song from the index"""
+        keys = self.keys.pop(name, None)
+        if keys is None:
+            return
+        text = self.texts.pop(name)
+        names = self.by_length[len(text)]
+        names.discard(name)
+        if not names:
+            del self.by_length[len(text)]
+        for key in keys:
+            posting = self.postings[key]
+            posting.discard(name)
+            if not posting:
+                del self.postings[key]
+
+    def search(self, query, limit=500):
+        """Return up to `limit` song names ranked best first (None for an empty query)"""
+        query = normalize(query)
+        if not query:
+            return None
+
+        keys = query_keys(query)
+        words = query.split()
+        needed = required_keys(len(keys), typo_budget(words))
+        postings = sorted((self.postings.get(key, ()) for key in keys), key=len)
+
+        # Songs containing every key. Set intersection walks the rarest
+        # posting and probes the others from rarest up
+        full = postings[0].intersection(*postings[1:]) if postings[0] else set()
+        if len(full) > MAX_CANDIDATES:
+            # Too many to rank on every keystroke - keep the shortest texts,
+            # which rank first among full matches at the same position
+            shortest = set()
+            for length in sorted(self.by_length):
+                group = self.by_length[length].intersection(full)
+                shortest.update(itertools.islice(group, MAX_CANDIDATES - len(shortest)))
+                if len(shortest) >= MAX_CANDIDATES:
+                    break
+            full = shortest
+        matches = dict.fromkeys(full, len(keys))  # name -> number of query keys it contains
+
+        # Too few exact hits - look for typos. Count how many query keys each
+        # song contains (rarest postings first, so a capped count still covers
+        # the rare keys), then check the best candidates word by word
+        if len(matches) < limit and needed < len(keys):
+            counts = Counter(itertools.islice(itertools.chain.from_iterable(postings), MAX_TYPO_SCAN))
+            texts = self.texts
+            for name, score in counts.most_common(MAX_TYPO_CHECKS):
+                if score < needed or len(matches) >= limit:
+                    break
+                if name in matches:
+                    continue
+                text_words = texts[name].split()
+                if all(word_matches(word, text_words) for word in words):
+                    matches[name] = score
+
+        texts = self.texts
+        ranked = []
+        for name, score in matches.items():
+            text = texts[name]
+            position = text.find(query)
+            # More matching trigrams first, then exact substrings, earlier and shorter hits
+            ranked.append((-score, position < 0, max(position, 0), len(text), name))
+
+        return [entry[-1] for entry in heapq.nsmallest(limit, ranked)]
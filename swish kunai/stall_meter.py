@@ -0,0 +1,89 @@
+"""
+Stall Meter
+Measures how long the GUI thread is blocked by watching a 16 ms heartbeat timer
+arrive late. Enable with SWISH_KUNAI_STALL_METER=1 to compare before/after.
+"""
+
+import os
+import time
+from PyQt6.QtCore import QObject, QTimer, Qt
+
+# Heartbeat interval in milliseconds (one frame at ~60 FPS)
+HEARTBEAT_MS = 16
+
+# Lateness beyond this (ms) counts as a stall
+STALL_THRESHOLD_MS = 8
+
+
+def stall_meter_enabled():
+    """Check whether stall measurement was requested via the environment"""
+    return os.environ.get("SWISH_KUNAI_STALL_METER", "") not in ("", "0")
+
+
+class StallMeter(QObject):
+    """Records GUI-thread stalls as heartbeat lateness"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._beat)
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded statistics"""
+        self.last_beat = None
+        self.beats = 0
+        self.stalls = 0
+        self.total_stall_ms = 0.0
+        self.max_stall_ms = 0.0
+        # Time spent inside explicitly measured sections: label -> [count, total_ms, max_ms]
+        self.sections = {}
+
+    def start(self):
+        self.last_beat = time.perf_counter()
+        self.timer.start(HEARTBEAT_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def _beat(self):
+        now = time.perf_counter()
+        late_ms = (now - self.last_beat) * 1000.0 - HEARTBEAT_MS
+        self.last_beat = now
+        self.beats += 1
+        if late_ms > STALL_THRESHOLD_MS:
+            self.stalls += 1
+            self.total_stall_ms += late_ms
+            self.max_stall_ms = max(self.max_stall_ms, late_ms)
+
+    def measure(self, label):
+        """Context manager timing a block of GUI-thread work"""
+        return _Section(self, label)
+
+    def report(self):
+        """Return a human readable summary"""
+        lines = [f"GUI stalls: {self.stalls} over {self.beats} frames, "
+                 f"total {self.total_stall_ms:.1f} ms, worst {self.max_stall_ms:.1f} ms"]
+        for label, (count, total_ms, max_ms) in sorted(self.sections.items()):
+            lines.append(f"  {label}: {count} calls, avg {total_ms / count:.2f} ms, "
+                         f"worst {max_ms:.2f} ms")
+        return "\n".join(lines)
+
+
+class _Section:
+    """Timing block used by StallMeter.measure"""
+    def __init__(self, meter, label):
+        self.meter = meter
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ms = (time.perf_counter() - self.start) * 1000.0
+        stats = self.meter.sections.setdefault(self.label, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed_ms
+        stats[2] = max(stats[2], elapsed_ms)
+        return False
@@ -0,0 +1,108 @@
+"""
+Star Field
+Twinkling game-mode background. Each star size is pre-rendered at a fixed set
+of opacity levels into one sprite sheet, so the whole field is drawn with a
+single drawPixmapFragments call instead of a setOpacity/drawPixmap pair per
+star, and the twinkle itself is one batch update over the star columns.
+"""
+
+import math
+from PyQt6.QtCore import Qt, QPointF, QRect, QRectF
+from PyQt6.QtGui import QPixmap, QPainter
+from entity_store import StarStore
+
+# Number of stars in the field
+STAR_COUNT = 30
+
+# Star sizes in pixels (inclusive)
+MIN_STAR_SIZE = 10
+MAX_STAR_SIZE = 25
+
+# Area the stars can cover (centres at y 20..350, up to 25px wide)
+STAR_FIELD_RECT = QRect(0, 0, 500, 365)
+
+# Opacity variants baked per size; twinkling steps between them
+OPACITY_LEVELS = 32
+
+
+class StarField:
+    """Star layout, twinkle state and the baked sprite sheet"""
+    def __init__(self, star_pixmap, count=STAR_COUNT):
+        self.count = count
+        self.stars = StarStore(count)
+        self.sheet = None
+        self.sources = {}  # (size, level) -> source rect in the sheet
+        self.set_sprite(star_pixmap)
+
+    def set_sprite(self, star_pixmap):
+        """Bake the sprite sheet (drawing is a no-op until there is one)"""
+        if star_pixmap and not star_pixmap.isNull():
+            self._bake(star_pixmap)
+
+    def _bake(self, star_pixmap):
+        """Render every size at every opacity level into one pixmap"""
+        cell = MAX_STAR_SIZE + 2
+        sizes = range(MIN_STAR_SIZE, MAX_STAR_SIZE + 1)
+        self.sheet = QPixmap(OPACITY_LEVELS * cell, len(sizes) * cell)
+        self.sheet.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(self.sheet)
+        for row, size in enumerate(sizes):
+            sprite = star_pixmap.scaled(size, size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation)
+            # Centre the sprite in a size x size square within the cell
+            offset_x = (size - sprite.width()) / 2
+            offset_y = (size - sprite.height()) / 2
+            for level in range(OPACITY_LEVELS):
+                left = level * cell
+                top = row * cell
+                painter.setOpacity(level / (OPACITY_LEVELS - 1))
+                painter.drawPixmap(QPointF(left + offset_x, top + offset_y), sprite)
+                self.sources[(size, level)] = QRectF(left, top, size, size)
+        painter.end()
+
+    def populate(self, rng):
+        """Scatter a fresh set of stars around (not over) the circle"""
+        self.stars.clear()
+        for _ in range(self.count):
+            size = rng.randint(MIN_STAR_SIZE, MAX_STAR_SIZE)
+
+            # Keep trying positions until we find one not overlapping the circle
+            # Circle is at (250, 220) with radius 120
+            for _attempt in range(50):  # Limit attempts to avoid infinite loop
+                x = rng.randint(20, 480)
+                y = rng.randint(20, 350)
+                # Far enough from the circle (radius 120 + buffer 40)
+                if math.hypot(x - 250, y - 220) > 160:
+                    break
+
+            self.stars.append(
+                x=x,
+                y=y,
+                size=size,
+                opacity=rng.uniform(0.3, 1.0),  # Starting opacity
+                fade_speed=rng.uniform(0.01, 0.03),  # Opacity change per 50ms
+                fade_direction=rng.choice([1, -1]),  # 1 = fade in, -1 = fade out
+                min_opacity=rng.uniform(0.2, 0.4),  # Minimum brightness
+                max_opacity=rng.uniform(0.7, 1.0)   # Maximum brightness
+            )
+
+    def twinkle(self, dt):
+        """Advance every star's fade (speeds are per 50ms)"""
+        self.stars.twinkle(dt / 0.05)
+
+    def draw(self, painter, area):
+        """Draw the whole field with one batched call"""
+        if self.sheet is None or not area.intersects(STAR_FIELD_RECT):
+            return
+        stars = self.stars
+        top_level = OPACITY_LEVELS - 1
+        sources = self.sources
+        fragments = [
+            QPainter.PixmapFragment.create(
+                QPointF(stars.x[i], stars.y[i]),
+                sources[(int(stars.size[i]), round(stars.opacity[i] * top_level))])
+            for i in range(stars.count)
+        ]
+        painter.drawPixmapFragments(fragments, self.sheet)
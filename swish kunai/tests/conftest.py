@@ -0,0 +1,15 @@
+"""
+Test configuration
+Makes the app's modules importable from tests/ and keeps Qt and SDL headless,
+so the suite runs on machines without a display or sound card.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Must be set before Qt or pygame are imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
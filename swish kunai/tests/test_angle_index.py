@@ -0,0 +1,39 @@
+"""
+Angle index
+Nearest-neighbour lookups must wrap around 0/360 degrees.
+"""
+
+import math
+
+from angle_index import AngleIndex
+
+
+def test_empty_index_is_infinitely_far():
+    assert math.isinf(AngleIndex().nearest_distance(10))
+    assert not AngleIndex().within(10, 5)
+
+
+def test_angles_are_kept_sorted_and_normalized():
+    index = AngleIndex()
+    for angle in (200, -10, 725, 90):
+        index.add(angle)
+    assert list(index) == [5, 90, 200, 350]
+
+
+def test_nearest_distance_wraps_around_zero():
+    index = AngleIndex()
+    index.add(358)
+    index.add(180)
+    assert index.nearest_distance(2) == 4
+    assert index.nearest_distance(355) == 3
+    index.clear()
+    index.add(1)
+    assert index.nearest_distance(359) == 2
+
+
+def test_within_is_strict():
+    index = AngleIndex()
+    index.add(100)
+    assert index.within(104.5, 5)
+    assert not index.within(105, 5)
+    assert index.within(95.5, 5)
@@ -0,0 +1,110 @@
+"""
+Game core
+The headless rules: seeded games repeat exactly, swept hits land at any step
+length, and FixedStepRunner turns elapsed time into whole steps.
+"""
+
+import pytest
+
+import game_core
+from game_core import GameCore, FixedStepRunner, LAUNCH, HIT, GAME_OVER
+from replay import Replay, simulate
+
+
+def play(seed, step_length=game_core.SIM_STEP, steps=3000):
+    """Record a game that launches a kunai every 40 steps"""
+    core = GameCore(seed)
+    runner = FixedStepRunner(core, step_length)
+    replay = Replay(seed, 0.0, step_length)
+    runner.start_recording(replay)
+    for step in range(steps):
+        if step % 40 == 0:
+            runner.push(LAUNCH)
+        runner.advance(step_length)
+    return core, replay
+
+
+def state(core):
+    return (core.rotation, core.game_score, core.game_over, core.game_time,
+            list(core.stuck_kunai), core.active_kunai.count)
+
+
+def test_same_seed_and_inputs_give_the_same_game():
+    first, _ = play(seed=42)
+    second, _ = play(seed=42)
+    assert state(first) == state(second)
+    assert first.random.random() == second.random.random()
+
+
+def test_recorded_game_simulates_to_the_same_state():
+    core, replay = play(seed=7)
+    assert state(simulate(replay)) == state(core)
+
+
+def launch_until_hit(step_length):
+    """Launch one kunai and step until it lands; returns the core and hit events"""
+    core = GameCore(1)
+    events = core.step(step_length, (LAUNCH,))
+    for _ in range(int(5 / step_length)):
+        if HIT in events or GAME_OVER in events:
+            break
+        events = core.step(step_length)
+    return core, events
+
+
+@pytest.mark.parametrize("step_length", [0.004, game_core.SIM_STEP, 0.05, 0.1, 0.5])
+def test_swept_hit_lands_at_any_step_length(step_length):
+    # At 0.5 s a step carries the tip clean across the circle
+    core, events = launch_until_hit(step_length)
+    assert events.count(HIT) == 1
+    assert core.game_score == game_core.HIT_SCORE
+    assert core.active_kunai.count == 0
+
+    # The tip stuck at the bottom of the circle (90 degrees on screen), as
+    # seen by the circle at some point during the final step
+    angle, = core.stuck_kunai
+    earliest = (90 - core.previous_rotation) % 360
+    latest = (90 - core.rotation) % 360
+    assert latest - 1e-9 <= angle <= earliest + 1e-9
+
+
+def test_kunai_landing_on_a_stuck_one_ends_the_game():
+    core = GameCore(1)
+    # Launched together, both land on the same spot in the same step
+    events = core.step(game_core.SIM_STEP, (LAUNCH, LAUNCH))
+    while not events:
+        events = core.step(game_core.SIM_STEP)
+    assert events == [HIT, GAME_OVER]
+    assert core.game_over
+    assert core.game_score == game_core.HIT_SCORE
+
+
+def test_runner_only_runs_whole_steps():
+    runner = FixedStepRunner(GameCore(3), step_length=0.01)
+    runner.advance(0.025)
+    assert runner.steps_run == 2
+    assert runner.alpha() == pytest.approx(0.5)
+    runner.advance(0.005)
+    assert runner.steps_run == 3
+    assert runner.alpha() == pytest.approx(0.0, abs=1e-9)
+
+
+def test_runner_caps_catch_up_after_a_stall():
+    runner = FixedStepRunner(GameCore(3), step_length=0.01)
+    runner.advance(1.0)
+    assert runner.steps_run == game_core.MAX_CATCH_UP_STEPS
+    assert runner.alpha() <= 1.0
+
+
+def test_runner_applies_pushed_input_at_the_next_step():
+    runner = FixedStepRunner(GameCore(3), step_length=0.01)
+    replay = Replay(3, 0.0, 0.01)
+    runner.start_recording(replay)
+    runner.advance(0.01)
+    runner.push(LAUNCH)
+    runner.advance(0.005)  # Not a whole step yet
+    assert runner.core.active_kunai.count == 0
+    runner.advance(0.005)
+    assert runner.core.active_kunai.count == 1
+    assert replay.inputs == [(1, LAUNCH)]
+    assert replay.total_steps == 2
@@ -0,0 +1,67 @@
+"""
+Replay files
+Round trips through bytes and disk, and rejection of files this build can't
+play back.
+"""
+
+import pytest
+
+import game_core
+from replay import Replay, current_schedule
+
+
+def sample_replay():
+    replay = Replay(seed=12345, start_rotation=17.5, step_length=game_core.SIM_STEP)
+    replay.record(0, game_core.LAUNCH)
+    replay.record(90, game_core.LAUNCH)
+    replay.record(400, game_core.REPLAY)
+    replay.record(400, game_core.LAUNCH)
+    replay.total_steps = 1000
+    return replay
+
+
+def fields(replay):
+    return (replay.seed, replay.start_rotation, replay.step_length,
+            replay.schedule, replay.total_steps, replay.inputs)
+
+
+def test_bytes_round_trip():
+    replay = sample_replay()
+    data = replay.to_bytes()
+    assert fields(Replay.from_bytes(data)) == fields(replay)
+    assert Replay.from_bytes(data).to_bytes() == data
+
+
+def test_file_round_trip(tmp_path):
+    replay = sample_replay()
+    path = tmp_path / "replays" / "game.skr"
+    replay.save(path)
+    assert fields(Replay.load(path)) == fields(replay)
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_inputs_grouped_by_step_keep_their_order():
+    assert sample_replay().inputs_by_step() == {
+        0: (game_core.LAUNCH,),
+        90: (game_core.LAUNCH,),
+        400: (game_core.REPLAY, game_core.LAUNCH),
+    }
+
+
+@pytest.mark.parametrize("mangle", [
+    lambda data: b"XXXX" + data[4:],  # Not a replay
+    lambda data: data[:-1],  # Truncated input list
+    lambda data: data[:10],  # Truncated header
+    lambda data: data[:-1] + b"\x07",  # Unknown action
+])
+def test_damaged_files_are_rejected(mangle):
+    with pytest.raises(ValueError):
+        Replay.from_bytes(mangle(sample_replay().to_bytes()))
+
+
+def test_other_schedule_is_rejected():
+    schedule = list(current_schedule())
+    schedule[0] += 1.0
+    replay = Replay(1, 0.0, game_core.SIM_STEP, tuple(schedule))
+    with pytest.raises(ValueError):
+        Replay.from_bytes(replay.to_bytes())
@@ -0,0 +1,69 @@
+"""
+Song search
+Type-ahead matching over the trigram index, including one-typo tolerance.
+"""
+
+import pytest
+
+import song_search
+from song_search import TrigramIndex
+
+
+def make_index():
+    index = TrigramIndex()
+    index.add("01 summer nights.mp3", "Summer Nights", "The Beach")
+    index.add("02 winter.mp3", "Winter", "Snow Band")
+    index.add("03 summertime blues.mp3", "Summertime Blues", "Eddie")
+    index.add("04 love song.mp3", "Love Song", "Somebody")
+    return index
+
+
+def test_empty_query_means_no_filter():
+    assert make_index().search("") is None
+    assert make_index().search("  ") is None
+
+
+def test_substring_matches_rank_shorter_titles_first():
+    assert make_index().search("summer") == ["01 summer nights.mp3", "03 summertime blues.mp3"]
+
+
+def test_short_query_matches_word_starts():
+    assert make_index().search("w") == ["02 winter.mp3"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("sumer", "01 summer nights.mp3"),  # Missing letter
+    ("summmer", "01 summer nights.mp3"),  # Extra letter
+    ("sunmer", "01 summer nights.mp3"),  # Wrong letter
+    ("wimter", "02 winter.mp3"),
+    ("summre", "01 summer nights.mp3"),  # Swapped letters
+    ("lvoe song", "04 love song.mp3"),
+])
+def test_one_typo_per_word_still_matches(query, expected):
+    results = make_index().search(query)
+    assert results[0] == expected
+    assert "02 winter.mp3" not in results or expected == "02 winter.mp3"
+
+
+def test_typos_are_not_matched_in_short_words_or_twice_in_a_word():
+    index = make_index()
+    assert index.search("snumre") == []
+    assert index.search("lvoe snog zzz") == []
+
+
+def test_removed_songs_stop_matching():
+    index = make_index()
+    index.remove("04 love song.mp3")
+    assert index.search("love") == []
+    assert len(index) == 3
+
+
+def test_capped_common_query_keeps_the_best_match(monkeypatch):
+    monkeypatch.setattr(song_search, "MAX_CANDIDATES", 10)
+    index = TrigramIndex()
+    for i in range(200):
+        index.add(f"{i:06d} {'x' * (i % 7)}.mp3", f"Over the Rainbow {i}", "Various Artists")
+    index.add("the.mp3", "The", "")
+    index.add("s.mp3", "S", "")
+    assert index.search("the")[0] == "the.mp3"
+    assert index.search("s")[0] == "s.mp3"
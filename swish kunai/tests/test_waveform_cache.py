@@ -0,0 +1,32 @@
+"""
+Waveform analysis
+A track that fails to analyze must not stay marked as in progress.
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from PyQt6.QtCore import QCoreApplication
+
+from waveform_cache import WaveformAnalyzer
+
+
+def test_failed_analysis_can_be_retried(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    analyzer = WaveformAnalyzer(tmp_path / "cache")
+    failed = []
+    analyzer.waveform_failed.connect(failed.append)
+
+    assert analyzer.request("missing", str(tmp_path / "missing.mp3")) is None
+    assert "missing" in analyzer.in_progress
+    deadline = time.monotonic() + 10
+    while not failed and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    analyzer.shutdown()
+
+    assert failed == ["missing"]
+    assert "missing" not in analyzer.in_progress
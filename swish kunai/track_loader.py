@@ -0,0 +1,150 @@
+"""
+Track Loader
+Opens audio files, reads and updates the library index for the music folder
+and probes metadata on worker threads so large libraries and slow or
+network-mounted folders never block the Qt event loop. Opening the track the
+user asked for has its own pool; folder loads and probing share a single
+background thread, in small tasks, so they can never hold up playback.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from music_library import (probe_file, stat_folder, diff_folder, snapshot, open_index,
+                           read_folder, read_stats, scanned_tracks, write_changes)
+from event_log import event_log
+from mp3_seek_table import Mp3SeekTable
+
+# Number of files probed per background task (and delivered per signal)
+PROBE_BATCH_SIZE = 200
+
+
+class _LoadTrackTask(QRunnable):
+    """Read a whole track into memory (and optionally probe it) off the GUI thread
+
+    MP3 files also get their seek table built here, so seeking later is a lookup.
+    """
+    def __init__(self, loader, request_id, path, name, probe):
+        super().__init__()
+        self.loader = loader
+        self.request_id = request_id
+        self.path = path
+        self.name = name
+        self.probe = probe
+
+    def run(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            info = probe_file(self.path) if self.probe else None
+            seek_table = Mp3SeekTable.build(data) if self.name.lower().endswith('.mp3') else None
+        except Exception as e:
+            self.loader.track_failed.emit(self.request_id, self.name, str(e))
+            return
+        self.loader.track_loaded.emit(self.request_id, self.name, data, info, seek_table)
+
+
+class _ProbeFolderTask(QRunnable):
+    """Probe one batch of files and report the results together"""
+    def __init__(self, loader, folder, names):
+        super().__init__()
+        self.loader = loader
+        self.folder = folder
+        self.names = names
+
+    def run(self):
+        batch = [(name, probe_file(os.path.join(self.folder, name))) for name in self.names]
+        self.loader.metadata_probed.emit(self.folder, batch)
+
+
+class _LoadFolderTask(QRunnable):
+    """Read a folder's indexed rows, then stat every audio file, diff the two
+    and write the differences back to the index
+
+    With load_rows=False only the sizes and mtimes are read back, to check a
+    folder whose songs are already listed.
+    """
+    def __init__(self, loader, db_path, folder, load_rows=True):
+        super().__init__()
+        self.loader = loader
+        self.db_path = db_path
+        self.folder = folder
+        self.load_rows = load_rows
+
+    def run(self):
+        try:
+            conn = open_index(self.db_path)
+        except sqlite3.Error as e:
+            event_log.error("library", "Couldn't open the library index: %s", e)
+            return
+        try:
+            if self.load_rows:
+                tracks = read_folder(conn, self.folder)
+                known = snapshot(tracks)  # Before the GUI thread takes the dicts over
+                self.loader.folder_loaded.emit(self.folder, tracks, sorted(tracks, key=str.lower))
+            else:
+                known = read_stats(conn, self.folder)
+            current = stat_folder(self.folder)
+            diff = diff_folder(known, current)
+            scanned = scanned_tracks(current, *diff[:2])
+            write_changes(conn, self.folder, scanned, diff[2])
+        except (OSError, sqlite3.Error) as e:
+            event_log.warning("library", "Couldn't scan %s: %s", self.folder, e)
+            return
+        finally:
+            conn.close()
+        self.loader.folder_scanned.emit(self.folder, scanned, diff)
+
+
+class TrackLoader(QObject):
+    """Thread pool front-end; results arrive as queued signals on the GUI thread"""
+    # request_id, file name, raw file bytes, probe info (or None), Mp3SeekTable (or None)
+    track_loaded = pyqtSignal(int, str, object, object, object)
+    # request_id, file name, error message
+    track_failed = pyqtSignal(int, str, str)
+    # folder, list of (file name, probe info)
+    metadata_probed = pyqtSignal(str, object)
+    # folder, {file name: track dict} of its indexed rows, file names sorted for display
+    folder_loaded = pyqtSignal(str, object, object)
+    # folder, track dicts written for new and modified files, (added, changed, removed) name lists
+    folder_scanned = pyqtSignal(str, object, object)
+
+    def __init__(self, parent=None, max_threads=2):
+        super().__init__(parent)
+        # Tracks the user is waiting for (and the gapless read-ahead)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # Folder scans and metadata probing, one bounded task at a time
+        self.background_pool = QThreadPool(self)
+        self.background_pool.setMaxThreadCount(1)
+        self.last_request_id = 0
+
+    def load_track(self, path, name, probe=False):
+        """Queue a track for loading and return its request id"""
+        self.last_request_id += 1
+        self.pool.start(_LoadTrackTask(self, self.last_request_id, path, name, probe))
+        return self.last_request_id
+
+    def load_folder(self, db_path, folder):
+        """Queue reading a folder's indexed songs and checking the folder itself"""
+        # Probes still queued for a previous folder are redone once this one is scanned
+        self.background_pool.clear()
+        self.background_pool.start(_LoadFolderTask(self, db_path, str(Path(folder))))
+
+    def check_folder(self, db_path, folder):
+        """Queue a check of an already loaded folder against the index, ahead of queued probes"""
+        self.background_pool.start(_LoadFolderTask(self, db_path, str(Path(folder)), load_rows=False), 1)
+
+    def probe_folder(self, folder, names):
+        """Queue background metadata probing for files the library hasn't seen yet"""
+        names = list(names)
+        for start in range(0, len(names), PROBE_BATCH_SIZE):
+            self.background_pool.start(_ProbeFolderTask(self, folder, names[start:start + PROBE_BATCH_SIZE]))
+
+    def shutdown(self):
+        """Drop queued work and wait for running tasks"""
+        for pool in (self.pool, self.background_pool):
+            pool.clear()
+        for pool in (self.pool, self.background_pool):
+            pool.waitForDone()
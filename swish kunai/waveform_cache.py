@@ -0,0 +1,142 @@
+"""
+Waveform Cache
+Background analyzer that decodes a track once, reduces it to min/max peaks per
+slider pixel with NumPy, and stores the result in a small on-disk cache keyed
+by file identity and mtime. Cached peaks are memory-mapped at display time, so
+switching tracks never decodes audio on the GUI thread.
+"""
+
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from event_log import event_log
+
+# Waveforms are disabled without NumPy (imported on first use, not at startup)
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# One peak pair per pixel of the 300 px progress slider
+WAVEFORM_BUCKETS = 300
+
+
+def waveform_available():
+    """Waveforms need NumPy for the analysis and memory mapping"""
+    return HAVE_NUMPY
+
+
+def waveform_key(path, size, mtime_ns):
+    """Cache key for a file - changes whenever the file is replaced or edited"""
+    identity = f"{os.path.abspath(path)}|{size}|{mtime_ns}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+def compute_peaks(path, buckets=WAVEFORM_BUCKETS):
+    """Decode a file and return an int8 array of shape (buckets, 2) holding min/max peaks"""
+    import numpy as np
+    import pygame
+    samples = pygame.sndarray.array(pygame.mixer.Sound(file=path))
+    if samples.ndim == 1:
+        samples = samples[:, None]
+
+    # Scale integer PCM to -1..1
+    if np.issubdtype(samples.dtype, np.integer):
+        samples = samples.astype(np.float32) / np.iinfo(samples.dtype).max
+    frames = (len(samples) // buckets) * buckets
+    if frames == 0:
+        return np.zeros((buckets, 2), dtype=np.int8)
+
+    # Collapse each bucket (all channels) to its lowest and highest sample
+    chunks = samples[:frames].reshape(buckets, -1)
+    peaks = np.empty((buckets, 2), dtype=np.float32)
+    peaks[:, 0] = chunks.min(axis=1)
+    peaks[:, 1] = chunks.max(axis=1)
+    return np.clip(np.round(peaks * 127), -127, 127).astype(np.int8)
+
+
+class WaveformCache:
+    """Directory of .npy peak files, one per cache key"""
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, key):
+        return self.cache_dir / f"{key}.npy"
+
+    def load(self, key):
+        """Return the memory-mapped peaks for a key, or None if not cached"""
+        import numpy as np
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None  # Truncated or corrupt file - it will be recomputed
+
+    def store(self, key, peaks):
+        """Write peaks atomically (temp file + rename) so readers never see partial data"""
+        import numpy as np
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'wb') as f:
+            np.save(f, peaks)
+        os.replace(temp_path, path)
+
+
+class _AnalyzeTask(QRunnable):
+    """Decode and reduce one track off the GUI thread"""
+    def __init__(self, analyzer, key, path):
+        super().__init__()
+        self.analyzer = analyzer
+        self.key = key
+        self.path = path
+
+    def run(self):
+        try:
+            self.analyzer.cache.store(self.key, compute_peaks(self.path))
+        except Exception as e:
+            event_log.warning("waveform", "Waveform analysis failed for %s: %s", self.path, e)
+            # Otherwise the key stays in progress and the track is never retried
+            self.analyzer.waveform_failed.emit(self.key)
+            return
+        self.analyzer.waveform_ready.emit(self.key)
+
+
+class WaveformAnalyzer(QObject):
+    """Queues analysis for tracks missing from the cache"""
+    # Cache key whose peaks are now on disk
+    waveform_ready = pyqtSignal(str)
+    # Cache key whose analysis failed
+    waveform_failed = pyqtSignal(str)
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache = WaveformCache(cache_dir)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)  # Decoding is memory hungry - one track at a time
+        self.in_progress = set()
+        self.waveform_failed.connect(self._failed)
+
+    def request(self, key, path):
+        """Return cached peaks right away, or start analysis and return None"""
+        peaks = self.cache.load(key)
+        if peaks is not None:
+            return peaks
+        if key not in self.in_progress:
+            self.in_progress.add(key)
+            self.pool.start(_AnalyzeTask(self, key, path))
+        return None
+
+    def finished(self, key):
+        """Mark an analysis as done and return its memory-mapped peaks"""
+        self.in_progress.discard(key)
+        return self.cache.load(key)
+
+    def _failed(self, key):
+        # A later request() may try again (e.g. the file was still being copied)
+        self.in_progress.discard(key)
+
+    def shutdown(self):
+        self.pool.clear()
+        self.pool.waitForDone()